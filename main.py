@@ -3,30 +3,20 @@ import logging
 import sys
 import os
 
-from src.mev_bot import MEVBot
 from src.utils import load_config
+from src.core.event_log import init_event_log
+from src.core.strategy_runtime import STRATEGY_MODULES, run_strategies
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src/alpha'))
 
-alpha_map = {
-    "cross_chain": "cross_chain_arb",
-    "l2_sandwich": "l2_sandwich",
-    "bridge_games": "bridge_games",
-    "mev_share": "mev_share",
-    "flash_loan": "flash_loan",
-    "liquidation": "liquidation",
-    "nftfi": "nftfi",
-    "cross_layer_sandwich": "cross_layer_sandwich",
-    "sequencer_auction_sniper": "sequencer_auction_sniper",
-    "mev_share_intent_sniper": "mev_share_intent_sniper",
-    "flash_loan_liquidation": "flash_loan_liquidation",
-}
 
 def main():
     parser = argparse.ArgumentParser(description="MEV The OG – main entry")
     parser.add_argument("--mode", type=str, default=None, help="test or live")
-    parser.add_argument("--alpha", type=str, default=None, help="alpha module: cross_chain, l2_sandwich, bridge_games, mev_share, flash_loan, liquidation, nftfi")
+    parser.add_argument("--alpha", type=str, default=None, help="comma-separated alpha modules to run concurrently (default: alpha.enabled): " + ", ".join(STRATEGY_MODULES))
     parser.add_argument("--dashboard", action="store_true", help="launch dashboard")
+    parser.add_argument("--backtest", type=str, default=None, metavar="RECORDING", help="replay a recorded event file or column store directory through the strategies given by --alpha (default: all with a replay adapter)")
+    parser.add_argument("--signer-daemon", action="store_true", help="decrypt the key once and serve signatures on signer.endpoint")
     args = parser.parse_args()
 
     # Setup logging
@@ -39,14 +29,30 @@ def main():
 
     if args.dashboard:
         from src.dashboard import launch_dashboard
-        port = config.get('dashboard', {}).get('port', 8501)
-        launch_dashboard(port)
+        port = (config.get('dashboard') or {}).get('port', 8501)
+        launch_dashboard(config, port)
         return
 
-    if args.alpha and args.alpha in alpha_map:
-        mod = __import__(f"src.alpha.{alpha_map[args.alpha]}", fromlist=[f"run_{alpha_map[args.alpha]}"])
-        getattr(mod, f"run_{alpha_map[args.alpha]}")(config)
+    if args.backtest:
+        import json
+        from src.core.replay import run_backtest
+        report = run_backtest(config, args.backtest, args.alpha.split(",") if args.alpha else None)
+        print(json.dumps(report, indent=2))
+        return
+
+    if args.signer_daemon:
+        from src.signer_daemon import run_signer_daemon
+        run_signer_daemon(config)
+        return
+
+    init_event_log()
+
+    strategies = args.alpha.split(",") if args.alpha else (config.get('alpha') or {}).get('enabled')
+    if strategies:
+        runtime = run_strategies(config, strategies)
+        logging.info(f"Strategy runtime stopped: {runtime.stats()}")
     else:
+        from src.mev_bot import MEVBot
         bot = MEVBot()
         bot.run()
         if bot.kill.state >= bot.kill.HALT:
@@ -1,9 +1,13 @@
-import time
+import asyncio
 import logging
 import importlib
-import openai
-import os
 from src.utils import load_config
+from src.ai.auto_scaler import register_auto_scaler
+from src.ai.llm_gateway import get_llm_gateway
+from src.core.metrics import metrics_port, start_metrics_server
+from src.core.event_log import DEFAULT_EVENT_LOG, EventCursor, init_event_log, tail_lines
+from src.core.strategy_runtime import StrategyRuntime
+from src.services.trade_journal import init_trade_journal
 
 OPENAI_MODEL = "gpt-4o"  # Or use "gpt-3.5-turbo" if needed
 
@@ -11,7 +15,6 @@ class AIOrchestrator:
     def __init__(self, config_path="config.yaml"):
         self.config_path = config_path
         self.config = load_config(config_path)
-        openai.api_key = os.environ.get("OPENAI_API_KEY")
         self.alpha_modules = [
             "cross_chain_arb",
             "l2_sandwich",
@@ -23,6 +26,8 @@ class AIOrchestrator:
             "edge_bridge_arb"
         ]
         self.module_results = {}
+        # Each analysis cycle only reads events appended since the previous one
+        self.event_cursor = EventCursor(DEFAULT_EVENT_LOG, state_path="logs/events.cursor")
 
     def run_module(self, module_name, mode="test"):
         try:
@@ -30,7 +35,9 @@ class AIOrchestrator:
             mod = importlib.import_module(f"src.alpha.{module_name}")
             run_func = getattr(mod, f"run_{module_name}", None)
             if run_func:
-                run_func(self.config)
+                result = run_func(self.config)
+                if asyncio.iscoroutine(result):
+                    asyncio.run(result)
                 self.module_results[module_name] = "success"
             else:
                 logging.warning(f"[AIOrchestrator] No run_{module_name} function in {module_name}.py")
@@ -41,13 +48,22 @@ class AIOrchestrator:
 
     def get_logs(self, log_path="logs/mev_og.log", n=100):
         try:
-            with open(log_path, "r") as f:
-                lines = f.readlines()
-                return "".join(lines[-n:])
+            return "".join(tail_lines(log_path, n))
         except Exception as e:
             return f"Failed to read logs: {e}"
 
-    def openai_analyze_logs(self, logs):
+    def get_new_events(self, max_events=500):
+        """Structured events since the last cycle, one compact line each (most recent ``max_events``)."""
+        # Reads back from the end: a fresh cursor or a large backlog costs only the lines kept
+        events = self.event_cursor.read_latest(max_events)
+        self.event_cursor.save()
+        lines = []
+        for e in events:
+            fields = [f"{k}={e[k]}" for k in ("strategy", "latency_ms", "pnl_usd", "detail") if e.get(k) is not None]
+            lines.append(f"{e.get('ts')} {e.get('event')} " + " ".join(fields))
+        return "\n".join(lines)
+
+    async def analyze_logs(self, logs):
         prompt = (
             "You are a world-class adversarial DeFi/MEV quant. "
             "Given these bot logs, identify any new arbitrage/MEV opportunities, vulnerabilities, and suggest new edges or parameter tweaks "
@@ -55,37 +71,57 @@ class AIOrchestrator:
             "LOGS:\n" + logs
         )
         try:
-            resp = openai.ChatCompletion.create(
+            return await get_llm_gateway().complete(
+                prompt,
+                system="You are a world-class MEV quant research agent.",
                 model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a world-class MEV quant research agent."},
-                    {"role": "user", "content": prompt}
-                ],
                 temperature=0.2,
                 max_tokens=700,
             )
-            return resp["choices"][0]["message"]["content"]
         except Exception as e:
             return f"[AIOrchestrator] OpenAI analysis failed: {e}"
 
-    def main_loop(self, interval_sec=600):
-        logging.info("[AIOrchestrator] Starting perpetual alpha coordination loop.")
-        while True:
-            for module in self.alpha_modules:
-                self.run_module(module, mode=self.config.get("mode", "test"))
-                time.sleep(3)  # Stagger modules
+    def openai_analyze_logs(self, logs):
+        return asyncio.run(self.analyze_logs(logs))
 
-            logs = self.get_logs()
-            ai_recommendations = self.openai_analyze_logs(logs)
-            logging.info(f"[AIOrchestrator][OpenAI] Alpha/edge recommendations:\n{ai_recommendations}")
+    async def review_cycle(self, logs):
+        ai_recommendations = await self.analyze_logs(logs)
+        logging.info(f"[AIOrchestrator][OpenAI] Alpha/edge recommendations:\n{ai_recommendations}")
 
-            # Optional: Auto-update config/params based on LLM suggestions (require human-in-the-loop for prod safety)
-            if "PROMOTE TO LIVE" in ai_recommendations and self.config.get("mode") != "live":
-                logging.info("[AIOrchestrator] OpenAI recommends switching to live mode! (manual approval required)")
-                # (Optional) Hook for notification/approval here
+        # Optional: Auto-update config/params based on LLM suggestions (require human-in-the-loop for prod safety)
+        if "PROMOTE TO LIVE" in ai_recommendations and self.config.get("mode") != "live":
+            logging.info("[AIOrchestrator] OpenAI recommends switching to live mode! (manual approval required)")
+            # (Optional) Hook for notification/approval here
+        return ai_recommendations
+
+    async def main_loop_async(self, interval_sec=600):
+        logging.info("[AIOrchestrator] Starting perpetual alpha coordination loop.")
+        init_event_log()
+        journal = init_trade_journal(self.config.get("database_path", "data/bot_state.db"))
+        start_metrics_server(metrics_port(self.config))
+        # All strategies run concurrently in the runtime; this loop only reviews them
+        enabled = (self.config.get("alpha") or {}).get("enabled") or self.alpha_modules
+        runtime = StrategyRuntime(self.config, enabled)
+        runtime.add_service("auto_scaler", register_auto_scaler)
+        runtime.start_in_thread()
+        review = None
+        while runtime.is_alive():
+            self.module_results = runtime.stats()
+
+            # The LLM review runs in the background; a slow one is not started again until it finishes
+            if review is None or review.done():
+                review = asyncio.ensure_future(self.review_cycle(self.get_new_events() or self.get_logs()))
+            else:
+                logging.info("[AIOrchestrator] Previous review still running; skipping this cycle")
 
             # Sleep until next cycle
-            time.sleep(interval_sec)
+            await asyncio.sleep(interval_sec)
+        if review is not None and not review.done():
+            review.cancel()
+        journal.flush(timeout=5)
+
+    def main_loop(self, interval_sec=600):
+        asyncio.run(self.main_loop_async(interval_sec))
 
 if __name__ == "__main__":
     import sys
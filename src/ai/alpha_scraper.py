@@ -1,84 +1,199 @@
+import asyncio
+import hashlib
+import json
 import logging
-import requests
 import os
 import time
-import openai
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from src.ai.llm_gateway import get_llm_gateway
 
-# If using OpenAI for summarization
-openai.api_key = os.environ.get("OPENAI_API_KEY")
 OPENAI_MODEL = "gpt-4o"
 
-def fetch_twitter_feed(keywords):
+CACHE_DIR = "data/alpha_cache"
+DEFAULT_TTL_SEC = 600
+DEFAULT_CONCURRENCY = 8
+
+
+class Source(NamedTuple):
+    """One feed: fetched from ``url`` and reduced to text by ``parse``, or produced locally by ``static``."""
+    key: str
+    url: Optional[str] = None
+    parse: Callable[[str], str] = lambda body: body
+    timeout: float = 8.0
+    ttl: float = DEFAULT_TTL_SEC
+    headers: Tuple[Tuple[str, str], ...] = ()
+    static: Optional[Callable[[], str]] = None
+
+
+def _nitter_text(body):
+    return body[:1500]  # For demo, real version would parse HTML for tweet text
+
+
+def _github_commits(repo):
+    def parse(body):
+        return "\n\n".join(f"{repo}: {commit['commit']['message']}" for commit in json.loads(body)[:2])
+    return parse
+
+
+def twitter_sources(keywords):
     # Use a paid Twitter API or scrape Nitter as fallback (demo)
-    tweets = []
-    for kw in keywords:
-        try:
-            resp = requests.get(f"https://nitter.net/search?f=tweets&q={kw}+MEV", timeout=8)
-            if resp.status_code == 200:
-                tweets.append(resp.text[:1500])  # For demo, real version would parse HTML for tweet text
-        except Exception as e:
-            logging.warning(f"[AlphaScraper] Twitter fetch fail: {e}")
-    return "\n\n".join(tweets)
-
-def fetch_github_feed(repos):
-    commits = []
-    for repo in repos:
-        try:
-            resp = requests.get(f"https://api.github.com/repos/{repo}/commits")
-            if resp.ok:
-                for commit in resp.json()[:2]:
-                    msg = commit['commit']['message']
-                    commits.append(f"{repo}: {msg}")
-        except Exception as e:
-            logging.warning(f"[AlphaScraper] Github fetch fail: {e}")
-    return "\n\n".join(commits)
+    return [Source(f"twitter:{kw}", f"https://nitter.net/search?f=tweets&q={kw}+MEV", _nitter_text) for kw in keywords]
+
+
+def github_sources(repos):
+    return [Source(f"github:{repo}", f"https://api.github.com/repos/{repo}/commits", _github_commits(repo),
+                   headers=(("Accept", "application/vnd.github+json"),)) for repo in repos]
+
 
 def fetch_dune_dashboard(dashboard_id):
     # Dune API is paid, so just simulate for demo
     return f"Simulated Dune dashboard {dashboard_id} result..."
 
+
 def fetch_telegram_feed(channel):
     # Use Telegram Bot API to get messages, or simulate (demo)
     return f"Simulated latest messages from {channel}"
 
-def summarize_alpha(feed_text):
+
+def _hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class FeedCache:
+    """On-disk cache, one JSON file per source: text, content hash and HTTP validators (ETag/Last-Modified)."""
+
+    def __init__(self, directory=CACHE_DIR, clock=time.time):
+        self.directory = directory
+        self.clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest()[:16] + ".json")
+
+    def get(self, key) -> Optional[Dict]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, entry: Dict) -> Dict:
+        entry = dict(entry, key=key)
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._path(key))
+        return entry
+
+    def fresh(self, entry: Optional[Dict], ttl: float) -> bool:
+        return entry is not None and self.clock() - entry.get("fetched_at", 0) < ttl
+
+
+async def fetch_source(session: aiohttp.ClientSession, source: Source, cache: FeedCache,
+                       semaphore: asyncio.Semaphore) -> str:
+    """Feed text for ``source``: cached while within its TTL, then revalidated with a conditional GET.
+
+    A failed or timed-out fetch falls back to the last cached text, so one
+    slow source never costs more than its own timeout.
+    """
+    if source.static is not None:
+        return source.static()
+    cached = cache.get(source.key)
+    if cache.fresh(cached, source.ttl):
+        return cached["text"]
+    headers = dict(source.headers)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        async with semaphore:
+            async with session.get(source.url, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=source.timeout)) as resp:
+                if resp.status == 304 and cached:
+                    cache.put(source.key, dict(cached, fetched_at=cache.clock()))
+                    return cached["text"]
+                if resp.status != 200:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                body = await resp.text()
+                etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        text = source.parse(body)
+    except Exception as e:
+        logging.warning(f"[AlphaScraper] {source.key} fetch fail: {e!r}")
+        return cached["text"] if cached else ""
+    cache.put(source.key, {"fetched_at": cache.clock(), "etag": etag, "last_modified": last_modified,
+                           "text": text, "hash": _hash(text)})
+    return text
+
+
+async def fetch_feeds(sources: List[Source], cache: FeedCache, concurrency: int = DEFAULT_CONCURRENCY) -> List[str]:
+    """Fetch every source concurrently (at most ``concurrency`` requests in flight), in source order."""
+    semaphore = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession() as session:
+        return list(await asyncio.gather(*(fetch_source(session, s, cache, semaphore) for s in sources)))
+
+
+async def summarize_alpha(feed_text):
     prompt = (
         "Summarize any actionable new MEV or DeFi alpha, bridge exploits, sandwich attacks, or arbitrage leaks in this feed. "
         "Output: actionable code/config snippets, or recommendations only."
         f"\n\nFEED:\n{feed_text}"
     )
     try:
-        resp = openai.ChatCompletion.create(
+        return await get_llm_gateway().complete(
+            prompt,
+            system="You are an adversarial MEV alpha hunter.",
             model=OPENAI_MODEL,
-            messages=[{"role": "system", "content": "You are an adversarial MEV alpha hunter."},
-                      {"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=600,
         )
-        return resp["choices"][0]["message"]["content"]
     except Exception as e:
         return f"[AlphaScraper] OpenAI failed: {e}"
 
-def run_alpha_scraper():
+
+def default_sources():
     # Add relevant alpha keywords and channels
     twitter_keywords = ["bridge exploit", "L2 MEV", "cross-chain arb", "sequencer auction"]
     github_repos = ["flashbots/mev-share", "offchainlabs/arbitrum"]
     dune_dashboards = ["4710832"]  # Dune dashboard IDs
     telegram_channels = ["blockchainalpha", "mevsignals"]
 
-    feed = []
-    feed.append(fetch_twitter_feed(twitter_keywords))
-    feed.append(fetch_github_feed(github_repos))
-    for dash in dune_dashboards:
-        feed.append(fetch_dune_dashboard(dash))
-    for chan in telegram_channels:
-        feed.append(fetch_telegram_feed(chan))
+    sources = twitter_sources(twitter_keywords) + github_sources(github_repos)
+    sources += [Source(f"dune:{d}", static=lambda d=d: fetch_dune_dashboard(d)) for d in dune_dashboards]
+    sources += [Source(f"telegram:{c}", static=lambda c=c: fetch_telegram_feed(c)) for c in telegram_channels]
+    return sources
 
-    combined_feed = "\n\n".join(feed)
-    summary = summarize_alpha(combined_feed)
+
+async def scrape_alpha(sources=None, cache=None, concurrency=DEFAULT_CONCURRENCY):
+    """One scrape cycle; returns ``(summary, changed)``.
+
+    When the combined feed hashes the same as last cycle's, the previous
+    summary is returned and the summarizer is not called.
+    """
+    cache = cache or FeedCache()
+    feeds = await fetch_feeds(sources if sources is not None else default_sources(), cache, concurrency)
+    combined_feed = "\n\n".join(f for f in feeds if f)
+    digest = _hash(combined_feed)
+    last = cache.get("summary")
+    if last and last.get("hash") == digest:
+        logging.info("[AlphaScraper] Feeds unchanged since last cycle; reusing summary")
+        return last["text"], False
+    summary = await summarize_alpha(combined_feed)
+    if not summary.startswith("[AlphaScraper] OpenAI failed"):
+        cache.put("summary", {"fetched_at": cache.clock(), "hash": digest, "text": summary})
     logging.info(f"[AlphaScraper][Summary] {summary}")
+    return summary, True
+
+
+def run_alpha_scraper(sources=None, cache=None):
+    summary, _ = asyncio.run(scrape_alpha(sources, cache))
     return summary
 
+
 if __name__ == "__main__":
     logging.basicConfig(filename="logs/mev_og.log", level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     print(run_alpha_scraper())
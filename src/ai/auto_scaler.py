@@ -1,28 +1,71 @@
+import asyncio
 import logging
 import json
 import os
 
+from src.services.performance_store import get_performance_store
+
 def load_module_perf(path="logs/module_performance.json"):
     if not os.path.exists(path):
         return {}
     with open(path, "r") as f:
         return json.load(f)
 
-def auto_scale_modules(config, perf_path="logs/module_performance.json"):
-    perf = load_module_perf(perf_path)
+def current_module_perf(config, store=None):
+    """O(1)-per-strategy snapshots from the performance store, caught up with the trade journal."""
+    store = store or get_performance_store(config.get("database_path", "data/bot_state.db"))
+    store.poll()
+    return store.snapshots()
+
+def allocate_capital(config, perf):
     capital_allocation = {}
     for mod, stats in perf.items():
-        winrate = stats.get("winrate", 0.5)
-        avg_pnl = stats.get("avg_pnl", 0)
+        # Recent (EWMA) win rate and PnL when the stats come from the performance store,
+        # so a fading edge loses capital before its lifetime averages catch up
+        winrate = stats.get("ewma_winrate", stats.get("winrate", 0.5))
+        avg_pnl = stats.get("ewma_pnl", stats.get("avg_pnl", 0))
         loss = stats.get("loss", 0)
         drawdown = stats.get("drawdown", 0)
         # Example: scale capital up if winrate and PnL are positive, down if not
         scale = max(0.01, min(1.0, winrate + avg_pnl - drawdown))
-        capital_allocation[mod] = float(config.get("starting_capital", 1000)) * scale
+        capital_allocation[mod] = float(config.get("starting_capital") or 1000) * scale
+    return capital_allocation
+
+def auto_scale_modules(config, perf_path=None, store=None):
+    # perf_path keeps the old JSON input working; by default stats come from the trade journal
+    perf = load_module_perf(perf_path) if perf_path else current_module_perf(config, store)
+    capital_allocation = allocate_capital(config, perf)
     logging.info(f"[AutoScaler] Updated capital allocation: {capital_allocation}")
     # For prod: update live config, notify orchestrator, or re-balance wallets accordingly
     return capital_allocation
 
+class AutoScaler:
+    """Rebalances on every new block, recomputing only when the performance store has new trades."""
+
+    def __init__(self, config, store=None):
+        self.config = config
+        self.store = store or get_performance_store(config.get("database_path", "data/bot_state.db"))
+        self.allocation = {}
+        self._version = None
+
+    def rebalance(self):
+        self.store.poll()
+        if self.store.version != self._version:
+            self._version = self.store.version
+            self.allocation = allocate_capital(self.config, self.store.snapshots())
+            logging.info(f"[AutoScaler] Updated capital allocation: {self.allocation}")
+        return self.allocation
+
+    async def on_head(self, head):
+        # The journal read is a small indexed query, but keep it off the event loop anyway
+        await asyncio.to_thread(self.rebalance)
+
+def register_auto_scaler(bus, config, store=None, chain=None):
+    """Event-bus entry point: rebalance capital once per block of ``chain`` (default: config network)."""
+    scaler = AutoScaler(config, store)
+    bus.on_head(chain or config["network"], scaler.on_head, name="auto_scaler")
+    return scaler
+
 if __name__ == "__main__":
     import yaml
     config = yaml.safe_load(open("config.yaml"))
@@ -2,15 +2,25 @@ import logging
 import json
 import os
 
-def prune_dead_edges(module_perf_log="logs/module_performance.json", threshold=-0.01):
-    if not os.path.exists(module_perf_log):
+from src.services.performance_store import get_performance_store
+
+def prune_dead_edges(module_perf_log=None, threshold=-0.01, store=None, database_path="data/bot_state.db"):
+    # module_perf_log keeps the old JSON input working; by default stats come from the trade journal
+    if module_perf_log is None:
+        store = store or get_performance_store(database_path)
+        store.poll()
+        perf = store.snapshots()
+    elif not os.path.exists(module_perf_log):
         logging.info("[EdgePruner] No performance log found.")
         return []
-    with open(module_perf_log, "r") as f:
-        perf = json.load(f)
+    else:
+        with open(module_perf_log, "r") as f:
+            perf = json.load(f)
     killed = []
     for mod, stats in perf.items():
-        if stats.get("avg_pnl", 0) < threshold or stats.get("fail_count", 0) > 2:
+        # Judge the recent (EWMA) PnL where the store provides it; JSON stats only have the average
+        recent_pnl = stats.get("ewma_pnl", stats.get("avg_pnl", 0))
+        if recent_pnl < threshold or stats.get("fail_count", 0) > 2:
             logging.warning(f"[EdgePruner] Killing module {mod} due to PnL decay or repeated fails.")
             killed.append(mod)
             # (Optionally) disable in config, move to archive, etc.
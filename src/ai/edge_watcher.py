@@ -1,19 +1,23 @@
+import asyncio
 import logging
 import time
-from src.ai.alpha_scraper import run_alpha_scraper
+from src.ai.alpha_scraper import scrape_alpha
 from src.ai.ai_orchestrator import AIOrchestrator
 
 class EdgeWatcher:
     def __init__(self, orchestrator: AIOrchestrator):
         self.orchestrator = orchestrator
 
-    def run_once(self):
+    async def run_once_async(self):
         # 1. Scrape public feeds for new leaks
-        summary = run_alpha_scraper()
+        summary, changed = await scrape_alpha()
+        if not changed:
+            logging.info("[EdgeWatcher] No new alpha since last cycle; skipping analysis")
+            return None
         logging.info(f"[EdgeWatcher] Alpha summary:\n{summary}")
 
-        # 2. Let LLM analyze and propose new module/config/contract upgrades
-        ai_reco = self.orchestrator.openai_analyze_logs(summary)
+        # 2. Let LLM analyze and propose new module/config/contract upgrades (via the shared, cached gateway)
+        ai_reco = await self.orchestrator.analyze_logs(summary)
         logging.info(f"[EdgeWatcher][LLM] Edge proposal:\n{ai_reco}")
 
         # 3. Human-in-the-loop: notify founder for approval, or auto-prompt orchestrator to test module/edge
@@ -21,6 +25,10 @@ class EdgeWatcher:
         print("[EdgeWatcher] New alpha recommendation:")
         print(ai_reco)
         # You can add: self.orchestrator.run_module('new_module_from_alpha')
+        return ai_reco
+
+    def run_once(self):
+        return asyncio.run(self.run_once_async())
 
     def run_loop(self, interval=900):
         while True:
@@ -0,0 +1,231 @@
+"""Shared gateway for LLM calls: response cache, in-flight coalescing and a token budget.
+
+Every AI component (orchestrator log review, alpha summaries, edge
+proposals) goes through one ``LLMGateway`` so identical prompts are
+answered once per TTL, concurrent identical prompts share one request, and
+total token spend per window is capped. Calls are async; the backend is
+pluggable so tests run against ``StubBackend`` instead of the API.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.metrics import REGISTRY
+
+DEFAULT_MODEL = "gpt-4o"
+LLM_LATENCY = "mev_llm_latency_seconds"
+
+REGISTRY.describe(LLM_LATENCY, "Latency of LLM backend calls (cache hits excluded)")
+
+Messages = List[Dict[str, str]]
+
+
+class BudgetExceeded(Exception):
+    """Raised instead of calling the backend when a request would overrun the token budget."""
+
+
+class OpenAIBackend:
+    """Chat completions through the async OpenAI client (created on first use)."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self._client = None
+
+    async def complete(self, model: str, messages: Messages, temperature: float,
+                       max_tokens: int) -> Tuple[str, int]:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self.api_key)
+        resp = await self._client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+        )
+        tokens = resp.usage.total_tokens if resp.usage else 0
+        return resp.choices[0].message.content or "", tokens
+
+
+class StubBackend:
+    """Local backend for tests: answers with ``responder(messages)`` after ``delay`` seconds."""
+
+    def __init__(self, responder: Optional[Callable[[Messages], str]] = None, delay: float = 0.0):
+        self.responder = responder or (lambda messages: f"stub: {messages[-1]['content'][:40]}")
+        self.delay = delay
+        self.calls: List[Messages] = []
+
+    async def complete(self, model: str, messages: Messages, temperature: float,
+                       max_tokens: int) -> Tuple[str, int]:
+        self.calls.append(messages)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        text = self.responder(messages)
+        return text, estimate_tokens(messages) + len(text) // 4
+
+
+def estimate_tokens(messages: Messages) -> int:
+    # ~4 characters per token is close enough for budgeting English prompts
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 4 * len(messages)
+
+
+class TokenBudget:
+    """Tokens spent per rolling ``window_sec``; ``limit`` of None only counts.
+
+    ``check`` reserves the estimate so concurrent requests cannot all pass
+    against the same headroom; ``charge`` swaps the reservation for the
+    usage the backend actually reported.
+    """
+
+    def __init__(self, limit: Optional[int] = None, window_sec: float = 86400.0, clock=time.time):
+        self.limit = limit
+        self.window_sec = window_sec
+        self.clock = clock
+        self.window_start = clock()
+        self.used = 0
+        self.reserved = 0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def _roll(self) -> None:
+        now = self.clock()
+        if now - self.window_start >= self.window_sec:
+            # In-flight reservations carry over; they are settled by charge()
+            self.window_start, self.used = now, 0
+
+    @property
+    def remaining(self) -> Optional[int]:
+        with self._lock:
+            self._roll()
+            return None if self.limit is None else max(0, self.limit - self.used - self.reserved)
+
+    def check(self, estimate: int) -> int:
+        """Reserve ``estimate`` tokens, or raise ``BudgetExceeded``; returns the amount reserved."""
+        with self._lock:
+            self._roll()
+            if self.limit is not None and self.used + self.reserved + estimate > self.limit:
+                raise BudgetExceeded(f"{self.used}/{self.limit} tokens used, {self.reserved} reserved; "
+                                     f"request needs ~{estimate}")
+            self.reserved += estimate
+            return estimate
+
+    def charge(self, tokens: int, reserved: int = 0) -> None:
+        """Record ``tokens`` of actual usage and release the ``reserved`` estimate it replaces."""
+        with self._lock:
+            self._roll()
+            self.reserved = max(0, self.reserved - reserved)
+            self.used += tokens
+            self.total += tokens
+
+
+class LLMGateway:
+    """Cached, coalesced, budgeted access to one LLM backend.
+
+    Responses are cached by a hash of (model, messages, temperature,
+    max_tokens) for ``ttl`` seconds, in an LRU of ``max_entries``. A request
+    identical to one already in flight on the same event loop awaits that
+    request instead of sending another. Before a backend call the gateway
+    reserves the prompt estimate plus ``max_tokens`` from the budget, and
+    afterwards settles the reservation against the usage the backend reports.
+    """
+
+    def __init__(self, backend=None, ttl: float = 3600.0, budget: Optional[TokenBudget] = None,
+                 max_entries: int = 512, clock=time.time):
+        self.backend = backend or OpenAIBackend()
+        self.ttl = ttl
+        self.budget = budget or TokenBudget(clock=clock)
+        self.max_entries = max_entries
+        self.clock = clock
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(model: str, messages: Messages, temperature: float, max_tokens: int) -> str:
+        raw = json.dumps([model, messages, temperature, max_tokens], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cached(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, text = entry
+        if expires <= self.clock():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return text
+
+    def _store(self, key: str, text: str, ttl: float) -> None:
+        self._cache[key] = (self.clock() + ttl, text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def complete(self, prompt: str, system: Optional[str] = None, model: str = DEFAULT_MODEL,
+                       temperature: float = 0.2, max_tokens: int = 700, ttl: Optional[float] = None) -> str:
+        messages: Messages = ([{"role": "system", "content": system}] if system else [])
+        messages.append({"role": "user", "content": prompt})
+        key = self.key(model, messages, temperature, max_tokens)
+        text = self._cached(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        reserved = self.budget.check(estimate_tokens(messages) + max_tokens)
+        fut = self._inflight[key] = loop.create_future()
+        tokens = 0
+        try:
+            with REGISTRY.timer(LLM_LATENCY, model=model):
+                text, tokens = await self.backend.complete(model, messages, temperature, max_tokens)
+            self._store(key, text, self.ttl if ttl is None else ttl)
+            fut.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # retrieved here so lone failures do not log "never retrieved"
+            raise
+        finally:
+            # Failed calls release their reservation without charging anything
+            self.budget.charge(tokens, reserved)
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "tokens_used": self.budget.used, "tokens_total": self.budget.total,
+                "tokens_remaining": self.budget.remaining, "cached": len(self._cache)}
+
+
+_GATEWAY: Optional[LLMGateway] = None
+_GLOBAL_LOCK = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway, created with the OpenAI backend on first use."""
+    global _GATEWAY
+    if _GATEWAY is None:
+        with _GLOBAL_LOCK:
+            if _GATEWAY is None:
+                limit = os.environ.get("LLM_TOKEN_BUDGET")
+                _GATEWAY = LLMGateway(budget=TokenBudget(int(limit) if limit else None))
+    return _GATEWAY
+
+
+def set_llm_gateway(gateway: Optional[LLMGateway]) -> None:
+    """Install ``gateway`` (e.g. one with a ``StubBackend``) as the process-wide gateway."""
+    global _GATEWAY
+    _GATEWAY = gateway
@@ -13,6 +13,18 @@ def monitor_bridge_events(config):
 def run_bridge_games(config):
     monitor_bridge_events(config)
 
+def register_bridge_games(bus, config):
+    """Event-bus entry point: bridge contract logs are pushed to us instead of polled."""
+    bridge_address = config.get('bridge_contract')
+    if not Web3.is_address(bridge_address or ''):
+        # A malformed address gets the node to reject this chain's shared log/mempool subscription
+        raise ValueError(f"bridge_contract must be a contract address, got {bridge_address!r}")
+
+    def on_bridge_log(log):
+        logging.info(f"[Alpha] Bridge event from {bridge_address} in tx {log.get('transactionHash')}")
+
+    bus.on_log(config['network'], [bridge_address], on_bridge_log, name="bridge_games")
+
 if __name__ == "__main__":
     import yaml
     config = yaml.safe_load(open("config.yaml"))
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import ccxt
 from web3 import Web3
@@ -22,6 +23,14 @@ def run_cex_dex_flash_arb(config):
     logging.info(f"[CEXDEXFlashArb] CEX Bid: {cex_bid}, CEX Ask: {cex_ask}, DEX Price: {dex_price}")
     # For prod: Insert flash loan + atomic CEX/DEX arb logic here using Aave/Uniswap + Binance/Coinbase/OKX APIs
 
+def register_cex_dex_flash_arb(bus, config):
+    """Event-bus entry point: compare CEX and DEX prices once per mainnet block."""
+    async def on_head(head):
+        cex_bid, cex_ask = await asyncio.to_thread(get_cex_prices)
+        logging.info(f"[CEXDEXFlashArb] Block {int(head['number'], 16)} CEX Bid: {cex_bid}, CEX Ask: {cex_ask}")
+
+    bus.on_head('mainnet', on_head, name="cex_dex_flash_arb")
+
 if __name__ == "__main__":
     import yaml
     config = yaml.safe_load(open("config.yaml"))
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import time
@@ -11,6 +12,18 @@ from src.notifier import notify_founder
 # ...and update any calls to notify_critical to use notify_founder
 from src.risk_manager import RiskManager
 from src.kill_switch import init_global_kill_switch, get_kill_switch
+from src.services.async_blockchain_service import AsyncBlockchainService
+from src.services.chain_cache import BlockCache
+from src.services.bridge import BridgeError, SimulatedBridge
+from src.services.tx_pipeline import NonceManager, ReceiptPoller, is_nonce_error
+from src.services.tx_templates import TemplateCache, swap_exact_eth_for_tokens
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from src.core.clock import RealClock, SimClock
+from src.pricing.quote_engine import QuoteEngine
+from src.pricing.sizing import optimal_trade_size, pool_reserves, mid_price
+from src.signer_daemon import connect_signer
+from src.core.metrics import timed_stage
+from src.monitoring import record_trade
 
 # === Signer Abstraction ===
 class SignerService:
@@ -23,80 +36,222 @@ class SignerService:
         self.private_key = key
 
     def sign(self, tx_dict):
-        return Account.sign_transaction(tx_dict, self.private_key)
+        # LocalAccount keeps the parsed key, so the key isn't re-parsed per signature
+        return self.account.sign_transaction(tx_dict)
+
+    @timed_stage("sign")
+    def sign_eth_tx(self, tx_dict) -> bytes:
+        return self.sign(tx_dict).rawTransaction
 
     def get_address(self):
         return self.account.address
 
-# === Simulated Bridge ===
-class SimulatedBridge:
-    """Simulates cross-chain transfer. Replace with real integration for prod."""
-    def __init__(self, fee_bps=8, min_delay=10, max_delay=25):
-        self.fee_bps = fee_bps
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-
-    def bridge(self, amount_eth):
-        fee = Decimal(amount_eth) * Decimal(self.fee_bps) / 10000
-        net = Decimal(amount_eth) - fee
-        delay = self.min_delay + int((self.max_delay - self.min_delay) * int.from_bytes(os.urandom(1), "big") / 255)
-        logging.info(f"[SimulatedBridge] Bridging {amount_eth} ETH → {net} ETH after {delay}s delay and {self.fee_bps}bps fee.")
-        time.sleep(delay)
-        return float(net), float(fee)
+    get_eth_address = get_address
 
 # === Transaction Manager ===
 class TransactionManager:
-    """Handles swap tx build, sign, gas estimation, sending, and monitoring."""
-    def __init__(self, web3, wallet, signer_service):
+    """Handles swap tx build, sign, gas estimation, sending, and monitoring.
+
+    Nonces come from a local ``NonceManager`` and receipts from a shared
+    ``ReceiptPoller``, so several transactions can be in flight per chain.
+    With an ``AsyncBlockchainService`` as ``rpc``, each block's receipt
+    lookups go to the node as one JSON-RPC batch instead of a thread per hash.
+    ``receipt_timeout`` (seconds) is how long a send waits before reporting the
+    tx as still pending; the poller keeps tracking it either way.
+    """
+    def __init__(self, web3, wallet, signer_service, cache=None, nonces=None, rpc=None, receipt_timeout=120.0):
         self.web3 = web3
         self.wallet = wallet
         self.signer = signer_service
+        self.cache = cache or BlockCache()
+        self.rpc = rpc
+        self.nonces = nonces or NonceManager(lambda w: self.web3.eth.get_transaction_count(w, "pending"))
+        self.receipts = ReceiptPoller(self._fetch_receipt, receipt_timeout, on_late_receipt=self._late_receipt)
+        self._overdue = {}  # tx hash -> nonce, for sends that timed out before their receipt
+        self.templates = TemplateCache()
+
+    async def _fetch_receipt(self, tx_hash):
+        if self.rpc is not None:
+            # Null until mined; concurrent calls from ReceiptPoller.on_block share one batch
+            return await self.rpc.request("eth_getTransactionReceipt", [Web3.to_hex(tx_hash)])
+        try:
+            return await asyncio.to_thread(self.web3.eth.get_transaction_receipt, tx_hash)
+        except TransactionNotFound:
+            return None
 
+    async def _block_number(self):
+        if self.rpc is not None:
+            return await self.rpc.request("eth_blockNumber")
+        return await asyncio.to_thread(lambda: self.web3.eth.block_number)
+
+    @timed_stage("build_swap_tx")
     def build_swap_tx(self, router, amount_in_wei, in_token, out_token, amount_out_min_wei, deadline):
-        # Uniswap V2/V3: Path must be [in_token, out_token]
-        swap_tx = router.functions.swapExactETHForTokens(
-            int(amount_out_min_wei),
-            [in_token, out_token],
-            self.wallet,
-            int(deadline)
-        ).build_transaction({
-            'from': self.wallet,
-            'value': int(amount_in_wei),
-            'nonce': self.web3.eth.get_transaction_count(self.wallet),
-        })
-        # Estimate gas & price
-        swap_tx['gas'] = self.web3.eth.estimate_gas(swap_tx)
-        swap_tx['gasPrice'] = self.web3.eth.gas_price  # Dynamic!
+        nonce = self.nonces.reserve(self.wallet)
+        try:
+            # Uniswap V2/V3: Path must be [in_token, out_token]; calldata comes from a cached template
+            template = self.templates.get(
+                (router.address, in_token, out_token),
+                lambda: swap_exact_eth_for_tokens([in_token, out_token], self.wallet))
+            swap_tx = {
+                'from': self.wallet,
+                'to': router.address,
+                'value': int(amount_in_wei),
+                'nonce': nonce,
+                'data': template.encode(amount_out_min_wei, deadline),
+                'chainId': self.cache.get_or_fetch("chain_id", lambda: self.web3.eth.chain_id, immutable=True),
+            }
+            # Estimate gas & price
+            swap_tx['gas'] = self.web3.eth.estimate_gas(swap_tx)
+            swap_tx['gasPrice'] = self.cache.get_or_fetch("gas_price", lambda: self.web3.eth.gas_price)  # Dynamic per block
+        except Exception:
+            self.nonces.release(self.wallet, nonce)
+            raise
         return swap_tx
 
+    def _broadcast(self, raw_tx, nonce):
+        try:
+            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            if is_nonce_error(e):
+                self.nonces.resync(self.wallet)
+            else:
+                self.nonces.release(self.wallet, nonce)
+            raise
+        logging.info(f"[TxManager] Sent tx {tx_hash.hex()} (nonce {nonce})")
+        return tx_hash
+
+    def submit(self, tx_dict, ladder=None):
+        """Sign (or pick a pre-signed variant) and broadcast without waiting; returns the tx hash."""
+        raw_tx = None
+        if ladder is not None:
+            # Pay at least the current gas price if a pre-signed variant covers it
+            raw_tx = ladder.select(self.cache.get_or_fetch("gas_price", lambda: self.web3.eth.gas_price))
+        if raw_tx is None:
+            try:
+                raw_tx = self.signer.sign_eth_tx(tx_dict)
+            except Exception:
+                self.nonces.release(self.wallet, tx_dict['nonce'])
+                raise
+        return self._broadcast(raw_tx, tx_dict['nonce'])
+
+    def _outcome(self, tx_dict, tx_hash, receipt):
+        self.nonces.confirm(self.wallet, tx_dict['nonce'])
+        if receipt.status == 1:
+            logging.info(f"[TxManager] Tx {tx_hash.hex()} confirmed in block {receipt.blockNumber}")
+            return True, tx_hash, receipt
+        logging.error(f"[TxManager] Tx reverted: {tx_hash.hex()}")
+        return False, tx_hash, receipt  # a reverted tx still paid for its gas
+
+    @staticmethod
+    def gas_fields(tx_dict, receipt):
+        """Journal columns for a mined tx: gas units and the effective price in gwei."""
+        gas_price = getattr(receipt, 'effectiveGasPrice', None) or tx_dict['gasPrice']
+        return {"gas_used_leg1": int(receipt.gasUsed), "gas_price_leg1_gwei_effective": gas_price / 1e9}
+
+    def _late_receipt(self, tx_hash, receipt):
+        nonce = self._overdue.pop(tx_hash, None)
+        if nonce is not None:
+            self._outcome({'nonce': nonce}, tx_hash, receipt)
+
+    @timed_stage("send_pipelined")
+    async def send_pipelined(self, tx_dict, ladder=None):
+        """Broadcast and await the receipt via the block-driven poller; other sends proceed meanwhile.
+
+        Returns ``(ok, tx_hash, receipt)``; ``ok`` is None if no receipt arrived
+        within ``receipt_timeout``. Such a tx may still be mined, so its nonce
+        stays reserved rather than being resynced from the chain.
+        """
+        try:
+            tx_hash = await asyncio.to_thread(self.submit, tx_dict, ladder)
+        except Exception as e:
+            logging.error(f"[TxManager] Send failed: {e}")
+            return False, None, None
+        try:
+            receipt = await self.receipts.track(tx_hash)
+        except TimeoutError as e:
+            logging.warning(f"[TxManager] {e}")
+            self._overdue[tx_hash] = tx_dict['nonce']
+            return None, tx_hash, None
+        return self._outcome(tx_dict, tx_hash, receipt)
+
+    @timed_stage("send_and_monitor")
     def send_and_monitor(self, tx_dict):
-        signed = self.signer.sign(tx_dict)
-        tx_hash = self.web3.eth.send_raw_transaction(signed.rawTransaction)
-        logging.info(f"[TxManager] Sent tx {tx_hash.hex()}, waiting for confirmation...")
+        tx_hash = self.submit(tx_dict)
+        logging.info(f"[TxManager] Waiting for confirmation of {tx_hash.hex()}...")
         try:
             receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            if receipt.status == 1:
-                logging.info(f"[TxManager] Tx {tx_hash.hex()} confirmed in block {receipt.blockNumber}")
-                return True, tx_hash, receipt.gasUsed * tx_dict['gasPrice'] / 1e18  # returns gas in ETH
-            else:
-                logging.error(f"[TxManager] Tx reverted: {tx_hash.hex()}")
-                return False, tx_hash, None
+            return self._outcome(tx_dict, tx_hash, receipt)
+        except TimeExhausted as e:
+            # Possibly still in the mempool: keep its nonce reserved rather than resyncing under it
+            logging.warning(f"[TxManager] {e}")
+            return None, tx_hash, None
         except Exception as e:
             logging.error(f"[TxManager] Tx receipt error: {e}")
+            self.nonces.resync(self.wallet)
             return False, tx_hash, None
 
+def max_trade_size_eth(config, price_usd):
+    """Largest size the arb grid may pick: ``max_trade_amount_eth``, else ``trade_amount_eth``.
+
+    Never more than ``starting_capital`` buys at ``price_usd``, so an unset cap
+    cannot fall through to a share of pool reserves.
+    """
+    cap = config.get("max_trade_amount_eth") or config.get("trade_amount_eth") or 0.1
+    capital = config.get("starting_capital")
+    if capital and price_usd > 0:
+        cap = min(cap, capital / price_usd)
+    return cap
+
+
+def sized_cross_chain_opportunity(quotes, pool_address, config, gas_usd):
+    """Best-sized mainnet/arbitrum arb from local pool state, or None below ``min_profit_usd``.
+
+    ``gas_usd(price_mainnet, price_l2)`` returns the total USD gas for both
+    legs. Shared by ``CrossChainArb`` and the replay backtester.
+    """
+    eth_token = config["eth_address"]
+    usdc_decimals = config["usdc_decimals"]
+    res_main = pool_reserves(quotes.get_pool(pool_address["mainnet"]), eth_token, usd_decimals=usdc_decimals)
+    res_l2 = pool_reserves(quotes.get_pool(pool_address["arbitrum"]), eth_token, usd_decimals=usdc_decimals)
+    price_mainnet, price_l2 = mid_price(res_main), mid_price(res_l2)
+    best = optimal_trade_size(
+        res_main, res_l2,
+        max_size=max_trade_size_eth(config, max(price_mainnet, price_l2)),
+        bridge_fee_bps=config.get("bridge_fee_bps", 8),
+        gas_usd=gas_usd(price_mainnet, price_l2),
+        slippage_bps=config.get("slippage_bps", 20),
+    )
+    logging.info(f"[CrossChainArb] Mainnet: {price_mainnet:.2f}, L2: {price_l2:.2f}, best size {best['size_eth']:.4f} ETH, Net: {best['net_profit_usd']:.2f}")
+    if best["net_profit_usd"] > config.get("min_profit_usd", 3):
+        buy_mainnet = best["buy"] == "a"
+        return {
+            "buy_chain": "mainnet" if buy_mainnet else "arbitrum",
+            "sell_chain": "arbitrum" if buy_mainnet else "mainnet",
+            "trade_amount_eth": best["size_eth"],
+            "net_profit_usd": best["net_profit_usd"],
+            "price_mainnet": price_mainnet,
+            "price_l2": price_l2
+        }
+    return None
+
 # === Main Cross-Chain Arb ===
 class CrossChainArb:
+    STRATEGY_ID = "cross_chain"
+
     def __init__(self, config_path="config.yaml"):
         self.config = load_config(config_path)
-        self.signer_service = SignerService()
-        self.wallet = self.signer_service.get_address()
+        self.signer_service = connect_signer(self.config, fallback=SignerService)
+        self.wallet = self.signer_service.get_eth_address()
         self.web3_mainnet = Web3(Web3.HTTPProvider(self.config["rpc_urls"]["mainnet"]))
         self.web3_l2 = Web3(Web3.HTTPProvider(self.config["rpc_urls"]["arbitrum"]))
         self.kill = init_global_kill_switch(self.config)
         self.risk = RiskManager(self.config, self.kill)
         self.live_mode = self.config.get("mode", "test") == "live"
-        self.bridge = SimulatedBridge(fee_bps=self.config.get("bridge_fee_bps", 8))
+        # Test mode fast-forwards bridge settlement on a virtual clock
+        self.bridge = SimulatedBridge(fee_bps=self.config.get("bridge_fee_bps", 8),
+                                      clock=RealClock() if self.live_mode else SimClock())
+        self.max_in_flight = self.config.get("max_in_flight_arbs", 4)
+        self.in_flight = set()
         # Routers must be present in config
         self.mainnet_router = self.web3_mainnet.eth.contract(
             address=self.config["uniswap_router_address"]["mainnet"],
@@ -104,11 +259,74 @@ class CrossChainArb:
         self.l2_router = self.web3_l2.eth.contract(
             address=self.config["uniswap_router_address"]["arbitrum"],
             abi=self.config["uniswap_router_abi"])
+        # Block-scoped read caches, shared by detection and execution on each chain
+        self.cache_mainnet = BlockCache()
+        self.cache_l2 = BlockCache()
         # Transaction Managers
-        self.txm_mainnet = TransactionManager(self.web3_mainnet, self.wallet, self.signer_service)
-        self.txm_l2 = TransactionManager(self.web3_l2, self.wallet, self.signer_service)
+        self.rpc_mainnet = AsyncBlockchainService(self.config, network="mainnet")
+        self.rpc_l2 = AsyncBlockchainService(self.config, network="arbitrum")
+        # Receipt timeouts are in seconds per chain: a block count means minutes on mainnet, seconds on Arbitrum
+        receipt_timeout = self.config.get("receipt_timeout_sec") or {}
+        self.txm_mainnet = TransactionManager(self.web3_mainnet, self.wallet, self.signer_service, self.cache_mainnet,
+                                              rpc=self.rpc_mainnet, receipt_timeout=receipt_timeout.get("mainnet", 120))
+        self.txm_l2 = TransactionManager(self.web3_l2, self.wallet, self.signer_service, self.cache_l2, rpc=self.rpc_l2,
+                                         receipt_timeout=receipt_timeout.get("arbitrum", 120))
+        # Local pool state: quotes are computed in-process and kept current from pool logs
+        self.quotes = QuoteEngine()
+        self.pool_address = {}
+        self.pool_synced_block = {}
+        for chain, web3 in self._chains():
+            addr = (self.config.get("uniswap_pool_address") or {}).get(chain)
+            if not addr:
+                continue
+            try:
+                if self.config.get("uniswap_pool_version", 2) == 3:
+                    self.quotes.load_v3_pool(web3, addr)
+                else:
+                    self.quotes.load_v2_pool(web3, addr)
+                self.pool_address[chain] = addr
+                self.pool_synced_block[chain] = web3.eth.block_number
+            except Exception as e:
+                logging.warning(f"[CrossChainArb] pool bootstrap failed on {chain}, using router quotes: {e}")
+        # One mainnet/arbitrum pair is sized in-process: a detection pool would add an IPC
+        # round trip per block and leave every worker but one idle
+        if self.config.get("detection_workers"):
+            logging.info("[CrossChainArb] detection_workers ignored: a single pair is sized in-process")
+
+    def _chains(self):
+        return (("mainnet", self.web3_mainnet), ("arbitrum", self.web3_l2))
 
+    def _cache_for(self, chain):
+        return self.cache_mainnet if chain == "mainnet" else self.cache_l2
+
+    def refresh_heads(self):
+        """Advance the per-chain caches to the current block and pull new pool logs."""
+        for chain, web3 in self._chains():
+            try:
+                block_number = web3.eth.block_number
+                self._cache_for(chain).advance(block_number)
+                self.sync_pool(chain, web3, block_number)
+            except Exception as e:
+                logging.warning(f"[CrossChainArb] head refresh failed on {chain}: {e}")
+
+    def sync_pool(self, chain, web3, block_number):
+        addr = self.pool_address.get(chain)
+        synced = self.pool_synced_block.get(chain)
+        if not addr or synced is None or block_number <= synced:
+            return
+        logs = web3.eth.get_logs({"fromBlock": synced + 1, "toBlock": block_number, "address": Web3.to_checksum_address(addr)})
+        self.quotes.apply_logs(logs)
+        self.pool_synced_block[chain] = block_number
+
+    @timed_stage("get_price")
     def get_price(self, web3, router, token_addr, amount_in_wei):
+        pool_addr = self.pool_address.get("mainnet" if web3 is self.web3_mainnet else "arbitrum")
+        if pool_addr:
+            try:
+                out = self.quotes.quote(pool_addr, token_addr, int(amount_in_wei))
+                return Decimal(out) / (10 ** self.config["usdc_decimals"])
+            except Exception as e:
+                logging.warning(f"[CrossChainArb] local quote failed, falling back to router: {e}")
         try:
             out = router.functions.getAmountsOut(amount_in_wei, [
                 token_addr, self.config["usdc_address"]
@@ -118,36 +336,52 @@ class CrossChainArb:
             logging.warning(f"[CrossChainArb] get_price failed: {e}")
             return None
 
-    def detect_opportunity(self):
-        eth_token = self.config["eth_address"]
-        amount_in_wei = Web3.to_wei(self.config.get("trade_amount_eth", 0.1), "ether")
-        price_mainnet = self.get_price(self.web3_mainnet, self.mainnet_router, eth_token, amount_in_wei)
-        price_l2 = self.get_price(self.web3_l2, self.l2_router, eth_token, amount_in_wei)
-        if not price_mainnet or not price_l2:
-            logging.warning("[CrossChainArb] Price fetch failed")
-            return None
-        trade_amount = Decimal(self.config.get("trade_amount_eth", 0.1))
-        bridge_fee_bps = Decimal(self.config.get("bridge_fee_bps", 8))
-        gross_delta = price_l2 - price_mainnet
-        gross_profit = gross_delta * trade_amount
-        # Estimate gas dynamically
+    def _gas_costs_usd(self, trade_amount, price_mainnet, price_l2):
         dummy_tx = {
             'from': self.wallet,
             'to': self.config["usdc_address"],
             'value': Web3.to_wei(trade_amount, "ether")
         }
+        # The estimate depends on the exact call, so key it on the tx rather than sharing one slot
+        gas_key = ("estimate_gas", dummy_tx['from'], dummy_tx['to'], dummy_tx['value'])
         try:
-            gas_mainnet = self.web3_mainnet.eth.estimate_gas(dummy_tx)
-            gas_price_main = self.web3_mainnet.eth.gas_price / 1e9
+            gas_mainnet = self.cache_mainnet.get_or_fetch(gas_key, lambda: self.web3_mainnet.eth.estimate_gas(dummy_tx))
+            gas_price_main = self.cache_mainnet.get_or_fetch("gas_price", lambda: self.web3_mainnet.eth.gas_price) / 1e9
             gas_cost_main_usd = gas_mainnet * gas_price_main * float(price_mainnet) / 1e9
         except:
             gas_cost_main_usd = 2
         try:
-            gas_l2 = self.web3_l2.eth.estimate_gas(dummy_tx)
-            gas_price_l2 = self.web3_l2.eth.gas_price / 1e9
+            gas_l2 = self.cache_l2.get_or_fetch(gas_key, lambda: self.web3_l2.eth.estimate_gas(dummy_tx))
+            gas_price_l2 = self.cache_l2.get_or_fetch("gas_price", lambda: self.web3_l2.eth.gas_price) / 1e9
             gas_cost_l2_usd = gas_l2 * gas_price_l2 * float(price_l2) / 1e9
         except:
             gas_cost_l2_usd = 0.2
+        return gas_cost_main_usd, gas_cost_l2_usd
+
+    def detect_sized_opportunity(self):
+        """Size the trade over a grid of amounts using local pool state (no RPC on the hot path)."""
+        trade_amount = self.config.get("trade_amount_eth", 0.1)
+        return sized_cross_chain_opportunity(
+            self.quotes, self.pool_address, self.config,
+            lambda price_mainnet, price_l2: sum(self._gas_costs_usd(trade_amount, price_mainnet, price_l2)))
+
+    @timed_stage("detect_opportunity")
+    def detect_opportunity(self):
+        if "mainnet" in self.pool_address and "arbitrum" in self.pool_address:
+            return self.detect_sized_opportunity()
+        eth_token = self.config["eth_address"]
+        amount_in_wei = Web3.to_wei(self.config.get("trade_amount_eth", 0.1), "ether")
+        price_mainnet = self.get_price(self.web3_mainnet, self.mainnet_router, eth_token, amount_in_wei)
+        price_l2 = self.get_price(self.web3_l2, self.l2_router, eth_token, amount_in_wei)
+        if not price_mainnet or not price_l2:
+            logging.warning("[CrossChainArb] Price fetch failed")
+            return None
+        trade_amount = Decimal(self.config.get("trade_amount_eth", 0.1))
+        bridge_fee_bps = Decimal(self.config.get("bridge_fee_bps", 8))
+        gross_delta = price_l2 - price_mainnet
+        gross_profit = gross_delta * trade_amount
+        # Estimate gas dynamically
+        gas_cost_main_usd, gas_cost_l2_usd = self._gas_costs_usd(trade_amount, price_mainnet, price_l2)
         bridge_fee = (trade_amount * bridge_fee_bps) / Decimal(10000) * price_mainnet
         net_profit = gross_profit - Decimal(gas_cost_main_usd) - Decimal(gas_cost_l2_usd) - bridge_fee
         logging.info(f"[CrossChainArb] Mainnet: {price_mainnet}, L2: {price_l2}, Gross: {gross_profit:.2f}, Net: {net_profit:.2f}")
@@ -162,16 +396,20 @@ class CrossChainArb:
             }
         return None
 
-    def execute_arb(self, opp):
+    async def execute_arb(self, opp):
         if not self.risk.check_trade(opp["net_profit_usd"]):
             notify_critical("[RISK] Trade blocked by risk manager")
             return False
         if not self.kill.is_enabled():
             notify_critical("[KILL SWITCH] Not enabled, aborting")
             return False
+        started = time.time()
+        trade = {"opportunity_id": opp.get("id"), "token_in_address": self.config.get("eth_address"),
+                 "token_out_address": self.config.get("usdc_address")}
         try:
             eth_amt = Decimal(opp["trade_amount_eth"])
             in_wei = Web3.to_wei(eth_amt, "ether")
+            trade["token_in_amount_wei"] = str(in_wei)
             deadline = int(time.time()) + 180
             in_token = self.config["eth_address"]
             out_token = self.config["usdc_address"]
@@ -190,25 +428,38 @@ class CrossChainArb:
 
             amount_out_min = Decimal(price) * eth_amt * Decimal(1 - self.config.get("slippage_bps", 20) / 10000)
             amount_out_min_wei = int(amount_out_min * (10 ** self.config["usdc_decimals"]))
+            trade["token_out_amount_min_wei"] = str(amount_out_min_wei)
 
             if not self.live_mode:
                 logging.info(f"[SIM][Arb] Would sell {eth_amt} ETH for min {amount_out_min_wei / (10**self.config['usdc_decimals']):.2f} USDC on {opp['sell_chain']}")
-                net_after_bridge, _ = self.bridge.bridge(eth_amt)
+                net_after_bridge, _ = await self.bridge.start_transfer(eth_amt).wait()
                 logging.info(f"[SIM][Arb] Would now buy {net_after_bridge:.6f} ETH back on {opp['buy_chain']}")
                 self.risk.update_drawdown(opp["net_profit_usd"])
                 self.kill.update_pnl(opp["net_profit_usd"])
+                record_trade(self.STRATEGY_ID, opp["net_profit_usd"], time.time() - started, status="simulated", **trade)
                 return True
 
-            # Build, sign, send, monitor
-            tx = txm.build_swap_tx(router, in_wei, in_token, out_token, amount_out_min_wei, deadline)
-            ok, tx_hash, gas_used_eth = txm.send_and_monitor(tx)
+            # Build, sign, send, monitor. The amounts are only known once the opportunity fires,
+            # so the tx is signed once at the block's gas price rather than at a ladder of them
+            tx = await asyncio.to_thread(txm.build_swap_tx, router, in_wei, in_token, out_token, amount_out_min_wei, deadline)
+            ok, tx_hash, receipt = await txm.send_pipelined(tx)
+            tx_hash = tx_hash.hex() if tx_hash else ""
+            if receipt is not None:
+                trade.update(txm.gas_fields(tx, receipt))
+            if ok is None:
+                notify_critical(f"[Arb] Sell leg on {opp['sell_chain']} has no receipt yet; still tracking {tx_hash}.")
+                record_trade(self.STRATEGY_ID, 0.0, time.time() - started, tx_hash, status="pending",
+                             error_message_leg1="sell leg receipt timed out", **trade)
+                return False
             if not ok:
                 notify_critical(f"[Arb] Sell leg failed on {opp['sell_chain']}.")
+                record_trade(self.STRATEGY_ID, 0.0, time.time() - started, tx_hash, status="failed",
+                             error_message_leg1="sell leg failed", **trade)
                 return False
 
             # Step 2: Bridge ETH to the other chain
-            net_after_bridge, _ = self.bridge.bridge(eth_amt)
-            # (In reality, you'd wait for bridge confirmation before step 3)
+            # The detection loop keeps running while this leg settles
+            net_after_bridge, _ = await self.bridge.start_transfer(eth_amt).wait()
 
             # Step 3: Buy ETH on the cheaper chain (reverse swap)
             # For simplicity, simulate using USDC to buy back ETH (could be a real swapExactTokensForETH)
@@ -219,17 +470,49 @@ class CrossChainArb:
             # All steps succeeded
             self.risk.update_drawdown(opp["net_profit_usd"])
             self.kill.update_pnl(opp["net_profit_usd"])
+            record_trade(self.STRATEGY_ID, opp["net_profit_usd"], time.time() - started, tx_hash, status="success", **trade)
             return True
+        except BridgeError as e:
+            logging.error(f"[CrossChainArb] Bridge leg failed: {e}")
+            record_trade(self.STRATEGY_ID, 0.0, time.time() - started, status="failed", error_message_leg1=str(e), **trade)
+            return False
         except Exception as e:
             logging.critical(f"[CrossChainArb] Arb execution error: {traceback.format_exc()}")
+            record_trade(self.STRATEGY_ID, 0.0, time.time() - started, status="failed", error_message_leg1=str(e), **trade)
             return False
 
-    def run(self):
+    async def _execute_and_log(self, opp):
+        success = await self.execute_arb(opp)
+        if not success:
+            logging.warning("[CrossChainArb] Arb execution failed, see logs")
+
+    async def run_async(self):
         logging.info("[CrossChainArb] Starting cross-chain arb loop (full live mode)")
+        pollers = [
+            asyncio.ensure_future(txm.receipts.run(txm._block_number, self.config.get("receipt_poll_interval_sec", 1),
+                                                   keep_running=lambda: self.kill.is_enabled() or bool(self.in_flight)))
+            for txm in (self.txm_mainnet, self.txm_l2)
+        ]
         while self.kill.is_enabled():
-            opp = self.detect_opportunity()
-            if opp:
-                success = self.execute_arb(opp)
-                if not success:
-                    logging.warning("[CrossChainArb] Arb execution failed, see logs")
-            time.sleep(self.config.get("poll_interval_sec", 12))
+            await asyncio.to_thread(self.refresh_heads)
+            opp = await asyncio.to_thread(self.detect_opportunity)
+            if opp and len(self.in_flight) < self.max_in_flight:
+                task = asyncio.ensure_future(self._execute_and_log(opp))
+                self.in_flight.add(task)
+                task.add_done_callback(self.in_flight.discard)
+            elif opp:
+                logging.info(f"[CrossChainArb] {len(self.in_flight)} arbs in flight, skipping opportunity")
+            await asyncio.sleep(self.config.get("poll_interval_sec", 12))
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(self.rpc_mainnet.close(), self.rpc_l2.close(), self.bridge.close())
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+async def run_cross_chain_arb(config):
+    """Strategy-runtime entry point: runs the arb loop on the caller's event loop."""
+    bot = await asyncio.to_thread(CrossChainArb)
+    await bot.run_async()
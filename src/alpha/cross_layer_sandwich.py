@@ -1,40 +1,218 @@
+import asyncio
 import logging
-import time
-from web3 import Web3
+from collections import deque
+from typing import Iterable, Optional
+
+from src.core.config_manager import AppConfig
+from src.core.detection_pool import DetectionPool, SharedPoolState
+from src.core.event_log import record_event
+from src.pricing.quote_engine import QuoteEngine, V2Pool
+from src.pricing.sizing import optimal_sandwich, pool_reserves
+from src.services.blockchain_service import BlockchainService
+from src.services.calldata_decoder import default_decoder, selector_of
+from src.services.mempool import MempoolPipeline, PendingTxFilter
+
+# Arbitrum Inbox entry points that carry L2 calldata
+BRIDGE_SELECTORS = (
+    "0x679b6ded",  # createRetryableTicket
+    "0x6e6e8a6a",  # unsafeCreateRetryableTicket
+    "0xb75436bb",  # sendL2Message
+    "0x5075788b",  # sendUnsignedTransaction
+)
+
+DECODER = default_decoder()
 
 def decode_bridge_call(tx_input, dex_sig):
-    # Look for target DEX signature in calldata (stub: implement proper ABI decoding)
-    return dex_sig.lower() in tx_input.lower()
+    """True if the bridge calldata (bytes or hex) carries an L2 call to ``dex_sig``."""
+    return DECODER.calls_selector(tx_input, dex_sig)
+
+def make_bridge_call_handler(dex_sig):
+    dex_selector = selector_of(dex_sig)
+
+    def on_bridge_call(tx):
+        if DECODER.calls_selector(tx['input'], dex_selector):
+            logging.info(f"[XLS] Detected potential L2 swap via bridge: {tx['hash']}")
+            # TODO: Build/send frontrun/backrun L1 tx here
+    return on_bridge_call
+
+def _victim_swap(tx_input, dex_selector):
+    """(bridge call, nested swap) for bridge calldata carrying a call to ``dex_selector``."""
+    call = DECODER.decode(tx_input)
+    if call is None:
+        return None, None
+    for inner in call.walk():
+        if inner.selector == dex_selector:
+            return call, inner
+    return call, None
+
+def detect_bridge_swap(tx, params, state=None):
+    """Detection-pool worker task: the pending bridge tx if it carries an L2 call to ``params['dex_sig']``.
 
-def mempool_watch_and_attack(w3, bridge_addr, dex_sig, poll_interval=2):
+    With a ``SharedPoolState`` and ``params['pool_row']`` the victim is priced
+    against the L2 pool's live reserves and only profitable sandwiches are
+    returned; otherwise the opportunity carries ``expected_profit_usd``.
+    """
+    if not DECODER.calls_selector(tx['input'], params['dex_sig']):
+        return None
+    row = params.get("pool_row")
+    if state is None or row is None:
+        return {"hash": tx['hash'], "net_profit_usd": params.get("expected_profit_usd", 0.0)}
+    reserves = state.read(row)
+    if not reserves[0]:
+        return None  # no Sync seen for the pool yet
+    bridge_call, swap = _victim_swap(tx['input'], selector_of(params['dex_sig']))
+    if swap is None:
+        return None
+    # ETH the L2 call carries: retryable tickets forward l2CallValue, unsigned txs their value
+    victim_wei = bridge_call.args.get("l2CallValue") or bridge_call.args.get("value") or 0
+    if not victim_wei:
+        return None
+    best = optimal_sandwich(
+        reserves, victim_wei / 1e18,
+        max_size=params.get("max_size"),
+        gas_usd=state.gas_usd,
+        victim_min_out_usd=swap.args.get("amountOutMin", 0) / 10 ** params.get("usd_decimals", 6),
+    )
+    if best["net_profit_usd"] <= params.get("min_profit_usd", 0.0):
+        return None
+    return {"hash": tx['hash'], "net_profit_usd": best["net_profit_usd"], "frontrun_eth": best["size_eth"],
+            "victim_eth": victim_wei / 1e18}
+
+def build_pipeline(bridge_addr, dex_sig, selectors: Optional[Iterable[str]] = BRIDGE_SELECTORS, consumers=None, maxsize=1024):
+    """Mempool pipeline pre-filtered to bridge calls; ``consumers`` maps name -> extra handler."""
+    pipeline = MempoolPipeline(PendingTxFilter([bridge_addr], selectors), maxsize=maxsize)
+    pipeline.add_consumer("xls", make_bridge_call_handler(dex_sig))
+    for name, handler in (consumers or {}).items():
+        pipeline.add_consumer(name, handler)
+    return pipeline
+
+async def mempool_watch_and_attack(source, bridge_addr, dex_sig, consumers=None):
+    """Stream full pending txs from ``source`` and fan bridge calls out to the consumers."""
     logging.info("[XLS] Watching mempool for L1->L2 bridge calls...")
-    pending_filter = w3.eth.filter('pending')
-    while True:
-        tx_hashes = pending_filter.get_new_entries()
-        for txh in tx_hashes:
-            try:
-                tx = w3.eth.get_transaction(txh)
-                if tx['to'] and tx['to'].lower() == bridge_addr.lower():
-                    if decode_bridge_call(tx['input'], dex_sig):
-                        logging.info(f"[XLS] Detected potential L2 swap via bridge: {tx['hash']}")
-                        # TODO: Build/send frontrun/backrun L1 tx here
-            except Exception as e:
-                continue
-        time.sleep(poll_interval)
+    pipeline = build_pipeline(bridge_addr, dex_sig, consumers=consumers)
+    try:
+        await pipeline.run(source)
+    finally:
+        logging.info(f"[XLS] Mempool stats: {pipeline.stats()}")
+    return pipeline
 
 def run_cross_layer_sandwich(config):
-    w3 = Web3(Web3.HTTPProvider(config['rpc_urls']['mainnet']))
+    chain = BlockchainService(AppConfig.model_validate({**config, 'network': 'mainnet'}))
+    bridge_addr = config['contracts']['arbitrum_bridge']
+    dex_sig = config['contracts']['target_dex_sig']
+    asyncio.run(mempool_watch_and_attack(chain.stream_pending_transactions(), bridge_addr, dex_sig))
+
+class BridgeSwapDetector:
+    """Bridge-call decoding sharded over ``DetectionPool`` workers.
+
+    The target L2 pool (``contracts.target_l2_pool``) lives in row 0 of a
+    ``SharedPoolState``, kept current from its ``Sync`` logs, so workers price
+    each victim against live reserves without any state crossing the process
+    boundary. Results are delivered to the event loop as soon as a worker
+    reports them.
+    """
+
+    POOL_ROW = 0
+
+    def __init__(self, config, workers):
+        contracts = config['contracts']
+        self.pool_address = contracts.get('target_l2_pool')
+        self.state = SharedPoolState(1)
+        params = {"dex_sig": selector_of(contracts['target_dex_sig']),
+                  "min_profit_usd": config.get("min_profit_usd", 0.0),
+                  "max_size": config.get("max_trade_amount_eth") or config.get("trade_amount_eth") or 0.1,
+                  "usd_decimals": config.get("usdc_decimals", 6)}
+        self.quotes = QuoteEngine()
+        self.eth_token = (config.get("weth_address") or "").lower()
+        self.usd_decimals = params["usd_decimals"]
+        if self.pool_address:
+            if not (self.eth_token and config.get("usdc_address")):
+                raise ValueError("contracts.target_l2_pool needs weth_address and usdc_address to orient its reserves")
+            params["pool_row"] = self.POOL_ROW
+            # V2 pairs order their tokens by address; the first Sync log sets the reserves
+            tokens = sorted((self.eth_token, (config.get("usdc_address") or "").lower()))
+            self.quotes.add_pool(self.pool_address, V2Pool(*tokens))
+        self.detection = DetectionPool(self.state, detect_tx=detect_bridge_swap, workers=workers, params=params,
+                                       on_opportunity=self._on_result)
+        self.loop = None
+        self.recent = deque(maxlen=256)
+        self._closed = False
+
+    def start(self):
+        self.detection.start()
+
+    def submit(self, tx):
+        """Pending-tx handler (event loop): only hash and calldata cross the process boundary."""
+        if self.loop is None:
+            try:
+                self.loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+        return self.detection.submit_tx({"hash": tx['hash'], "input": tx['input']})
+
+    def on_head(self, head):
+        number = head["number"]
+        self.state.set_block(int(number, 16) if isinstance(number, str) else int(number))
+
+    def on_pool_log(self, log):
+        """Log of the target pool: publish reserves changed by a ``Sync`` to the workers."""
+        if self.quotes.apply_log(log):
+            pool = self.quotes.get_pool(self.pool_address)
+            self.state.write(self.POOL_ROW, pool_reserves(pool, self.eth_token, usd_decimals=self.usd_decimals))
+
+    def _on_result(self, opp):
+        # Merger thread: hop onto the event loop rather than waiting for the next head
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self.act, opp)
+                return
+            except RuntimeError:  # loop closed in between
+                pass
+        self.act(opp)
+
+    def act(self, opp):
+        self.recent.append(opp)
+        logging.info(f"[XLS] Sandwich candidate {opp['hash']}: ~${opp['net_profit_usd']:.2f}")
+        record_event("opportunity", "cross_layer_sandwich", pnl_usd=opp['net_profit_usd'], detail=opp['hash'])
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.detection.stop()
+        self.state.close()
+        self.state.unlink()
+
+def register_cross_layer_sandwich(bus, config):
+    """Event-bus entry point: share the mainnet mempool feed with the other strategies.
+
+    With ``detection_workers`` set, the filtered bridge calls are decoded in a
+    ``BridgeSwapDetector``, which the bus shuts down when it stops.
+    """
     bridge_addr = config['contracts']['arbitrum_bridge']
     dex_sig = config['contracts']['target_dex_sig']
-    mempool_watch_and_attack(w3, bridge_addr, dex_sig)
+    workers = config.get('detection_workers', 0)
+    if not workers:
+        bus.on_pending_tx('mainnet', make_bridge_call_handler(dex_sig), addresses=[bridge_addr],
+                          selectors=BRIDGE_SELECTORS, name="cross_layer_sandwich")
+        return None
+    detector = BridgeSwapDetector(config, workers)
+    detector.start()
+    bus.on_stop(detector.close)
+    bus.on_pending_tx('mainnet', detector.submit, addresses=[bridge_addr], selectors=BRIDGE_SELECTORS,
+                      name="cross_layer_sandwich")
+    bus.on_head('mainnet', detector.on_head, name="cross_layer_sandwich_block")
+    if detector.pool_address:
+        bus.on_log('arbitrum', [detector.pool_address], detector.on_pool_log, name="cross_layer_sandwich_pool")
+    return detector
 
 # TEST HARNESS
 def test_decode_bridge_call():
     sig = "0x12345678"
-    input_data = "0xabcdef12345678"
+    input_data = "0x12345678" + "00" * 32
     assert decode_bridge_call(input_data, sig) is True
 
 if __name__ == "__main__":
-    import yaml
-    config = yaml.safe_load(open("../config.yaml"))
-    run_cross_layer_sandwich(config)
+    from src.utils import load_config
+    run_cross_layer_sandwich(load_config("config.yaml"))
@@ -26,6 +26,18 @@ def simulate_l2_sandwich(config):
     else:
         logging.info("[Alpha] No sandwich opportunities in this poll.")
 
+def register_l2_sandwich(bus, config):
+    """Event-bus entry point: react to pending L2 bridge txs instead of polling the pending block."""
+    l2_bridge = config.get('l2_bridge_address')
+    if not Web3.is_address(l2_bridge or ''):
+        # A malformed address gets the node to reject this chain's shared log/mempool subscription
+        raise ValueError(f"l2_bridge_address must be a contract address, got {l2_bridge!r}")
+
+    def on_bridge_tx(tx):
+        logging.info(f"[Alpha] L2 Swap candidate: {tx['hash']}")
+
+    bus.on_pending_tx(config['network'], on_bridge_tx, addresses=[l2_bridge], name="l2_sandwich")
+
 if __name__ == "__main__":
     import yaml
     config = yaml.safe_load(open("config.yaml"))
@@ -0,0 +1,181 @@
+"""Recorded chain data in a columnar store (see ``column_store``).
+
+``ChainStore`` keeps blocks, pool logs, pending transactions and pool
+snapshots as append-only column tables, so research over recorded history
+is vectorized NumPy scans over memory-mapped columns instead of JSON/text
+parsing. Its writer methods match ``ReplayWriter``, so ``record_bus`` can
+record straight into it, and ``events()`` yields the same ``ReplayEvent``
+stream ``ReplayEngine`` runs on. Trade outcomes live in the SQLite trade
+journal (``services.trade_journal``), not here.
+"""
+
+import heapq
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.column_store import ColumnTable, open_tables
+from src.core.replay import BLOCK, LOG, POOL, TX, ReplayEvent, _hex, _jsonable, _raw, pool_snapshot, read_events
+
+# Every event table carries ``seq``, a store-wide sequence number, so a
+# replay interleaves the tables exactly in recorded order.
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "blocks": {"seq": "u8", "ts": "f8", "chain": "symbol", "number": "u8", "base_fee": "u8", "hash": "S32"},
+    "logs": {"seq": "u8", "ts": "f8", "chain": "symbol", "block": "u8", "address": "address",
+             "topic0": "S32", "topics": "blob", "data": "blob"},
+    "pending_txs": {"seq": "u8", "ts": "f8", "chain": "symbol", "sender": "address", "to": "address",
+                    "selector": "S4", "value_eth": "f8", "gas_price_gwei": "f8", "tx": "blob"},
+    "pools": {"seq": "u8", "ts": "f8", "chain": "symbol", "address": "address", "snapshot": "blob"},
+}
+EVENT_TABLES = {"blocks": BLOCK, "logs": LOG, "pending_txs": TX, "pools": POOL}
+
+
+def _int(value: Any) -> int:
+    if value is None:
+        return 0
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class ChainStore:
+    """Columnar event store rooted at a directory.
+
+    Appends are buffered per table and written ``batch_size`` rows at a time
+    (or on ``flush``/``close``); column reads see committed rows only. A
+    store opened with ``readonly=True`` (or ``ChainStore.open``) never
+    creates a file or directory and rejects writes.
+    """
+
+    def __init__(self, root: str, batch_size: int = 4096, clock=time.time, readonly: bool = False):
+        self.root = root
+        self.clock = clock
+        self.batch_size = batch_size
+        self.readonly = readonly
+        if readonly and not is_chain_store(root):
+            raise FileNotFoundError(f"No chain store at {root}")
+        self.tables: Dict[str, ColumnTable] = open_tables(root, SCHEMAS, create=not readonly)
+        self._pending: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.tables}
+        self._seq = max((int(t.column("seq")[-1]) + 1 for name, t in self.tables.items()
+                         if name in EVENT_TABLES and len(t)), default=0)
+
+    @classmethod
+    def open(cls, root: str) -> "ChainStore":
+        """Read-only view of an existing store."""
+        return cls(root, readonly=True)
+
+    def __enter__(self) -> "ChainStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getitem__(self, table: str) -> ColumnTable:
+        return self.tables[table]
+
+    # --- writing ---------------------------------------------------------
+
+    def _append(self, table: str, row: Dict[str, Any]) -> None:
+        if self.readonly:
+            raise PermissionError(f"Chain store {self.root} is open read-only")
+        if table in EVENT_TABLES:
+            row["seq"] = self._seq
+            self._seq += 1
+        pending = self._pending[table]
+        pending.append(row)
+        if len(pending) >= self.batch_size:
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        rows = self._pending[table]
+        if rows:
+            self.tables[table].append_rows(rows)
+            self._pending[table] = []
+
+    def flush(self) -> None:
+        for table in self._pending:
+            self._flush_table(table)
+
+    def close(self) -> None:
+        self.flush()
+
+    def block(self, chain: str, header: Dict[str, Any], ts: Optional[float] = None) -> None:
+        if ts is None:
+            ts = float(_int(header["timestamp"])) if header.get("timestamp") is not None else self.clock()
+        self._append("blocks", {"ts": ts, "chain": chain, "number": _int(header["number"]),
+                                "base_fee": _int(header.get("baseFeePerGas")), "hash": _raw(header.get("hash"), 32)})
+
+    def log(self, chain: str, log: Dict[str, Any], ts: Optional[float] = None) -> None:
+        topics = [_raw(t, 32) for t in log.get("topics") or []]
+        self._append("logs", {"ts": self.clock() if ts is None else ts, "chain": chain,
+                              "block": _int(log.get("blockNumber")), "address": _hex(_raw(log["address"], 20)),
+                              "topic0": topics[0] if topics else b"", "topics": b"".join(topics),
+                              "data": _raw(log.get("data") or b"")})
+
+    def pending_tx(self, chain: str, tx: Dict[str, Any], ts: Optional[float] = None) -> None:
+        tx = _jsonable(dict(tx))
+        data = tx.get("input") or tx.get("data") or "0x"
+        gas_price = tx.get("gasPrice") or tx.get("maxFeePerGas")
+        self._append("pending_txs", {"ts": self.clock() if ts is None else ts, "chain": chain,
+                                     "sender": tx.get("from") or "", "to": tx.get("to") or "",
+                                     "selector": _raw(data)[:4], "value_eth": _int(tx.get("value")) / 1e18,
+                                     "gas_price_gwei": _int(gas_price) / 1e9,
+                                     "tx": json.dumps(tx, separators=(",", ":")).encode()})
+
+    def pool(self, chain: str, address: str, pool: Any, ts: Optional[float] = None) -> None:
+        snap = dict(pool_snapshot(pool), address=address.lower())
+        self._append("pools", {"ts": self.clock() if ts is None else ts, "chain": chain, "address": address,
+                               "snapshot": json.dumps(snap, separators=(",", ":")).encode()})
+
+    # --- reading ---------------------------------------------------------
+
+    def _table_events(self, name: str) -> Iterator[tuple]:
+        table = self.tables[name]
+        kind = EVENT_TABLES[name]
+        seq, ts = table.column("seq"), table.column("ts")
+        chains = table.dictionaries["chain"].values
+        chain_ids = table.column("chain")
+        if kind == BLOCK:
+            number, base_fee, hashes = table.column("number"), table.column("base_fee"), table.column("hash")
+            for i in range(len(table)):
+                payload = {"number": int(number[i]), "baseFeePerGas": int(base_fee[i]),
+                           "hash": _hex(hashes[i].tobytes().ljust(32, b"\0")), "timestamp": float(ts[i])}
+                yield int(seq[i]), ReplayEvent(kind, chains[chain_ids[i]], float(ts[i]), payload)
+        elif kind == LOG:
+            block, addresses = table.column("block"), table.dictionaries["address"].values
+            address_ids, topics, data = table.column("address"), table.blob("topics"), table.blob("data")
+            for i in range(len(table)):
+                raw = bytes(topics[i])
+                payload = {"address": addresses[address_ids[i]],
+                           "topics": [_hex(raw[j:j + 32]) for j in range(0, len(raw), 32)],
+                           "data": _hex(bytes(data[i])), "blockNumber": int(block[i])}
+                yield int(seq[i]), ReplayEvent(kind, chains[chain_ids[i]], float(ts[i]), payload)
+        else:
+            blob = table.blob("tx" if kind == TX else "snapshot")
+            for i in range(len(table)):
+                yield int(seq[i]), ReplayEvent(kind, chains[chain_ids[i]], float(ts[i]), json.loads(bytes(blob[i])))
+
+    def events(self) -> Iterator[ReplayEvent]:
+        """Every recorded event in original order, as ``ReplayEvent``s for ``ReplayEngine``."""
+        self.flush()
+        streams = (self._table_events(name) for name in EVENT_TABLES if name in self.tables)
+        for _, event in heapq.merge(*streams, key=lambda item: item[0]):
+            yield event
+
+
+def import_recording(path: str, store: ChainStore) -> int:
+    """Append every event of a gzip ``ReplayWriter`` recording to ``store``; returns the event count."""
+    count = 0
+    for event in read_events(path):
+        if event.kind == POOL:
+            snap = event.payload
+            store._append("pools", {"ts": event.ts, "chain": event.chain, "address": snap["address"],
+                                    "snapshot": json.dumps(snap, separators=(",", ":")).encode()})
+        else:
+            {BLOCK: store.block, LOG: store.log, TX: store.pending_tx}[event.kind](event.chain, event.payload, ts=event.ts)
+        count += 1
+    store.flush()
+    return count
+
+
+def is_chain_store(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, "blocks", "meta.json"))
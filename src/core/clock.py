@@ -0,0 +1,72 @@
+"""Wall-clock and simulated clocks shared by strategies, bridges and backtests."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+
+class RealClock:
+    """Wall-clock time; sleeps really wait."""
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+    def sleep_sync(self, delay: float) -> None:
+        time.sleep(delay)
+
+
+class SimClock:
+    """Fast-forward virtual clock.
+
+    ``sleep`` never waits in real time: pending sleepers are woken one per
+    event-loop tick in deadline order, and virtual time jumps to each deadline
+    as it fires. Thousands of simulated seconds therefore elapse in
+    milliseconds while still preserving the ordering of timers.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scheduled = False
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move virtual time forward (for synchronous simulation drivers)."""
+        self._now += max(seconds, 0)
+
+    def sleep_sync(self, delay: float) -> None:
+        self.advance(delay)
+
+    async def sleep(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        heapq.heappush(self._timers, (self._now + max(delay, 0), next(self._seq), fut))
+        self._schedule(loop)
+        await fut
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop = loop
+            loop.call_soon(self._fire_next)
+
+    def _fire_next(self) -> None:
+        self._scheduled = False
+        while self._timers and self._timers[0][2].done():  # cancelled sleepers
+            heapq.heappop(self._timers)
+        if not self._timers:
+            return
+        deadline, _, fut = heapq.heappop(self._timers)
+        self._now = max(self._now, deadline)
+        fut.set_result(None)
+        if self._timers:
+            self._schedule(self._loop)
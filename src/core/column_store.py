@@ -0,0 +1,237 @@
+"""Append-only columnar tables on disk, read back as zero-copy NumPy memory maps.
+
+A table is a directory with one file per column:
+
+* numeric and fixed-width byte columns (``u8``, ``f8``, ``S32``, ...) are raw
+  little-endian arrays in ``<name>.col``;
+* ``address`` and ``symbol`` columns are dictionary-encoded: ``<name>.col``
+  holds ``uint32`` ids and ``<name>.dict`` the distinct values, one per line
+  (addresses lower-cased);
+* ``blob`` columns hold variable-length bytes in ``<name>.blob`` with the end
+  offset of every row in ``<name>.col``.
+
+``meta.json`` records the schema and the committed row count; it is replaced
+atomically after every append, so a crash mid-append leaves at most some
+unreferenced trailing bytes that the next append overwrites.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+DICT_TYPES = ("address", "symbol")
+_META = "meta.json"
+
+
+def _storage_dtype(kind: str) -> np.dtype:
+    if kind in DICT_TYPES:
+        return np.dtype("<u4")
+    if kind == "blob":
+        return np.dtype("<u8")
+    return np.dtype(kind).newbyteorder("<")
+
+
+class _Dictionary:
+    """Value <-> id mapping for one dictionary-encoded column, persisted append-only."""
+
+    def __init__(self, path: str, lower: bool):
+        self.path = path
+        self.lower = lower
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self._persisted = 0
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    self._add(line.rstrip("\n"))
+            self._persisted = len(self.values)
+
+    def _add(self, value: str) -> int:
+        idx = self.ids[value] = len(self.values)
+        self.values.append(value)
+        return idx
+
+    def encode(self, value: Optional[str]) -> int:
+        value = "" if value is None else str(value)
+        if self.lower:
+            value = value.lower()
+        idx = self.ids.get(value)
+        return self._add(value) if idx is None else idx
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self.ids.get(value.lower() if self.lower else value)
+
+    def flush(self) -> None:
+        if self._persisted < len(self.values):
+            with open(self.path, "a") as f:
+                f.write("".join(v + "\n" for v in self.values[self._persisted:]))
+            self._persisted = len(self.values)
+
+
+class ColumnTable:
+    """One append-only table; see the module docstring for the layout."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+        self.schema: Dict[str, str] = dict(meta["schema"])
+        self.rows: int = meta["rows"]
+        self.blob_sizes: Dict[str, int] = dict(meta.get("blob_sizes", {}))
+        self.dtypes = {name: _storage_dtype(kind) for name, kind in self.schema.items()}
+        self.dictionaries = {
+            name: _Dictionary(os.path.join(path, f"{name}.dict"), lower=(kind == "address"))
+            for name, kind in self.schema.items() if kind in DICT_TYPES
+        }
+        self._maps: Dict[str, Any] = {}
+
+    @classmethod
+    def create(cls, path: str, schema: Mapping[str, str]) -> "ColumnTable":
+        """Create the table, or open it if it already exists with the same schema."""
+        meta_path = os.path.join(path, _META)
+        if os.path.exists(meta_path):
+            table = cls(path)
+            if table.schema != dict(schema):
+                raise ValueError(f"{path} exists with a different schema")
+            return table
+        os.makedirs(path, exist_ok=True)
+        for kind in schema.values():
+            _storage_dtype(kind)  # reject unknown types before anything is written
+        with open(meta_path, "w") as f:
+            json.dump({"schema": dict(schema), "rows": 0, "blob_sizes": {}}, f)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _col_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.col")
+
+    def _commit(self) -> None:
+        tmp = os.path.join(self.path, _META + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"schema": self.schema, "rows": self.rows, "blob_sizes": self.blob_sizes}, f)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+    def _encode(self, name: str, values: Any, n: int) -> np.ndarray:
+        kind = self.schema[name]
+        if kind in DICT_TYPES:
+            encode = self.dictionaries[name].encode
+            return np.fromiter((encode(v) for v in values), dtype=self.dtypes[name], count=n)
+        arr = np.asarray(values, dtype=self.dtypes[name])
+        if arr.shape != (n,):
+            raise ValueError(f"column {name} has {arr.shape[0] if arr.ndim else 1} values, expected {n}")
+        return arr
+
+    @staticmethod
+    def _write_at(path: str, offset: int, data: bytes) -> None:
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+
+    def append(self, columns: Mapping[str, Any]) -> int:
+        """Append equal-length columns (missing ones are zero / empty). Returns the new row count."""
+        unknown = set(columns) - set(self.schema)
+        if unknown:
+            raise KeyError(f"unknown columns {sorted(unknown)}")
+        n = len(next(iter(columns.values()))) if columns else 0
+        if n == 0:
+            return self.rows
+        encoded: Dict[str, bytes] = {}
+        blobs: Dict[str, bytes] = {}
+        for name, kind in self.schema.items():
+            values = columns.get(name)
+            if kind == "blob":
+                chunks = [bytes(v or b"") for v in (values if values is not None else [b""] * n)]
+                if len(chunks) != n:
+                    raise ValueError(f"column {name} has {len(chunks)} values, expected {n}")
+                ends = np.cumsum([len(c) for c in chunks], dtype=np.uint64) + np.uint64(self.blob_sizes.get(name, 0))
+                encoded[name] = ends.astype(self.dtypes[name]).tobytes()
+                blobs[name] = b"".join(chunks)
+            elif values is None:
+                encoded[name] = np.zeros(n, dtype=self.dtypes[name]).tobytes()
+            else:
+                encoded[name] = self._encode(name, values, n).tobytes()
+        for dictionary in self.dictionaries.values():
+            dictionary.flush()
+        for name, data in encoded.items():
+            self._write_at(self._col_path(name), self.rows * self.dtypes[name].itemsize, data)
+        for name, data in blobs.items():
+            size = self.blob_sizes.get(name, 0)
+            self._write_at(os.path.join(self.path, f"{name}.blob"), size, data)
+            self.blob_sizes[name] = size + len(data)
+        self.rows += n
+        self._commit()
+        return self.rows
+
+    def append_rows(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        if not rows:
+            return self.rows
+        return self.append({name: [row.get(name) for row in rows] for name in self.schema})
+
+    def refresh(self) -> None:
+        """Pick up rows appended by another process."""
+        with open(os.path.join(self.path, _META)) as f:
+            meta = json.load(f)
+        self.rows = meta["rows"]
+        self.blob_sizes = dict(meta.get("blob_sizes", {}))
+        for name, dictionary in self.dictionaries.items():
+            self.dictionaries[name] = _Dictionary(dictionary.path, dictionary.lower)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only, zero-copy view of the committed rows of one column (ids for dictionary columns)."""
+        if self.rows == 0:
+            return np.empty(0, dtype=self.dtypes[name])
+        cached = self._maps.get(name)
+        if cached is None or len(cached) < self.rows:
+            cached = self._maps[name] = np.memmap(self._col_path(name), dtype=self.dtypes[name], mode="r")
+        return cached[:self.rows]
+
+    def blob(self, name: str) -> "BlobColumn":
+        return BlobColumn(os.path.join(self.path, f"{name}.blob"), self.column(name))
+
+    def decode(self, name: str, ids: Iterable[int]) -> List[str]:
+        values = self.dictionaries[name].values
+        return [values[i] for i in ids]
+
+    def lookup(self, name: str, value: str) -> Optional[int]:
+        """Dictionary id of ``value`` in column ``name`` (for vectorized ``column(name) == id`` filters)."""
+        return self.dictionaries[name].lookup(value)
+
+
+class BlobColumn:
+    """Row access into a blob column; slices are zero-copy views of the mapping."""
+
+    def __init__(self, path: str, ends: np.ndarray):
+        self.ends = ends
+        total = int(ends[-1]) if len(ends) else 0
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")[:total] if total else np.empty(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __getitem__(self, row: int) -> memoryview:
+        start = int(self.ends[row - 1]) if row > 0 else 0
+        return memoryview(self._data[start:int(self.ends[row])])
+
+
+def open_tables(root: str, schemas: Mapping[str, Mapping[str, str]], create: bool = True) -> Dict[str, ColumnTable]:
+    """Create/open every table of a store rooted at ``root``.
+
+    With ``create=False`` nothing is written: tables that do not exist yet
+    are left out, and an existing table with another schema is an error.
+    """
+    if create:
+        return {name: ColumnTable.create(os.path.join(root, name), schema) for name, schema in schemas.items()}
+    tables = {}
+    for name, schema in schemas.items():
+        path = os.path.join(root, name)
+        if not os.path.exists(os.path.join(path, _META)):
+            continue
+        table = tables[name] = ColumnTable(path)
+        if table.schema != dict(schema):
+            raise ValueError(f"{path} exists with a different schema")
+    return tables
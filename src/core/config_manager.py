@@ -1,7 +1,7 @@
 import os
 import yaml
 from dotenv import load_dotenv
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, List
 from pydantic import BaseModel, Field, ValidationError, RootModel
 
 # Load .env if present
@@ -16,7 +16,34 @@ class NotifierConfig(BaseModel):
 
 class RiskConfig(BaseModel):
     max_drawdown_pct: float = Field(gt=0, lt=100)
-    max_loss_usd: float = Field(gt=0)
+    max_loss_usd: float = Field(gt=0)  # over the trailing 24h
+    window_loss_usd: Dict[str, float] = Field(default_factory=dict)  # tighter "1m"/"1h" loss limits
+    max_trades_per_min: float = Field(default=10.0, gt=0)  # sizes the kill switch's PnL window rings
+
+class SignerConfig(BaseModel):
+    type: str = "local"  # "local", "daemon" or "cloud_kms"
+    endpoint: Optional[str] = None  # unix:///path/to.sock for the signing daemon
+    key_id: Optional[str] = None
+
+class StrategyBudgetConfig(BaseModel):
+    cpu_pct: float = Field(default=50.0, gt=0)  # % of one core, averaged per run
+    latency_ms: float = Field(default=2000.0, gt=0)  # wall time allowed per run
+    interval_sec: float = Field(default=1.0, ge=0)  # pause between runs of one-shot strategies
+    max_restarts: Optional[int] = None  # None = restart forever (with backoff)
+    backoff_sec: float = Field(default=1.0, gt=0)  # first restart delay, doubled per consecutive crash
+    max_backoff_sec: float = Field(default=60.0, gt=0)
+
+    model_config = {"extra": "forbid"}  # a misspelt limit should fail the load, not be ignored
+
+class AlphaConfig(BaseModel):
+    enabled: List[str] = []
+    params: Dict[str, Dict[str, Any]] = {}
+    budgets: Dict[str, StrategyBudgetConfig] = {}
+
+class DashboardConfig(BaseModel):
+    port: int = 8501
+    poll_interval: float = Field(default=1.0, gt=0)  # seconds between journal polls / pushes
+    metrics_port: int = 9108  # the bot process's /metrics exporter; the dashboard relays it
 
 class ContractsConfig(RootModel[Dict[str, str]]):
     pass
@@ -27,20 +54,32 @@ class RPCUrlsConfig(RootModel[Dict[str, str]]):
 class WSSUrlsConfig(RootModel[Dict[str, Optional[str]]]):
     pass
 
+class RPCEndpointsConfig(RootModel[Dict[str, Dict[str, str]]]):
+    """Named endpoints per network, e.g. ``rpc.mainnet.primary`` / ``rpc.mainnet.fallback``."""
+    pass
+
 class AppConfig(BaseModel):
     network: str
     wallet_address: str
     uniswap_wallet_address: Optional[str] = None
     rpc_urls: RPCUrlsConfig
+    rpc: Optional[RPCEndpointsConfig] = None
     wss_urls: Optional[WSSUrlsConfig] = None
     contracts: Optional[ContractsConfig] = None
     mode: str
     gas_limit: int
     slippage_bps: int
     trade_amount_usd: float
+    trade_amount_eth: float = Field(default=0.1, gt=0)
+    max_trade_amount_eth: Optional[float] = Field(default=None, gt=0)  # arb sizing cap (default: trade_amount_eth)
+    receipt_timeout_sec: Dict[str, float] = Field(default_factory=dict)  # per chain; default 120 s
     notifier: Optional[NotifierConfig] = None
+    signer: Optional[SignerConfig] = None
+    alpha: Optional[AlphaConfig] = None
     risk: RiskConfig
     kill_switch_enabled: Optional[bool] = True
+    kill_switch_name: Optional[str] = None  # shared-memory name, lets the dashboard watch the kill switch
+    dashboard: Optional[DashboardConfig] = None
     target_profit: Optional[float] = None
     starting_capital: Optional[float] = None
     sepolia_router: Optional[str] = None
@@ -52,6 +91,7 @@ class AppConfig(BaseModel):
     evm_dex_router_abi_path: Optional[str] = None
     database_path: str = "data/bot_state.db"
     native_token_price_usd: float = 0.0
+    detection_workers: int = 0  # processes decoding mempool bridge calls (0 = in the event loop)
 
     model_config = {"extra": "forbid"}  # Strict: forbid extra fields
 
@@ -65,6 +105,11 @@ def overlay_env_vars(raw_config: dict):
             for k, v in raw_config["rpc_urls"].items():
                 if isinstance(v, str) and "YOUR_INFURA_PROJECT_ID" in v:
                     raw_config["rpc_urls"][k] = v.replace("YOUR_INFURA_PROJECT_ID", infura_id)
+        # Multi-endpoint RPC
+        for endpoints in (raw_config.get("rpc") or {}).values():
+            for k, v in endpoints.items():
+                if isinstance(v, str) and "YOUR_INFURA_PROJECT_ID" in v:
+                    endpoints[k] = v.replace("YOUR_INFURA_PROJECT_ID", infura_id)
         # WSS URLs
         if "wss_urls" in raw_config:
             for k, v in raw_config["wss_urls"].items():
@@ -82,6 +127,26 @@ def overlay_env_vars(raw_config: dict):
         raw_config["notifier"]["telegram_chat_id"] = telegram_chat_id
     return raw_config
 
+def rpc_endpoints(config, network: str) -> List[str]:
+    """Ordered HTTP endpoints for a network: ``rpc.<network>`` (primary first), then ``rpc_urls``.
+
+    Accepts an ``AppConfig`` or the plain dict ``load_config`` returns.
+    """
+    if isinstance(config, dict):
+        named = (config.get("rpc") or {}).get(network) or {}
+        single = (config.get("rpc_urls") or {}).get(network)
+    else:
+        rpc = getattr(config, "rpc", None)
+        named = rpc.root.get(network, {}) if rpc is not None else {}
+        single = config.rpc_urls.root.get(network)
+    urls: List[str] = []
+    if "primary" in named:
+        urls.append(named["primary"])
+    urls.extend(url for name, url in named.items() if name != "primary")
+    if single:
+        urls.append(single)
+    return list(dict.fromkeys(urls))
+
 def load_app_config(config_path: str = "config.yaml") -> AppConfig:
     with open(config_path, "r") as f:
         raw_config = yaml.safe_load(f)
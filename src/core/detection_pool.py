@@ -0,0 +1,259 @@
+"""Process-pool sharding of opportunity detection.
+
+Pool reserves live in a ``SharedPoolState`` table that every worker maps
+zero-copy, so a new block costs one tiny "block" message per worker rather
+than pickling pool state. Each worker owns a static shard of pairs (and a
+hash-based shard of mempool transactions); their results are merged into one
+priority-ordered execution queue in the parent.
+"""
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# header slots
+_BLOCK, _GAS_USD, _HEADER_SEQ = 0, 1, 2
+_HEADER = 4
+
+
+class SharedPoolState:
+    """Fixed-capacity (eth_reserve, usd_reserve, fee) rows in shared memory.
+
+    Rows are written by the parent with a per-row sequence counter (odd while
+    a write is in progress), and readers retry until they see a stable even
+    counter, so workers never observe a half-written row.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        self.capacity = capacity
+        create = name is None
+        size = 8 * (_HEADER + capacity + 3 * capacity)
+        self.shm = SharedMemory(name=name, create=create, size=size)
+        self._owner = create
+        buf = self.shm.buf
+        self.header = np.ndarray((_HEADER,), dtype=np.float64, buffer=buf, offset=0)
+        self.seq = np.ndarray((capacity,), dtype=np.int64, buffer=buf, offset=8 * _HEADER)
+        self.rows = np.ndarray((capacity, 3), dtype=np.float64, buffer=buf, offset=8 * (_HEADER + capacity))
+        if create:
+            self.header[:] = 0
+            self.seq[:] = 0
+            self.rows[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "SharedPoolState":
+        return cls(capacity, name=name)
+
+    def write(self, idx: int, reserves: Sequence[float]) -> None:
+        self.seq[idx] += 1
+        self.rows[idx] = reserves
+        self.seq[idx] += 1
+
+    def read(self, idx: int) -> Tuple[float, float, float]:
+        while True:
+            before = self.seq[idx]
+            if before & 1:
+                continue
+            eth, usd, fee = self.rows[idx]
+            if self.seq[idx] == before:
+                return float(eth), float(usd), float(fee)
+
+    def set_block(self, block_number: int, gas_usd: float = 0.0) -> None:
+        self.header[_HEADER_SEQ] += 1
+        self.header[_BLOCK] = block_number
+        self.header[_GAS_USD] = gas_usd
+        self.header[_HEADER_SEQ] += 1
+
+    @property
+    def block(self) -> int:
+        return int(self.header[_BLOCK])
+
+    @property
+    def gas_usd(self) -> float:
+        return float(self.header[_GAS_USD])
+
+    def close(self) -> None:
+        # Drop numpy views before closing the mapping
+        self.header = self.seq = self.rows = None
+        self.shm.close()
+
+    def unlink(self) -> None:
+        if self._owner:
+            self.shm.unlink()
+
+
+def _worker_main(worker_id, state_name, capacity, detect_pair, pairs, detect_tx, params, tasks, results):
+    state = SharedPoolState.attach(state_name, capacity)
+    try:
+        while True:
+            msg = tasks.get()
+            if msg is None:
+                break
+            kind, round_id, payload = msg
+            found = []
+            if kind == "block":
+                for pair in pairs:
+                    try:
+                        opp = detect_pair(state, pair, params)
+                    except Exception as e:
+                        logging.error(f"[DetectionPool] worker {worker_id} pair {pair} failed: {e}")
+                        continue
+                    if opp is not None:
+                        found.append(dict(opp, block=payload))
+            elif kind == "tx":
+                try:
+                    opp = detect_tx(payload, params, state)
+                except Exception as e:
+                    logging.error(f"[DetectionPool] worker {worker_id} tx {payload.get('hash')} failed: {e}")
+                    opp = None
+                if opp is not None:
+                    found.append(dict(opp, block=state.block))
+            results.put((kind, round_id, worker_id, found))
+    finally:
+        state.close()
+
+
+class DetectionPool:
+    """Shards pair and mempool detection across worker processes.
+
+    ``detect_pair(state, pair, params)`` and ``detect_tx(tx, params, state)``
+    must be module-level functions (they are sent to workers once, at start-up)
+    and return an opportunity dict or None. Opportunities from every worker land
+    in ``execution_queue`` ordered by ``net_profit_usd``, best first, or, with
+    ``on_opportunity``, are handed to it from the merger thread as they arrive.
+    """
+
+    def __init__(
+        self,
+        state: SharedPoolState,
+        detect_pair: Optional[Callable] = None,
+        pairs: Sequence[Any] = (),
+        detect_tx: Optional[Callable] = None,
+        workers: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+        on_opportunity: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.state = state
+        self.on_opportunity = on_opportunity
+        self.detect_pair = detect_pair
+        self.pairs = list(pairs)
+        self.detect_tx = detect_tx
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        if detect_tx is None:
+            # Block rounds only go to workers that own pairs; without mempool work the rest would idle
+            self.workers = min(self.workers, max(1, len(self.pairs)))
+        self.params = dict(params or {})
+        self.execution_queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._round_ids = itertools.count(1)
+        self._pending: Dict[int, int] = {}
+        self._done = threading.Condition()
+        self._ctx = mp.get_context("spawn")
+        self._tasks: List[Any] = []
+        self._procs: List[Any] = []
+        self._results = None
+        self._merger: Optional[threading.Thread] = None
+        self.rounds = 0
+        self.found = 0
+
+    def start(self) -> None:
+        if self._procs:
+            return
+        self._results = self._ctx.Queue()
+        for worker_id in range(self.workers):
+            tasks = self._ctx.Queue()
+            shard = self.pairs[worker_id::self.workers]
+            proc = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, self.state.name, self.state.capacity, self.detect_pair, shard, self.detect_tx,
+                      self.params, tasks, self._results),
+                name=f"detect-{worker_id}",
+                daemon=True,
+            )
+            proc.start()
+            self._tasks.append(tasks)
+            self._procs.append(proc)
+        self._merger = threading.Thread(target=self._merge, name="detect-merge", daemon=True)
+        self._merger.start()
+        logging.info(f"[DetectionPool] {self.workers} workers over {len(self.pairs)} pairs")
+
+    def _merge(self) -> None:
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            _, round_id, _, found = item
+            for opp in found:
+                self.found += 1
+                if self.on_opportunity is None:
+                    self.execution_queue.put((-opp.get("net_profit_usd", 0.0), next(self._order), opp))
+                    continue
+                try:
+                    self.on_opportunity(opp)
+                except Exception as e:
+                    logging.error(f"[DetectionPool] on_opportunity failed for {opp.get('hash')}: {e}")
+            with self._done:
+                self._pending[round_id] -= 1
+                if self._pending[round_id] == 0:
+                    del self._pending[round_id]
+                    self._done.notify_all()
+
+    def _dispatch(self, worker_ids: Sequence[int], kind: str, payload: Any) -> int:
+        round_id = next(self._round_ids)
+        with self._done:
+            self._pending[round_id] = len(worker_ids)
+        for worker_id in worker_ids:
+            self._tasks[worker_id].put((kind, round_id, payload))
+        return round_id
+
+    def on_block(self, block_number: int, gas_usd: float = 0.0) -> int:
+        """Publish the new head to shared state and fan a detection round out to every pair shard."""
+        self.state.set_block(block_number, gas_usd)
+        self.rounds += 1
+        active = [i for i in range(self.workers) if self.pairs[i::self.workers]]
+        return self._dispatch(active, "block", block_number)
+
+    def submit_tx(self, tx: Dict[str, Any]) -> int:
+        """Send one pending transaction to the worker owning its hash shard."""
+        worker_id = hash(tx.get("hash")) % self.workers
+        return self._dispatch([worker_id], "tx", tx)
+
+    def wait(self, round_id: int, timeout: Optional[float] = None) -> bool:
+        with self._done:
+            return self._done.wait_for(lambda: round_id not in self._pending, timeout)
+
+    def run_round(self, block_number: int, gas_usd: float = 0.0, timeout: Optional[float] = None) -> bool:
+        return self.wait(self.on_block(block_number, gas_usd), timeout)
+
+    def next_opportunity(self, min_block: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Best queued opportunity, skipping ones detected before ``min_block``."""
+        while True:
+            try:
+                _, _, opp = self.execution_queue.get_nowait()
+            except queue.Empty:
+                return None
+            if min_block is None or opp.get("block", min_block) >= min_block:
+                return opp
+
+    def stop(self) -> None:
+        for tasks in self._tasks:
+            tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        if self._results is not None:
+            self._results.put(None)
+        if self._merger is not None:
+            self._merger.join(timeout=5)
+        self._tasks, self._procs, self._merger = [], [], None
@@ -0,0 +1,199 @@
+"""Structured, append-only event log with cheap tail and incremental reads.
+
+Each event is one JSON line with the same fields in the same order
+(``EVENT_FIELDS``), so consumers never parse free-form log text. Readers
+never load the whole file: ``tail_lines`` seeks backwards from the end in
+fixed-size blocks, and ``EventCursor`` remembers the byte offset it reached
+so each analysis cycle reads only what was appended since the last one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_EVENT_LOG = "logs/events.jsonl"
+EVENT_FIELDS = ("ts", "strategy", "event", "latency_ms", "pnl_usd", "detail")
+
+EVENT_LOG: Optional["EventLog"] = None
+_GLOBAL_LOCK = threading.Lock()
+
+
+class EventLog:
+    """Appends fixed-field JSON lines; safe to share between threads.
+
+    Each event is a single ``write`` on an ``O_APPEND`` file, so lines from
+    several processes appending to the same log do not interleave.
+    """
+
+    def __init__(self, path: str = DEFAULT_EVENT_LOG, clock=time.time):
+        self.path = path
+        self.clock = clock
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    def record(self, event: str, strategy: Optional[str] = None, latency_ms: Optional[float] = None,
+               pnl_usd: Optional[float] = None, detail: Any = None, ts: Optional[float] = None) -> None:
+        values = (self.clock() if ts is None else ts, strategy, event, latency_ms, pnl_usd, detail)
+        line = json.dumps(dict(zip(EVENT_FIELDS, values)), separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._fd is not None:
+                os.write(self._fd, line.encode())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def init_event_log(path: str = DEFAULT_EVENT_LOG) -> EventLog:
+    """Initialise the process-wide event log that ``record_event`` writes to."""
+    global EVENT_LOG
+    if EVENT_LOG is None:
+        with _GLOBAL_LOCK:
+            if EVENT_LOG is None:
+                EVENT_LOG = EventLog(path)
+    return EVENT_LOG
+
+
+def record_event(event: str, strategy: Optional[str] = None, latency_ms: Optional[float] = None,
+                 pnl_usd: Optional[float] = None, detail: Any = None) -> None:
+    """Record to the global event log; a no-op until ``init_event_log`` has been called."""
+    if EVENT_LOG is not None:
+        try:
+            EVENT_LOG.record(event, strategy, latency_ms, pnl_usd, detail)
+        except OSError as e:  # pragma: no cover - a full disk must not take trading down
+            logging.error(f"[EventLog] write failed: {e}")
+
+
+def _read_back(f, end: int, floor: int, n: int, block_size: int) -> Tuple[int, bytes]:
+    """Bytes from ``floor`` to ``end``, read backwards a block at a time and stopping once
+    they hold the last ``n`` lines; returns (start position, data)."""
+    pos = end
+    chunks: List[bytes] = []
+    newlines = 0
+    # n lines need n + 1 newlines before them (the last line may lack its own)
+    while pos > floor and newlines <= n:
+        step = min(block_size, pos - floor)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        chunks.append(chunk)
+        newlines += chunk.count(b"\n")
+    return pos, b"".join(reversed(chunks))
+
+
+def tail_lines(path: str, n: int = 100, block_size: int = 65536) -> List[str]:
+    """Last ``n`` lines of ``path``, reading backwards from the end one block at a time."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        pos, data = _read_back(f, f.seek(0, os.SEEK_END), 0, n, block_size)
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    if pos > 0:
+        lines = lines[1:]  # first line is cut off by the block boundary
+    return lines[-n:]
+
+
+def _parse(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def tail_events(path: str = DEFAULT_EVENT_LOG, n: int = 100) -> List[Dict[str, Any]]:
+    """Last ``n`` events of a structured event log; malformed lines are skipped."""
+    events = (_parse(line) for line in tail_lines(path, n))
+    return [e for e in events if e is not None]
+
+
+class EventCursor:
+    """Incremental reader over an event log that remembers where it stopped.
+
+    ``read`` returns only the complete lines appended since the previous
+    call; a partially written last line is left for the next read. If the
+    log is rotated (different inode) or truncated, reading restarts at the
+    beginning of the new file. With ``state_path`` the position survives
+    restarts of the consumer.
+    """
+
+    def __init__(self, path: str = DEFAULT_EVENT_LOG, state_path: Optional[str] = None):
+        self.path = path
+        self.state_path = state_path
+        self.offset = 0
+        self.inode: Optional[int] = None
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path) as f:
+                    state = json.load(f)
+                self.offset, self.inode = int(state["offset"]), state.get("inode")
+            except (ValueError, KeyError, TypeError) as e:
+                logging.warning(f"[EventCursor] Ignoring unreadable cursor state {state_path}: {e}")
+
+    def _open(self):
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None, 0
+        st = os.fstat(f.fileno())
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.inode, self.offset = st.st_ino, 0
+        return f, st.st_size
+
+    def read(self, max_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+        f, _ = self._open()
+        if f is None:
+            return []
+        with f:
+            f.seek(self.offset)
+            if max_bytes:
+                data = f.read(max_bytes)
+                if data and not data.endswith(b"\n"):
+                    data += f.readline()  # finish the line the byte limit cut through
+            else:
+                data = f.read()
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        events = (_parse(line) for line in data[:end].decode("utf-8", errors="replace").splitlines())
+        return [e for e in events if e is not None]
+
+    def read_latest(self, n: int, block_size: int = 65536) -> List[Dict[str, Any]]:
+        """At most the last ``n`` new events, and move the cursor past all of them.
+
+        The file is read backwards from its end in ``block_size`` chunks and
+        never below the cursor, so a fresh cursor (or a large backlog) costs
+        about as much as the ``n`` lines it returns; older unread events are
+        skipped.
+        """
+        f, size = self._open()
+        if f is None or n <= 0:
+            return []
+        start = self.offset
+        with f:
+            pos, data = _read_back(f, size, start, n, block_size)
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return []
+        self.offset = pos + end
+        lines = data[:end].decode("utf-8", errors="replace").splitlines()
+        if pos > start:
+            lines = lines[1:]  # first line is cut off by the block boundary
+            logging.info(f"[EventCursor] Skipped {pos - start} bytes of older events in {self.path}")
+        events = (_parse(line) for line in lines[-n:])
+        return [e for e in events if e is not None]
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"offset": self.offset, "inode": self.inode}, f)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,275 @@
+"""Low-overhead latency histograms for the trading hot path, exported in Prometheus text format."""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations in microseconds.
+
+    Values below ``2**precision_bits`` us get their own bucket; above that
+    each power-of-two range is split into ``2**(precision_bits - 1)`` linear
+    sub-buckets, so every recorded value is kept to within
+    ``2**-(precision_bits - 1)`` relative error (under 1.6% with the default
+    7 bits) up to ``max_us``. ``record`` is a couple of integer operations
+    and one in-place counter increment; quantiles are only computed when the
+    histogram is read. Counters are not locked: a racing increment may be
+    lost, which does not matter for latency statistics.
+    """
+
+    def __init__(self, max_us: int = 60_000_000, precision_bits: int = 7):
+        self.bits = precision_bits
+        self.sub_count = 1 << precision_bits
+        self.half = self.sub_count >> 1
+        self.max_us = max_us
+        self.counts = array("q", bytes(8 * (self._index(max_us) + 1)))
+        self.total = 0
+        self.sum_us = 0
+        self.max_seen_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.bits
+        return self.sub_count + (shift - 1) * self.half + ((value >> shift) - self.half)
+
+    def _lowest(self, index: int) -> int:
+        if index < self.sub_count:
+            return index
+        shift, offset = divmod(index - self.sub_count, self.half)
+        return (offset + self.half) << (shift + 1)
+
+    def _highest(self, index: int) -> int:
+        if index < self.sub_count:
+            return index
+        shift = (index - self.sub_count) // self.half + 1
+        return self._lowest(index) + (1 << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        if value_us < 0:
+            value_us = 0
+        elif value_us > self.max_us:
+            value_us = self.max_us
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.sum_us += value_us
+        if value_us > self.max_seen_us:
+            self.max_seen_us = value_us
+
+    def record_seconds(self, seconds: float) -> None:
+        self.record(int(seconds * 1e6))
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> Dict[float, float]:
+        """Upper bound (in seconds) of the bucket holding each quantile, in one pass."""
+        qs = sorted(qs)
+        out: Dict[float, float] = {}
+        if not self.total:
+            return {q: 0.0 for q in qs}
+        targets = [(q, max(1, int(q * self.total + 0.5))) for q in qs]
+        seen = 0
+        pos = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while pos < len(targets) and seen >= targets[pos][1]:
+                out[targets[pos][0]] = min(self._highest(index), self.max_seen_us) / 1e6
+                pos += 1
+            if pos == len(targets):
+                break
+        return out
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles((q,))[q]
+
+    def reset(self) -> None:
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.total = self.sum_us = self.max_seen_us = 0
+
+
+class _Timer:
+    __slots__ = ("hist", "start")
+
+    def __init__(self, hist: LatencyHistogram):
+        self.hist = hist
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.hist.record((time.perf_counter_ns() - self.start) // 1000)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """Named, labelled latency histograms plus callback gauges (queue depths and the like)."""
+
+    def __init__(self):
+        self._hists: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> LatencyHistogram:
+        key = _label_key(labels)
+        series = self._hists.get(name)
+        hist = series.get(key) if series is not None else None
+        if hist is None:
+            with self._lock:
+                series = self._hists.setdefault(name, {})
+                hist = series.setdefault(key, LatencyHistogram())
+                if help:
+                    self._help.setdefault(name, help)
+        return hist
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        self.histogram(name, **labels).record_seconds(seconds)
+
+    def timer(self, name: str, **labels: str) -> _Timer:
+        """``with REGISTRY.timer("mev_rpc_latency_seconds", method="eth_call"): ...``"""
+        return _Timer(self.histogram(name, **labels))
+
+    def timed(self, name: str, **labels: str) -> Callable:
+        """Decorator recording every call of a sync or async function into one histogram."""
+        hist = self.histogram(name, **labels)
+
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _Timer(hist):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Timer(hist):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def describe(self, name: str, help: str) -> None:
+        self._help[name] = help
+
+    def gauge(self, name: str, callback: Callable[[], float], help: str = "") -> None:
+        self._gauges[name] = (help, callback)
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, Dict[str, float]]]:
+        out: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+        for name, series in list(self._hists.items()):
+            for key, hist in list(series.items()):
+                stats = {f"p{q * 100:g}": v for q, v in hist.quantiles().items()}
+                stats.update(count=hist.total, sum=hist.sum_us / 1e6, max=hist.max_seen_us / 1e6)
+                out.setdefault(name, {})[key] = stats
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition: histograms as summaries, gauges as gauges."""
+        lines: List[str] = []
+        for name, series in sorted(self._hists.items()):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} summary")
+            for key, hist in sorted(list(series.items())):
+                for q, value in hist.quantiles().items():
+                    lines.append(f"{name}{_format_labels(key, (('quantile', f'{q:g}'),))} {value:.6f}")
+                lines.append(f"{name}_sum{_format_labels(key)} {hist.sum_us / 1e6:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {hist.total}")
+        for name, (help, callback) in sorted(self._gauges.items()):
+            try:
+                value = float(callback())
+            except Exception:
+                continue
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+DEFAULT_METRICS_PORT = 9108
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Prometheus text exposition format 0.0.4
+
+STAGE_LATENCY = "mev_stage_latency_seconds"
+RPC_LATENCY = "mev_rpc_latency_seconds"
+
+REGISTRY.describe(STAGE_LATENCY, "Latency of trading pipeline stages")
+REGISTRY.describe(RPC_LATENCY, "Latency of JSON-RPC requests that reach the provider, by method")
+
+
+def timed_stage(stage: str) -> Callable:
+    """Decorator timing a pipeline stage into ``mev_stage_latency_seconds{stage=...}``."""
+    return REGISTRY.timed(STAGE_LATENCY, stage=stage)
+
+
+def rpc_timer_middleware(make_request: Callable, w3) -> Callable:
+    """web3 middleware timing every request that reaches the provider, per RPC method."""
+    def middleware(method, params):
+        with REGISTRY.timer(RPC_LATENCY, method=method):
+            return make_request(method, params)
+    return middleware
+
+
+def metrics_port(config: Dict) -> int:
+    return (config.get("dashboard") or {}).get("metrics_port", DEFAULT_METRICS_PORT)
+
+
+def start_metrics_server(port: int = DEFAULT_METRICS_PORT, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """Serve ``registry`` at ``/metrics`` from a daemon thread of this process.
+
+    The histograms live in the memory of the process doing the trading, so
+    that process has to export them; the dashboard only proxies. Returns
+    None (after logging) if the port is taken, so a second bot process on
+    the same host still starts.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        logging.warning(f"[Metrics] Exporter not started on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    logging.info(f"[Metrics] Exporting /metrics on {host}:{server.server_address[1]}")
+    return server
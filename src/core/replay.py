@@ -0,0 +1,397 @@
+"""Record chain events to a compact file and replay them deterministically through strategy detection.
+
+A recording is a gzip stream of length-prefixed binary records: block
+headers, pool logs (the state diffs that keep ``QuoteEngine`` pools
+current), pending transactions and one-off pool snapshots. ``ReplayEngine``
+feeds them, in order, to replay adapters that call the same detection
+functions the live strategies use, on a ``SimClock`` that jumps to each
+record's timestamp, and reports PnL and decision latency per strategy.
+"""
+
+import gzip
+import json
+import logging
+import struct
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from src.core.clock import SimClock
+from src.core.metrics import LatencyHistogram
+from src.kill_switch import KillSwitch
+from src.pricing.quote_engine import QuoteEngine, V2Pool, V3Pool
+
+MAGIC = b"MEVREPLAY1\n"
+
+CHAIN, BLOCK, LOG, TX, POOL = range(5)
+KIND_NAMES = {CHAIN: "chain", BLOCK: "block", LOG: "log", TX: "tx", POOL: "pool"}
+
+# kind, chain index, timestamp, payload length
+_RECORD = struct.Struct("<BBdI")
+_BLOCK = struct.Struct("<QQ32s")  # number, baseFeePerGas, hash
+_LOG = struct.Struct("<Q20sB")  # blockNumber, address, topic count
+
+
+def _raw(value: Any, size: Optional[int] = None) -> bytes:
+    if value is None:
+        return bytes(size or 0)
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    value = bytes(value)
+    return value.rjust(size, b"\0") if size else value
+
+
+def _hex(value: bytes) -> str:
+    return "0x" + value.hex()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return _hex(bytes(value))
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class ReplayEvent(NamedTuple):
+    kind: int
+    chain: str
+    ts: float
+    payload: Dict[str, Any]
+
+
+def pool_snapshot(pool: Any) -> Dict[str, Any]:
+    """Serializable state of a ``V2Pool``/``V3Pool``."""
+    if isinstance(pool, V3Pool):
+        return {"type": "v3", "token0": pool.token0, "token1": pool.token1, "fee": pool.fee,
+                "tick_spacing": pool.tick_spacing, "sqrt_price_x96": pool.sqrt_price_x96,
+                "liquidity": pool.liquidity, "tick": pool.tick,
+                "ticks": {str(t): net for t, net in pool.liquidity_net.items()}}
+    return {"type": "v2", "token0": pool.token0, "token1": pool.token1, "reserve0": pool.reserve0,
+            "reserve1": pool.reserve1, "fee_bps": pool.fee_bps}
+
+
+def pool_from_snapshot(snap: Dict[str, Any]) -> Any:
+    if snap["type"] == "v3":
+        return V3Pool(snap["token0"], snap["token1"], snap["fee"], snap["tick_spacing"], snap["sqrt_price_x96"],
+                      snap["liquidity"], snap["tick"], {int(t): net for t, net in snap["ticks"].items()})
+    return V2Pool(snap["token0"], snap["token1"], snap["reserve0"], snap["reserve1"], snap["fee_bps"])
+
+
+class ReplayWriter:
+    """Appends events to a recording; chains are interned to one byte on first use."""
+
+    def __init__(self, path: str, compresslevel: int = 6, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._file = gzip.open(path, "wb", compresslevel=compresslevel)
+        self._file.write(MAGIC)
+        self._chains: Dict[str, int] = {}
+        self.records = 0
+
+    def __enter__(self) -> "ReplayWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _chain(self, chain: str, ts: float) -> int:
+        idx = self._chains.get(chain)
+        if idx is None:
+            idx = self._chains[chain] = len(self._chains)
+            self._write(CHAIN, idx, ts, chain.encode())
+        return idx
+
+    def _write(self, kind: int, chain_idx: int, ts: float, payload: bytes) -> None:
+        self._file.write(_RECORD.pack(kind, chain_idx, ts, len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def _emit(self, kind: int, chain: str, ts: Optional[float], payload: bytes) -> None:
+        ts = self.clock() if ts is None else ts
+        self._write(kind, self._chain(chain, ts), ts, payload)
+
+    def block(self, chain: str, header: Dict[str, Any], ts: Optional[float] = None) -> None:
+        if ts is None and header.get("timestamp") is not None:
+            ts = float(int(header["timestamp"], 16) if isinstance(header["timestamp"], str) else header["timestamp"])
+        number = header["number"]
+        number = int(number, 16) if isinstance(number, str) else number
+        base_fee = header.get("baseFeePerGas") or 0
+        base_fee = int(base_fee, 16) if isinstance(base_fee, str) else base_fee
+        self._emit(BLOCK, chain, ts, _BLOCK.pack(number, base_fee, _raw(header.get("hash"), 32)))
+
+    def log(self, chain: str, log: Dict[str, Any], ts: Optional[float] = None) -> None:
+        topics = log.get("topics") or []
+        block = log.get("blockNumber") or 0
+        block = int(block, 16) if isinstance(block, str) else block
+        payload = _LOG.pack(block, _raw(log["address"], 20), len(topics))
+        payload += b"".join(_raw(t, 32) for t in topics) + _raw(log.get("data") or b"")
+        self._emit(LOG, chain, ts, payload)
+
+    def pending_tx(self, chain: str, tx: Dict[str, Any], ts: Optional[float] = None) -> None:
+        self._emit(TX, chain, ts, json.dumps(_jsonable(dict(tx)), separators=(",", ":")).encode())
+
+    def pool(self, chain: str, address: str, pool: Any, ts: Optional[float] = None) -> None:
+        snap = dict(pool_snapshot(pool), address=address.lower())
+        self._emit(POOL, chain, ts, json.dumps(snap, separators=(",", ":")).encode())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def _decode(kind: int, ts: float, payload: bytes) -> Dict[str, Any]:
+    if kind == BLOCK:
+        number, base_fee, block_hash = _BLOCK.unpack(payload)
+        return {"number": number, "baseFeePerGas": base_fee, "hash": _hex(block_hash), "timestamp": ts}
+    if kind == LOG:
+        block, address, count = _LOG.unpack_from(payload)
+        start = _LOG.size
+        topics = [_hex(payload[start + 32 * i:start + 32 * (i + 1)]) for i in range(count)]
+        return {"address": _hex(address), "topics": topics, "data": _hex(payload[start + 32 * count:]),
+                "blockNumber": block}
+    return json.loads(payload)
+
+
+def read_events(path: str) -> Iterator[ReplayEvent]:
+    """Decode a recording lazily, in recorded order."""
+    with gzip.open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay recording")
+        chains: Dict[int, str] = {}
+        while True:
+            head = f.read(_RECORD.size)
+            if not head:
+                return
+            if len(head) < _RECORD.size:
+                logging.warning(f"[Replay] {path} ends with a truncated record")
+                return
+            kind, chain_idx, ts, length = _RECORD.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                logging.warning(f"[Replay] {path} ends with a truncated record")
+                return
+            if kind == CHAIN:
+                chains[chain_idx] = payload.decode()
+                continue
+            yield ReplayEvent(kind, chains.get(chain_idx, str(chain_idx)), ts, _decode(kind, ts, payload))
+
+
+def record_bus(bus: Any, writer: ReplayWriter, chain: str, pool_addresses: Sequence[str] = (),
+               pending: bool = True) -> None:
+    """Subscribe ``writer`` to heads, pool logs and (optionally) pending txs of ``chain`` on an ``EventBus``."""
+    bus.on_head(chain, lambda header: writer.block(chain, header), name=f"replay-{chain}-heads")
+    if pool_addresses:
+        bus.on_log(chain, pool_addresses, lambda log: writer.log(chain, log), name=f"replay-{chain}-logs")
+    if pending:
+        bus.on_pending_tx(chain, lambda tx: writer.pending_tx(chain, tx), name=f"replay-{chain}-pending")
+
+
+# --- Strategy adapters ----------------------------------------------------
+
+
+class ReplayStrategy:
+    """Replay adapter: receives events and returns a decision dict (with ``net_profit_usd``) or None."""
+
+    name = "strategy"
+
+    def on_pool(self, chain: str, snapshot: Dict[str, Any]) -> None:
+        pass
+
+    def on_block(self, chain: str, block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return None
+
+    def on_log(self, chain: str, log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return None
+
+    def on_pending_tx(self, chain: str, tx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class CrossChainArbReplay(ReplayStrategy):
+    """``sized_cross_chain_opportunity`` over recorded mainnet/arbitrum pool state, once per mainnet block.
+
+    Gas is a fixed ``replay_gas_usd`` (default: the live path's fallback
+    estimate), since recordings carry no ``estimate_gas`` results. A booked
+    arb is taken to have closed the spread, so the same pool state is not
+    traded again until a pool log or snapshot changes it.
+    """
+
+    name = "cross_chain"
+
+    def __init__(self, config: Dict[str, Any]):
+        from src.alpha.cross_chain_arb import sized_cross_chain_opportunity
+
+        self.detect = sized_cross_chain_opportunity
+        self.config = config
+        self.gas_usd = config.get("replay_gas_usd", 2.2)
+        self.quotes = QuoteEngine()
+        self.pool_address: Dict[str, str] = {}
+        self.snapshots = 0
+        self._traded_state: Optional[tuple] = None
+
+    def on_pool(self, chain: str, snapshot: Dict[str, Any]) -> None:
+        self.quotes.add_pool(snapshot["address"], pool_from_snapshot(snapshot))
+        self.pool_address[chain] = snapshot["address"]
+        self.snapshots += 1
+
+    def on_log(self, chain: str, log: Dict[str, Any]) -> None:
+        self.quotes.apply_log(log)
+
+    def on_block(self, chain: str, block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if chain != "mainnet" or not ("mainnet" in self.pool_address and "arbitrum" in self.pool_address):
+            return None
+        state = (self.quotes.logs_applied, self.snapshots)
+        if state == self._traded_state:
+            return None
+        decision = self.detect(self.quotes, self.pool_address, self.config, lambda *_: self.gas_usd)
+        if decision:
+            self._traded_state = state
+        return decision
+
+
+class CrossLayerSandwichReplay(ReplayStrategy):
+    """``detect_bridge_swap`` on every recorded pending transaction to the bridge."""
+
+    name = "cross_layer_sandwich"
+
+    def __init__(self, config: Dict[str, Any]):
+        from src.alpha.cross_layer_sandwich import detect_bridge_swap
+
+        self.detect = detect_bridge_swap
+        contracts = config.get("contracts") or {}
+        self.bridge = (contracts.get("arbitrum_bridge") or "").lower()
+        self.params = {"dex_sig": contracts.get("target_dex_sig"),
+                       "expected_profit_usd": config.get("replay_sandwich_profit_usd", 0.0)}
+
+    def on_pending_tx(self, chain: str, tx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if chain != "mainnet" or (tx.get("to") or "").lower() != self.bridge:
+            return None
+        return self.detect(tx, self.params)
+
+
+REPLAY_STRATEGIES = {
+    "cross_chain": CrossChainArbReplay,
+    "cross_layer_sandwich": CrossLayerSandwichReplay,
+}
+
+
+# --- Engine ------------------------------------------------------------------
+
+
+class StrategyReport:
+    def __init__(self, name: str):
+        self.name = name
+        self.events = 0
+        self.decisions = 0
+        self.pnl_usd = 0.0
+        self.errors = 0
+        self.halted_at: Optional[float] = None
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        q = self.latency.quantiles((0.5, 0.99))
+        return {
+            "events": self.events,
+            "decisions": self.decisions,
+            "pnl_usd": self.pnl_usd,
+            "errors": self.errors,
+            "halted_at": self.halted_at,
+            "decision_latency_us": {"p50": q[0.5] * 1e6, "p99": q[0.99] * 1e6,
+                                    "max": float(self.latency.max_seen_us)},
+        }
+
+
+class ReplayEngine:
+    """Drives replay adapters through a recording on simulated time.
+
+    Every strategy gets its own ``KillSwitch`` running on the simulated clock,
+    so risk limits halt a strategy at the same point in history they would
+    have live. Decisions are assumed filled at their ``net_profit_usd``.
+    Decision latency is the real CPU time each adapter call takes.
+    """
+
+    def __init__(self, strategies: Iterable[ReplayStrategy], config: Optional[Dict[str, Any]] = None,
+                 clock: Optional[SimClock] = None):
+        self.strategies = list(strategies)
+        self.config = config or {}
+        self.clock = clock
+        self.reports = {s.name: StrategyReport(s.name) for s in self.strategies}
+        self.kills: Dict[str, KillSwitch] = {}
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.wall_seconds = 0.0
+
+    def _kill(self, name: str) -> KillSwitch:
+        kill = self.kills.get(name)
+        if kill is None:
+            kill_cfg = {k: v for k, v in self.config.items() if k in ("risk", "kill_switch_enabled", "kill_switch_max_errors")}
+            kill = self.kills[name] = KillSwitch(kill_cfg, clock=self.clock.time)
+        return kill
+
+    def _dispatch(self, strategy: ReplayStrategy, event: ReplayEvent) -> None:
+        report = self.reports[strategy.name]
+        kill = self._kill(strategy.name)
+        if not kill.is_enabled():
+            return
+        handler = {BLOCK: strategy.on_block, LOG: strategy.on_log, TX: strategy.on_pending_tx}[event.kind]
+        start = time.perf_counter_ns()
+        try:
+            decision = handler(event.chain, event.payload)
+        except Exception as e:
+            report.errors += 1
+            logging.error(f"[Replay] {strategy.name} failed on {KIND_NAMES[event.kind]} at {event.ts}: {e}")
+            return
+        finally:
+            report.latency.record((time.perf_counter_ns() - start) // 1000)
+            report.events += 1
+        if decision:
+            pnl = float(decision.get("net_profit_usd", 0.0))
+            report.decisions += 1
+            report.pnl_usd += pnl
+            kill.update_pnl(pnl)
+            if not kill.is_enabled():
+                report.halted_at = event.ts
+
+    def run(self, events: Iterable[ReplayEvent]) -> Dict[str, Any]:
+        wall_start = time.perf_counter()
+        for event in events:
+            if self.clock is None:
+                self.clock = SimClock(start=event.ts)
+            if event.ts > self.clock.time():
+                self.clock.advance(event.ts - self.clock.time())
+            if self.first_ts is None:
+                self.first_ts = event.ts
+            self.last_ts = event.ts
+            for strategy in self.strategies:
+                if event.kind == POOL:
+                    strategy.on_pool(event.chain, event.payload)
+                else:
+                    self._dispatch(strategy, event)
+        self.wall_seconds += time.perf_counter() - wall_start
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        simulated = (self.last_ts - self.first_ts) if self.first_ts is not None else 0.0
+        return {
+            "simulated_seconds": simulated,
+            "wall_seconds": self.wall_seconds,
+            "speedup": simulated / self.wall_seconds if self.wall_seconds else None,
+            "strategies": {name: report.to_dict() for name, report in self.reports.items()},
+        }
+
+
+def run_backtest(config: Dict[str, Any], path: str, strategies: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Replay ``path`` (a recording or a ``ChainStore`` directory) through the named adapters
+    (default: every adapter) and return the report."""
+    names = strategies or list(REPLAY_STRATEGIES)
+    unknown = [n for n in names if n not in REPLAY_STRATEGIES]
+    if unknown:
+        raise ValueError(f"No replay adapter for {', '.join(unknown)}; available: {', '.join(REPLAY_STRATEGIES)}")
+    engine = ReplayEngine([REPLAY_STRATEGIES[n](config) for n in names], config)
+    from src.core.chain_store import ChainStore, is_chain_store
+
+    if is_chain_store(path):
+        return engine.run(ChainStore.open(path).events())
+    return engine.run(read_events(path))
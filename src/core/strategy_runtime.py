@@ -0,0 +1,380 @@
+"""Concurrent runtime for the alpha strategies listed in ``alpha.enabled``."""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.event_log import record_event
+from src.core.metrics import metrics_port, start_metrics_server
+from src.kill_switch import KillSwitch, init_global_kill_switch
+from src.services.event_bus import EventBus
+from src.services.trade_journal import init_trade_journal
+
+# CLI/config name -> module in src/alpha exposing run_<module>(config)
+STRATEGY_MODULES = {
+    "cross_chain": "cross_chain_arb",
+    "l2_sandwich": "l2_sandwich",
+    "bridge_games": "bridge_games",
+    "mev_share": "mev_share",
+    "flash_loan": "flash_loan",
+    "liquidation": "liquidation",
+    "nftfi": "nftfi",
+    "cross_layer_sandwich": "cross_layer_sandwich",
+    "sequencer_auction_sniper": "sequencer_auction_sniper",
+    "mev_share_intent_sniper": "mev_share_intent_sniper",
+    "flash_loan_liquidation": "flash_loan_liquidation",
+    "cex_dex_flash_arb": "cex_dex_flash_arb",
+}
+
+
+def load_registration(name: str) -> Optional[Callable]:
+    """``register_<module>(bus, config)`` if the strategy subscribes to the event bus, else None."""
+    module_name = STRATEGY_MODULES.get(name, name)
+    mod = importlib.import_module(f"src.alpha.{module_name}")
+    return getattr(mod, f"register_{module_name}", None)
+
+
+def load_strategy(name: str) -> Callable:
+    """``run_<module>`` for a strategy alias (``cross_chain``) or module name (``cross_chain_arb``)."""
+    module_name = STRATEGY_MODULES.get(name, name)
+    mod = importlib.import_module(f"src.alpha.{module_name}")
+    run_func = getattr(mod, f"run_{module_name}", None)
+    if run_func is None:
+        raise ImportError(f"No run_{module_name} function in {module_name}.py")
+    return run_func
+
+
+class StrategyBudget:
+    """Per-strategy limits; see ``StrategyBudgetConfig`` for the config side."""
+
+    def __init__(self, cpu_pct: float = 50.0, latency_ms: float = 2000.0, interval_sec: float = 1.0,
+                 max_restarts: Optional[int] = None, backoff_sec: float = 1.0, max_backoff_sec: float = 60.0):
+        self.cpu_pct = cpu_pct
+        self.latency_ms = latency_ms
+        self.interval_sec = interval_sec
+        self.max_restarts = max_restarts
+        self.backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+
+
+# How often waits re-check the kill switch, i.e. the worst-case delay between HALT and shutdown
+HALT_POLL_SEC = 0.05
+
+
+class StrategyHalted(Exception):
+    """The kill switch halted while a run was in progress; the run was abandoned."""
+
+
+async def wait_for_halt(kill: KillSwitch) -> None:
+    while kill.is_enabled():
+        await asyncio.sleep(HALT_POLL_SEC)
+
+
+async def sleep_unless_halted(kill: KillSwitch, seconds: float) -> None:
+    """``asyncio.sleep`` that returns early once the kill switch halts."""
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    while kill.is_enabled():
+        remaining = end - loop.time()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, HALT_POLL_SEC))
+
+
+def _thread_cpu_time(ident: Optional[int]) -> Optional[float]:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, TypeError):  # pragma: no cover - non-POSIX or thread gone
+        return None
+
+
+class StrategyRunner:
+    """Supervises one strategy: runs it, measures it, restarts it when it crashes.
+
+    Plain ``run_<module>`` functions are blocking, so each run gets its own
+    daemon thread; a strategy that never returns (``while True`` loops) simply
+    keeps its thread. Coroutine strategies run as tasks on the runtime loop.
+    Every run is raced against the kill switch: on HALT a coroutine run is
+    cancelled and a thread run is abandoned (threads cannot be killed; it is
+    a daemon and dies with the process), so supervision always ends.
+    Runs that return are repeated every ``interval_sec`` while the kill switch
+    allows trading. A run that exceeds its latency budget or averages more CPU
+    than ``cpu_pct`` is counted as a violation and the next run is delayed so
+    the strategy's duty cycle stays inside its CPU budget.
+    """
+
+    def __init__(self, name: str, run_func: Callable, config: Dict, kill: KillSwitch,
+                 budget: Optional[StrategyBudget] = None):
+        self.name = name
+        self.run_func = run_func
+        self.config = config
+        self.kill = kill
+        self.budget = budget or StrategyBudget()
+        self.state = "idle"
+        self.runs = 0
+        self.crashes = 0
+        self.consecutive_crashes = 0
+        self.latency_violations = 0
+        self.cpu_violations = 0
+        self.last_latency_ms: Optional[float] = None
+        self.last_cpu_pct: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.thread_ident: Optional[int] = None
+        self._run_started: Optional[float] = None
+        self._run_cpu_start: Optional[float] = None
+
+    def _run_in_thread(self, loop: asyncio.AbstractEventLoop, fut: asyncio.Future) -> None:
+        self.thread_ident = threading.get_ident()
+        cpu_start = time.thread_time()
+        self._run_cpu_start = cpu_start
+        try:
+            self.run_func(self.config)
+            result, error = time.thread_time() - cpu_start, None
+        except BaseException as e:
+            result, error = None, e
+        self.thread_ident = None
+
+        def settle():
+            if fut.done():
+                return
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+        try:
+            loop.call_soon_threadsafe(settle)
+        except RuntimeError:  # run abandoned at HALT and the runtime loop already closed
+            pass
+
+    async def _run_once(self) -> Optional[float]:
+        """One invocation; returns the CPU seconds it used (None for coroutine strategies).
+
+        Raises ``StrategyHalted`` if the kill switch halts before the run finishes.
+        """
+        loop = asyncio.get_running_loop()
+        if asyncio.iscoroutinefunction(self.run_func):
+            work = asyncio.ensure_future(self.run_func(self.config))
+        else:
+            work = loop.create_future()
+            threading.Thread(target=self._run_in_thread, args=(loop, work), name=f"strategy-{self.name}",
+                             daemon=True).start()
+        watch = asyncio.ensure_future(wait_for_halt(self.kill))
+        try:
+            await asyncio.wait({work, watch}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            watch.cancel()
+            if not work.done():
+                work.cancel()
+        if work.cancelled():
+            raise StrategyHalted(self.name)
+        result = work.result()
+        return None if asyncio.iscoroutinefunction(self.run_func) else result
+
+    def sample_cpu_pct(self) -> Optional[float]:
+        """CPU use of a run still in progress, for strategies that never return."""
+        if self._run_started is None or self._run_cpu_start is None:
+            return None
+        cpu = _thread_cpu_time(self.thread_ident)
+        wall = time.monotonic() - self._run_started
+        if cpu is None or wall <= 0:
+            return None
+        return 100.0 * (cpu - self._run_cpu_start) / wall
+
+    def _account(self, wall: float, cpu: Optional[float]) -> float:
+        """Record budget usage for a finished run and return the extra delay it earns."""
+        self.last_latency_ms = wall * 1000
+        if self.last_latency_ms > self.budget.latency_ms:
+            self.latency_violations += 1
+            logging.warning(f"[StrategyRuntime] {self.name} run took {self.last_latency_ms:.0f} ms "
+                            f"(budget {self.budget.latency_ms:.0f} ms)")
+            record_event("latency_budget", self.name, self.last_latency_ms)
+        if cpu is None or wall <= 0:
+            return 0.0
+        self.last_cpu_pct = 100.0 * cpu / wall
+        if self.last_cpu_pct <= self.budget.cpu_pct:
+            return 0.0
+        self.cpu_violations += 1
+        # Idle long enough that cpu / (wall + delay) == budget
+        delay = cpu * 100.0 / self.budget.cpu_pct - wall
+        logging.warning(f"[StrategyRuntime] {self.name} used {self.last_cpu_pct:.0f}% CPU "
+                        f"(budget {self.budget.cpu_pct:.0f}%); throttling {delay:.2f}s")
+        return delay
+
+    async def supervise(self) -> None:
+        while self.kill.is_enabled():
+            if not self.kill.is_trading_allowed():
+                self.state = "paused"
+                await sleep_unless_halted(self.kill, self.budget.interval_sec or 1.0)
+                continue
+            self.state = "running"
+            self._run_started = time.monotonic()
+            try:
+                cpu = await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except StrategyHalted:
+                logging.warning(f"[StrategyRuntime] {self.name} still running at HALT; abandoning the run")
+                break
+            except Exception as e:
+                self.crashes += 1
+                self.consecutive_crashes += 1
+                self.last_error = str(e)
+                logging.error(f"[StrategyRuntime] {self.name} crashed ({self.crashes}): {e}")
+                record_event("crash", self.name, detail=str(e))
+                if self.budget.max_restarts is not None and self.crashes > self.budget.max_restarts:
+                    self.state = "failed"
+                    logging.error(f"[StrategyRuntime] {self.name} exceeded {self.budget.max_restarts} restarts; giving up")
+                    return
+                self.state = "backoff"
+                await sleep_unless_halted(self.kill, min(self.budget.max_backoff_sec,
+                                                         self.budget.backoff_sec * 2 ** (self.consecutive_crashes - 1)))
+                continue
+            finally:
+                wall = time.monotonic() - self._run_started
+                self._run_started = None
+            self.runs += 1
+            self.consecutive_crashes = 0
+            throttle = self._account(wall, cpu)
+            self.state = "idle"
+            await sleep_unless_halted(self.kill, self.budget.interval_sec + throttle)
+        self.state = "stopped"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "runs": self.runs,
+            "crashes": self.crashes,
+            "latency_violations": self.latency_violations,
+            "cpu_violations": self.cpu_violations,
+            "last_latency_ms": self.last_latency_ms,
+            "last_cpu_pct": self.last_cpu_pct,
+            "last_error": self.last_error,
+        }
+
+
+class StrategyRuntime:
+    """Runs every enabled strategy concurrently under one shared ``KillSwitch``.
+
+    Strategies come from ``alpha.enabled`` unless ``strategies`` is given
+    (names or ``name -> callable``); per-strategy limits from ``alpha.budgets``.
+    Strategies whose module defines ``register_<module>(bus, config)`` are
+    wired to the shared ``EventBus`` instead of being run in a loop. A
+    strategy that fails to import is reported as failed without affecting
+    the others. ``run`` returns once the kill switch halts and every
+    supervisor has stopped.
+    """
+
+    def __init__(self, config: Dict, strategies: Optional[Any] = None, kill: Optional[KillSwitch] = None,
+                 sample_interval: float = 5.0, bus: Optional[EventBus] = None):
+        self.config = config
+        self.kill = kill or init_global_kill_switch(config)
+        self.sample_interval = sample_interval
+        self.bus = bus
+        alpha_cfg = config.get("alpha") or {}
+        budgets = alpha_cfg.get("budgets") or {}
+        if strategies is None:
+            strategies = alpha_cfg.get("enabled") or []
+        if not isinstance(strategies, dict):
+            strategies = {name: None for name in strategies}
+
+        self.runners: Dict[str, StrategyRunner] = {}
+        self.subscribed: List[str] = []
+        self.services: List[str] = []
+        self.load_errors: Dict[str, str] = {}
+        for name, run_func in strategies.items():
+            try:
+                if run_func is None and self._register(name):
+                    continue
+                run_func = run_func or load_strategy(name)
+            except Exception as e:
+                logging.error(f"[StrategyRuntime] Could not load {name}: {e}")
+                self.load_errors[name] = str(e)
+                continue
+            try:
+                budget = StrategyBudget(**(budgets.get(name) or {}))
+            except TypeError as e:
+                # Plain-dict configs skip AppConfig validation; a bad key must not take the runtime down
+                logging.warning(f"[StrategyRuntime] Invalid budget for {name} ({e}); using the default budget")
+                budget = StrategyBudget()
+            self.runners[name] = StrategyRunner(name, run_func, config, self.kill, budget)
+        self._thread: Optional[threading.Thread] = None
+
+    def _shared_bus(self) -> EventBus:
+        if self.bus is None:
+            self.bus = EventBus(self.config)
+        return self.bus
+
+    def _register(self, name: str) -> bool:
+        register = load_registration(name)
+        if register is None:
+            return False
+        register(self._shared_bus(), self.config)
+        self.subscribed.append(name)
+        return True
+
+    def add_service(self, name: str, register: Callable) -> Any:
+        """Wire a non-strategy consumer (``register(bus, config)``, e.g. the auto-scaler) to the shared bus."""
+        service = register(self._shared_bus(), self.config)
+        self.services.append(name)
+        return service
+
+    async def _monitor(self) -> None:
+        while self.kill.is_enabled():
+            await sleep_unless_halted(self.kill, self.sample_interval)
+            if not self.kill.is_enabled():
+                return
+            for runner in self.runners.values():
+                pct = runner.sample_cpu_pct()
+                if pct is not None and pct > runner.budget.cpu_pct:
+                    runner.cpu_violations += 1
+                    logging.warning(f"[StrategyRuntime] {runner.name} running at {pct:.0f}% CPU "
+                                    f"(budget {runner.budget.cpu_pct:.0f}%)")
+
+    async def run(self) -> None:
+        names = list(self.runners) + self.subscribed
+        logging.info(f"[StrategyRuntime] Starting {len(names)} strategies: {', '.join(names)}")
+        bus_task = asyncio.ensure_future(self.bus.run()) if self.bus is not None and len(self.bus) else None
+        try:
+            # _monitor returns when the kill switch halts, which also ends the bus
+            await asyncio.gather(self._monitor(), *(runner.supervise() for runner in self.runners.values()))
+        finally:
+            if bus_task is not None:
+                bus_task.cancel()
+                await asyncio.gather(bus_task, return_exceptions=True)
+            if self.bus is not None:
+                self.bus.stop()  # stop hooks run even if the bus never started
+        logging.info(f"[StrategyRuntime] Stopped (kill switch state {self.kill.STATE_NAMES[self.kill.state]})")
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the runtime on its own event loop in a background thread."""
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), name="strategy-runtime", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {name: runner.stats() for name, runner in self.runners.items()}
+        for name in self.subscribed + self.services:
+            stats[name] = {"state": "subscribed"}
+        for name, error in self.load_errors.items():
+            stats[name] = {"state": "failed", "last_error": error}
+        return stats
+
+
+def run_strategies(config: Dict, strategies: Optional[List[str]] = None) -> StrategyRuntime:
+    # Strategies journal their trades process-wide; the dashboard and performance store read it back
+    journal = init_trade_journal(config.get("database_path", "data/bot_state.db"))
+    start_metrics_server(metrics_port(config))
+    runtime = StrategyRuntime(config, strategies)
+    from src.ai.auto_scaler import register_auto_scaler
+    runtime.add_service("auto_scaler", register_auto_scaler)
+    try:
+        asyncio.run(runtime.run())
+    finally:
+        journal.flush(timeout=5)
+    return runtime
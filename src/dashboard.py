@@ -1,11 +1,147 @@
+import asyncio
+import contextlib
+import json
+import logging
+import urllib.request
+from typing import Any, AsyncIterator, Dict, Optional
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 import uvicorn
 
-def launch_dashboard(port=8501):
-    app = FastAPI()
+from src.core.metrics import CONTENT_TYPE, metrics_port
+from src.kill_switch import KillSwitch, KillSwitchMonitor
+from src.services.trade_aggregates import TradeAggregator
+
+
+class DashboardFeed:
+    """Shared dashboard state, refreshed once per ``interval`` no matter how many clients watch.
+
+    Each tick folds newly journalled trades into the aggregates, reads the
+    kill switch word and re-serialises the summary; clients get the cached
+    JSON and are woken only when it changed.
+    """
+
+    def __init__(self, aggregator: TradeAggregator, kill: Optional[KillSwitchMonitor] = None, interval: float = 1.0):
+        self.aggregator = aggregator
+        self.kill = kill
+        self.interval = interval
+        self.version = 0
+        self.payload = json.dumps({"strategies": {}, "kill_switch": None})
+        self._changed: Optional[asyncio.Condition] = None
+
+    def _kill_state(self) -> Optional[Dict[str, Any]]:
+        if self.kill is None:
+            return None
+        state = self.kill.state
+        if state is None:
+            return None
+        return {"state": KillSwitch.STATE_NAMES.get(state, str(state)), "error_count": self.kill.error_count}
+
+    def summary(self) -> Dict[str, Any]:
+        return json.loads(self.payload)
+
+    def refresh(self) -> bool:
+        """Poll the journal and rebuild the summary; True if it changed."""
+        self.aggregator.poll()
+        payload = json.dumps({"strategies": self.aggregator.snapshot(), "kill_switch": self._kill_state()},
+                             sort_keys=True)
+        if payload == self.payload:
+            return False
+        self.payload = payload
+        self.version += 1
+        return True
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def run(self) -> None:
+        while True:
+            try:
+                changed = await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logging.error(f"[Dashboard] refresh failed: {e}")
+                changed = False
+            if changed:
+                cond = self._condition()
+                async with cond:
+                    cond.notify_all()
+            await asyncio.sleep(self.interval)
+
+    async def updates(self) -> AsyncIterator[str]:
+        """Current summary, then every changed one."""
+        seen = -1
+        cond = self._condition()
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: self.version != seen)
+                seen, payload = self.version, self.payload
+            yield payload
+
+
+def feed_from_config(config: Dict[str, Any]) -> DashboardFeed:
+    kill_name = config.get("kill_switch_name")
+    interval = (config.get("dashboard") or {}).get("poll_interval", 1.0)
+    return DashboardFeed(
+        TradeAggregator(config.get("database_path", "data/bot_state.db")),
+        KillSwitchMonitor(kill_name) if kill_name else None,
+        interval,
+    )
+
+
+def create_app(config: Optional[Dict[str, Any]] = None, feed: Optional[DashboardFeed] = None,
+               metrics_url: Optional[str] = None) -> FastAPI:
+    if feed is None and config is not None:
+        feed = feed_from_config(config)
+    if metrics_url is None:
+        metrics_url = f"http://127.0.0.1:{metrics_port(config or {})}/metrics"
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        task = asyncio.ensure_future(feed.run()) if feed is not None else None
+        yield
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    app = FastAPI(lifespan=lifespan)
 
     @app.get("/")
     def status():
-        return {"status": "MEV The OG is live", "pnl": 0}
+        strategies = feed.summary()["strategies"] if feed is not None else {}
+        pnl = sum(windows.get("24h", {}).get("pnl_usd", 0.0) for windows in strategies.values())
+        return {"status": "MEV The OG is live", "pnl": pnl}
+
+    @app.get("/api/summary")
+    def summary():
+        return Response(feed.payload if feed is not None else "{}", media_type="application/json")
+
+    @app.get("/api/stream")
+    async def stream():
+        # Server-sent events: one "data:" frame per changed summary
+        async def events():
+            if feed is None:
+                return
+            async for payload in feed.updates():
+                yield f"data: {payload}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        # The histograms belong to the bot process; relay its exporter (see start_metrics_server)
+        try:
+            with urllib.request.urlopen(metrics_url, timeout=2) as resp:
+                return PlainTextResponse(resp.read().decode(), media_type=CONTENT_TYPE)
+        except OSError as e:
+            logging.warning(f"[Dashboard] metrics exporter unreachable at {metrics_url}: {e}")
+            return PlainTextResponse(f"# bot metrics exporter unreachable: {e}\n", status_code=503,
+                                     media_type=CONTENT_TYPE)
+
+    return app
+
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
+def launch_dashboard(config: Optional[Dict[str, Any]] = None, port: int = 8501):
+    uvicorn.run(create_app(config), host="0.0.0.0", port=port)
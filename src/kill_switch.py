@@ -3,18 +3,30 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable, Dict, Optional
+import multiprocessing as mp
+import os
+import threading
+import time
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 
+from .core.event_log import record_event
+from .risk_window import DEFAULT_TRADES_PER_MIN, WINDOW_SPANS, RiskWindows, window_specs
+
 
 KILL_SWITCH: "KillSwitch" | None = None
+_GLOBAL_LOCK = threading.Lock()
 
 
 def init_global_kill_switch(config: Dict, notifier: Optional[Callable[[str], None]] = None) -> "KillSwitch":
     """Initialise the global kill switch singleton."""
     global KILL_SWITCH
     if KILL_SWITCH is None:
-        KILL_SWITCH = KillSwitch(config, notifier=notifier)
+        with _GLOBAL_LOCK:
+            if KILL_SWITCH is None:
+                KILL_SWITCH = KillSwitch(config, notifier=notifier)
     return KILL_SWITCH
 
 
@@ -24,8 +36,118 @@ def get_kill_switch() -> "KillSwitch":
     return KILL_SWITCH
 
 
+# state word slots; _OWNER holds the creating pid so a live bot's word is never taken over
+_STATE, _ERRORS, _OWNER = 0, 1, 2
+_SLOTS = 3
+
+# POSIX segments appear here on Linux; the monitor compares inodes to spot a replaced segment
+_SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _release(view: memoryview, shm: SharedMemory, owner: bool) -> None:
+    view.release()
+    shm.close()
+    if owner:
+        shm.unlink()
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _unlink_stale(name: str) -> None:
+    # A named segment left behind by a crashed process would otherwise block start-up,
+    # but one whose owner is still running belongs to a live bot and is left alone
+    try:
+        stale = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    words = stale.buf.cast("q")
+    owner = words[_OWNER] if len(words) > _OWNER else 0
+    words.release()
+    stale.close()
+    if owner == os.getpid():
+        raise FileExistsError(f"Kill switch segment {name!r} already exists in this process; "
+                              "share it through init_global_kill_switch")
+    if _pid_alive(owner):
+        raise FileExistsError(f"Kill switch segment {name!r} is owned by running process {owner}")
+    stale.unlink()
+
+
+class SharedStateWord:
+    """A few int64 words in shared memory: lock-free reads, compare-and-set writes.
+
+    Aligned 8-byte loads and stores are atomic, so readers index the mapping
+    directly. Writers serialise on a process-shared lock, which is what makes
+    ``compare_and_set`` and ``add`` atomic across threads and processes. The
+    word travels to child processes by pickling at spawn time (as a
+    ``Process`` argument), which attaches to the same mapping and lock.
+    """
+
+    def __init__(self, slots: int = _SLOTS, name: Optional[str] = None, lock: Any = None,
+                 create: Optional[bool] = None):
+        self.slots = slots
+        if create is None:
+            create = name is None
+        if create and name is not None:
+            _unlink_stale(name)
+        self.shm = SharedMemory(name=name, create=create, size=8 * slots)
+        self.words = self.shm.buf.cast("q")
+        if create:
+            for i in range(slots):
+                self.words[i] = 0
+            if slots > _OWNER:
+                self.words[_OWNER] = os.getpid()
+        self._lock = lock if lock is not None else mp.get_context("spawn").Lock()
+        self._finalizer = weakref.finalize(self, _release, self.words, self.shm, create)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"slots": self.slots, "name": self.shm.name, "lock": self._lock}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["slots"], state["name"], state["lock"], create=False)
+
+    def load(self, slot: int) -> int:
+        return self.words[slot]
+
+    def store(self, slot: int, value: int) -> None:
+        with self._lock:
+            self.words[slot] = value
+
+    def compare_and_set(self, slot: int, expected: int, new: int) -> bool:
+        with self._lock:
+            if self.words[slot] != expected:
+                return False
+            self.words[slot] = new
+            return True
+
+    def add(self, slot: int, delta: int = 1) -> int:
+        with self._lock:
+            value = self.words[slot] + delta
+            self.words[slot] = value
+            return value
+
+    def close(self) -> None:
+        self._finalizer()
+
+
 class KillSwitch:
-    """Multi-tier kill switch with escalation logic."""
+    """Multi-tier kill switch with escalation logic.
+
+    State and the trade error count live in a ``SharedStateWord``, so
+    ``is_enabled``/``is_trading_allowed`` are a single lock-free load and an
+    escalation made by any thread or child process is visible to every other
+    one on its next check. Escalation is a compare-and-set loop that only
+    ever moves the state up; exactly one caller wins and notifies.
+    """
 
     RUNNING = 0
     PAUSE = 1
@@ -41,17 +163,61 @@ class KillSwitch:
         HALT: "halt",
     }
 
-    def __init__(self, config: Dict, notifier: Optional[Callable[[str], None]] = None):
+    def __init__(self, config: Dict, notifier: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        risk = config.get("risk") or {}
         self.enabled = config.get("kill_switch_enabled", True)
-        self.max_drawdown_pct = config.get("risk", {}).get("max_drawdown_pct", 5)
-        self.max_loss_usd = config.get("risk", {}).get("max_loss_usd", 200)
+        self.max_drawdown_pct = risk.get("max_drawdown_pct", 5)
+        self.max_loss_usd = risk.get("max_loss_usd", 200)
+        # Loss limit per trailing window: 24h is max_loss_usd, the shorter windows are opt-in
+        self.window_loss_usd = {"24h": self.max_loss_usd, **(risk.get("window_loss_usd") or {})}
+        unknown = set(self.window_loss_usd) - set(WINDOW_SPANS)
+        if unknown:
+            raise ValueError(f"Unknown risk windows {sorted(unknown)}; expected {list(WINDOW_SPANS)}")
+        self.trades_per_min = risk.get("max_trades_per_min", DEFAULT_TRADES_PER_MIN)
         self.max_errors = config.get("kill_switch_max_errors", 3)
-        self.state = self.RUNNING
-        self.pnl_history: list[float] = []
-        self.error_count = 0
+        # A named word can be watched read-only by other processes (see KillSwitchMonitor)
+        self._word = SharedStateWord(name=config.get("kill_switch_name"), create=True)
+        # Trailing 1m/1h/24h PnL; clock is injectable so replays run on simulated time
+        self.clock = clock
+        self.pnl_windows = RiskWindows(window_specs(self.trades_per_min))
+        self._pnl_lock = threading.Lock()
         self.notifier = notifier
         self.risk_manager = None
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Children share the state word; notifier, risk manager and PnL windows stay per process
+        return {
+            "enabled": self.enabled,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "max_loss_usd": self.max_loss_usd,
+            "window_loss_usd": self.window_loss_usd,
+            "trades_per_min": self.trades_per_min,
+            "max_errors": self.max_errors,
+            "word": self._word,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._word = state.pop("word")
+        self.__dict__.update(state)
+        self.notifier = None
+        self.risk_manager = None
+        self.clock = time.time
+        self.pnl_windows = RiskWindows(window_specs(self.trades_per_min))
+        self._pnl_lock = threading.Lock()
+
+    @property
+    def state(self) -> int:
+        return self._word.load(_STATE)
+
+    @state.setter
+    def state(self, value: int) -> None:
+        self._word.store(_STATE, value)
+
+    @property
+    def error_count(self) -> int:
+        return self._word.load(_ERRORS)
+
     # --- State helpers -------------------------------------------------
 
     def is_trading_allowed(self) -> bool:
@@ -68,11 +234,18 @@ class KillSwitch:
             except Exception as e:  # pragma: no cover - notifier failures shouldn't break bot
                 logging.error(f"[KillSwitch] notifier error: {e}")
 
-    def _escalate(self, new_state: int, reason: str) -> None:
-        if not self.enabled or new_state <= self.state:
-            return
-        self.state = new_state
+    def _escalate(self, new_state: int, reason: str) -> bool:
+        if not self.enabled:
+            return False
+        while True:
+            current = self._word.load(_STATE)
+            if new_state <= current:
+                return False
+            if self._word.compare_and_set(_STATE, current, new_state):
+                break
         self._notify(f"[KILL SWITCH] Escalated to {self.STATE_NAMES[new_state].upper()}: {reason}")
+        record_event("kill_switch", detail={"state": self.STATE_NAMES[new_state], "reason": reason})
+        return True
 
     def attach_risk_manager(self, rm) -> None:
         self.risk_manager = rm
@@ -80,10 +253,10 @@ class KillSwitch:
     # --- External hooks -------------------------------------------------
 
     def record_trade_error(self, reason: str) -> None:
-        self.error_count += 1
-        if self.error_count >= self.max_errors and self.state < self.PAUSE:
+        error_count = self._word.add(_ERRORS)
+        if error_count >= self.max_errors and self.state < self.PAUSE:
             self._escalate(self.PAUSE, reason)
-        elif self.error_count >= self.max_errors * 2 and self.state < self.HALT:
+        elif error_count >= self.max_errors * 2 and self.state < self.HALT:
             self._escalate(self.HALT, reason)
 
     def record_api_disconnect(self, reason: str = "rpc disconnect") -> None:
@@ -105,20 +278,92 @@ class KillSwitch:
     # --- PnL/Risk tracking ---------------------------------------------
 
     def update_pnl(self, pnl_usd: float) -> None:
-        self.pnl_history.append(pnl_usd)
-        if len(self.pnl_history) > 100:
-            self.pnl_history = self.pnl_history[-100:]
-        self._check_risk()
+        with self._pnl_lock:
+            self.pnl_windows.add(self.clock(), pnl_usd)
+            breached = self._check_risk()
+        if breached:
+            self._escalate(self.HALT, f"max loss exceeded over {breached}")
 
-    def _check_risk(self) -> None:
+    def _check_risk(self) -> Optional[str]:
+        """Name of the first window whose worst trade or net loss is over its limit, if any."""
         if not self.enabled:
-            return
-        total_pnl = sum(self.pnl_history)
-        min_pnl = min(self.pnl_history) if self.pnl_history else 0
-        if abs(min_pnl) > self.max_loss_usd or (total_pnl < 0 and abs(total_pnl) > self.max_loss_usd):
-            self._escalate(self.HALT, "max loss exceeded")
+            return None
+        for name, limit in self.window_loss_usd.items():
+            window = self.pnl_windows[name]
+            # Losses only: a large win is never a breach
+            if -window.min > limit or -window.sum > limit:
+                return name
+        return None
+
+    def pnl_snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Sum/count/min/max of realised PnL per trailing window."""
+        with self._pnl_lock:
+            self.pnl_windows.expire(self.clock())
+            return self.pnl_windows.snapshot()
 
     def record_risk_breach(self, reason: str) -> None:
         """Explicit risk breach trigger from RiskManager."""
         self._escalate(self.HALT, reason)
 
+
+class KillSwitchMonitor:
+    """Read-only view of a named kill switch from an unrelated process (e.g. the dashboard).
+
+    Attaching never creates, resets or unlinks the segment; until the bot has
+    created it, ``state`` is None. A restarted bot replaces the segment, so
+    every read first checks the mapping is still current (same inode, or
+    where that is unavailable, a live owner) and re-attaches if not.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._shm: Optional[SharedMemory] = None
+        self._words: Optional[memoryview] = None
+        self._inode: Optional[int] = None
+
+    def _current_inode(self) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(_SHM_DIR, self.name.lstrip("/"))).st_ino
+        except FileNotFoundError:
+            return None
+
+    def _stale(self) -> bool:
+        if _SHM_DIR is not None:
+            return self._current_inode() != self._inode
+        return not _pid_alive(self._words[_OWNER])
+
+    def _attach(self) -> bool:
+        if self._words is not None:
+            if not self._stale():
+                return True
+            logging.warning(f"[KillSwitchMonitor] Segment {self.name} was replaced; re-attaching")
+            self.close()
+        try:
+            shm = SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        # Python < 3.13 registers attached segments too and would unlink the bot's word at exit
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:  # pragma: no cover - tracker internals differ across versions
+            pass
+        self._shm, self._words = shm, shm.buf.cast("q")
+        if _SHM_DIR is not None:
+            self._inode = os.fstat(shm._fd).st_ino
+        return True
+
+    @property
+    def state(self) -> Optional[int]:
+        return self._words[_STATE] if self._attach() else None
+
+    @property
+    def error_count(self) -> Optional[int]:
+        return self._words[_ERRORS] if self._attach() else None
+
+    def close(self) -> None:
+        if self._words is not None:
+            self._words.release()
+            self._shm.close()
+            self._words = self._shm = self._inode = None
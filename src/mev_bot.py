@@ -8,9 +8,11 @@ import sys
 
 from .core.config_manager import load_app_config
 from .risk_manager import RiskManager
-from .kill_switch import KillSwitch
+from .kill_switch import init_global_kill_switch
 from .monitoring import Monitoring
-from .signer_service import SignerService
+from .core.metrics import REGISTRY, metrics_port, start_metrics_server
+from .services.trade_journal import TradeJournal, init_trades_schema
+from .signer_daemon import connect_signer
 from .transaction_manager import TransactionManager
 from .cross_chain_arb import CrossChainArb
 
@@ -27,41 +29,23 @@ class MEVBot:
             raise RuntimeError("Mock modules loaded")
         self.network = self.config.network
         self.mode = self.config.mode
-        self.signer = SignerService()
+        self.signer = connect_signer(self.config.model_dump())
         os.makedirs(os.path.dirname(self.config.database_path), exist_ok=True)
         self.db = sqlite3.connect(self.config.database_path)
         self._init_db()
+        self.journal = TradeJournal(self.config.database_path)
+        REGISTRY.gauge("mev_journal_queue_depth", self.journal.backlog, "Trades waiting for the journal writer")
         self.txm = TransactionManager(self.web3, None, self.signer, self.config)
         self.arb = CrossChainArb(self.web3, None, self.signer, self.db, self.config, self.txm)
         self.risk = RiskManager(self.config.model_dump())
-        self.kill = KillSwitch(self.config.model_dump())
-        self.monitor = Monitoring(self.db)
+        # Shared with CrossChainArb/StrategyRuntime: a named segment can only be created once per process
+        self.kill = init_global_kill_switch(self.config.model_dump())
+        self.monitor = Monitoring(self.db, self.journal)
         logger.info(f"[MEVBot] Initialized on {self.config.network} in {self.config.mode}")
 
     def _init_db(self):
-        cur = self.db.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS trades (
-                opportunity_id TEXT,
-                strategy_id TEXT,
-                status TEXT,
-                timestamp_start REAL,
-                timestamp_end REAL,
-                token_in_address TEXT,
-                token_in_amount_wei TEXT,
-                token_out_address TEXT,
-                token_out_amount_min_wei TEXT,
-                token_out_amount_actual_wei TEXT,
-                tx_hash_leg1 TEXT,
-                gas_used_leg1 INTEGER,
-                gas_price_leg1_gwei_effective REAL,
-                pnl_usd_leg1 REAL,
-                error_message_leg1 TEXT
-            )
-            """
-        )
-        self.db.commit()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        init_trades_schema(self.db)
 
     async def run_arbitrage(self):
         opp = await self.arb.find_opportunity()
@@ -74,7 +58,11 @@ class MEVBot:
             logger.info(f"[MEVBot] Swap success={result.get('success')}")
 
     def run(self):
-        asyncio.run(self.run_arbitrage())
+        start_metrics_server(metrics_port(self.config.model_dump()))
+        try:
+            asyncio.run(self.run_arbitrage())
+        finally:
+            self.journal.flush(timeout=5)
 
 
 if __name__ == "__main__":
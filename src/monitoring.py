@@ -1,13 +1,50 @@
-+import logging
-+import sqlite3
-+from typing import Optional
-+
-+logger = logging.getLogger(__name__)
-+
-+
-+class Monitoring:
-+    def __init__(self, db: sqlite3.Connection):
-+        self.db = db
-+
-+    def record_trade(self, tx_hash: str, pnl: float, latency: float) -> None:
-+        logger.info(f"[Monitoring] tx={tx_hash} pnl={pnl} latency={latency}")
+import logging
+import sqlite3
+from time import time
+from typing import Any, Optional
+
+from .core.event_log import record_event
+from .core.metrics import REGISTRY, STAGE_LATENCY
+from .services.trade_journal import TradeJournal, get_trade_journal
+
+logger = logging.getLogger(__name__)
+
+
+def record_trade(strategy_id: str, pnl: float, latency: float, tx_hash: str = "", status: Optional[str] = None,
+                 journal: Optional[TradeJournal] = None, **fields: Any) -> None:
+    """Log, time and journal one executed (or simulated) trade.
+
+    Goes to ``journal``, else the process-wide journal from
+    ``init_trade_journal``; with neither, the trade is only logged.
+    """
+    if isinstance(tx_hash, (bytes, bytearray)):
+        # HexBytes would land in sqlite as a BLOB and never match the hex-string index
+        tx_hash = "0x" + bytes(tx_hash).hex()
+    status = status or ("success" if tx_hash else "failed")
+    logger.info(f"[Monitoring] strategy={strategy_id} status={status} tx={tx_hash} pnl={pnl} latency={latency}")
+    REGISTRY.observe(STAGE_LATENCY, latency, stage="trade", strategy=strategy_id)
+    record_event("trade" if status != "failed" else "trade_failed", strategy_id, latency * 1000, pnl, tx_hash or None)
+    journal = journal or get_trade_journal()
+    if journal is None:
+        return
+    end = time()
+    trade = {
+        "strategy_id": strategy_id,
+        "status": status,
+        "timestamp_start": end - latency,
+        "timestamp_end": end,
+        "tx_hash_leg1": tx_hash,
+        "pnl_usd_leg1": pnl,
+    }
+    trade.update(fields)
+    journal.record(trade)
+
+
+class Monitoring:
+    def __init__(self, db: sqlite3.Connection, journal: Optional[TradeJournal] = None):
+        self.db = db
+        self.journal = journal
+
+    def record_trade(self, tx_hash: str, pnl: float, latency: float, strategy_id: str = "mev_bot", **fields: Any) -> None:
+        """Log the trade and hand it to the journal; persistence happens on the journal's writer thread."""
+        record_trade(strategy_id, pnl, latency, tx_hash, journal=self.journal, **fields)
@@ -0,0 +1,297 @@
+# src/pricing/quote_engine.py
+
+import bisect
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+Q96 = 2 ** 96
+
+SYNC_TOPIC = Web3.keccak(text="Sync(uint112,uint112)")
+V3_SWAP_TOPIC = Web3.keccak(text="Swap(address,address,int256,int256,uint160,uint128,int24)")
+V3_MINT_TOPIC = Web3.keccak(text="Mint(address,address,int24,int24,uint128,uint256,uint256)")
+V3_BURN_TOPIC = Web3.keccak(text="Burn(address,int24,int24,uint128,uint256,uint256)")
+
+V2_PAIR_ABI = [
+    {"name": "getReserves", "type": "function", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "reserve0", "type": "uint112"}, {"name": "reserve1", "type": "uint112"},
+                 {"name": "blockTimestampLast", "type": "uint32"}]},
+    {"name": "token0", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "address"}]},
+    {"name": "token1", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "address"}]},
+]
+
+V3_POOL_ABI = [
+    {"name": "slot0", "type": "function", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "sqrtPriceX96", "type": "uint160"}, {"name": "tick", "type": "int24"},
+                 {"name": "observationIndex", "type": "uint16"}, {"name": "observationCardinality", "type": "uint16"},
+                 {"name": "observationCardinalityNext", "type": "uint16"}, {"name": "feeProtocol", "type": "uint8"},
+                 {"name": "unlocked", "type": "bool"}]},
+    {"name": "liquidity", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "uint128"}]},
+    {"name": "fee", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "uint24"}]},
+    {"name": "tickSpacing", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "int24"}]},
+    {"name": "token0", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "address"}]},
+    {"name": "token1", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "address"}]},
+    {"name": "tickBitmap", "type": "function", "stateMutability": "view", "inputs": [{"name": "wordPosition", "type": "int16"}],
+     "outputs": [{"name": "", "type": "uint256"}]},
+    {"name": "ticks", "type": "function", "stateMutability": "view", "inputs": [{"name": "tick", "type": "int24"}],
+     "outputs": [{"name": "liquidityGross", "type": "uint128"}, {"name": "liquidityNet", "type": "int128"},
+                 {"name": "feeGrowthOutside0X128", "type": "uint256"}, {"name": "feeGrowthOutside1X128", "type": "uint256"},
+                 {"name": "tickCumulativeOutside", "type": "int56"}, {"name": "secondsPerLiquidityOutsideX128", "type": "uint160"},
+                 {"name": "secondsOutside", "type": "uint32"}, {"name": "initialized", "type": "bool"}]},
+]
+
+
+def _as_bytes(value: Any) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+
+def _words(data: bytes) -> List[bytes]:
+    return [data[i:i + 32] for i in range(0, len(data), 32)]
+
+
+def _uint(word: bytes) -> int:
+    return int.from_bytes(word, "big")
+
+
+def _int(word: bytes) -> int:
+    return int.from_bytes(word, "big", signed=True)
+
+
+def tick_to_sqrt_price(tick: int) -> float:
+    return 1.0001 ** (tick / 2)
+
+
+class V2Pool:
+    """Constant-product pool state (Uniswap V2 and forks)."""
+
+    def __init__(self, token0: str, token1: str, reserve0: int = 0, reserve1: int = 0, fee_bps: int = 30):
+        self.token0 = token0.lower()
+        self.token1 = token1.lower()
+        self.reserve0 = reserve0
+        self.reserve1 = reserve1
+        self.fee_bps = fee_bps
+        self.block_number: Optional[int] = None
+
+    def _reserves(self, zero_for_one: bool) -> Tuple[int, int]:
+        return (self.reserve0, self.reserve1) if zero_for_one else (self.reserve1, self.reserve0)
+
+    def get_amount_out(self, amount_in: int, zero_for_one: bool) -> int:
+        reserve_in, reserve_out = self._reserves(zero_for_one)
+        if amount_in <= 0 or reserve_in == 0 or reserve_out == 0:
+            return 0
+        amount_in_with_fee = amount_in * (10000 - self.fee_bps)
+        return amount_in_with_fee * reserve_out // (reserve_in * 10000 + amount_in_with_fee)
+
+    def get_amount_in(self, amount_out: int, zero_for_one: bool) -> Optional[int]:
+        reserve_in, reserve_out = self._reserves(zero_for_one)
+        if amount_out <= 0 or amount_out >= reserve_out:
+            return None
+        return reserve_in * amount_out * 10000 // ((reserve_out - amount_out) * (10000 - self.fee_bps)) + 1
+
+    def virtual_reserves(self) -> Tuple[float, float, float]:
+        """(reserve0, reserve1, fee fraction) of the equivalent constant-product curve."""
+        return float(self.reserve0), float(self.reserve1), self.fee_bps / 10000
+
+    def apply_log(self, topic0: bytes, topics: List[bytes], data: bytes) -> bool:
+        if topic0 != SYNC_TOPIC:
+            return False
+        words = _words(data)
+        self.reserve0, self.reserve1 = _uint(words[0]), _uint(words[1])
+        return True
+
+
+class V3Pool:
+    """Concentrated-liquidity pool state (Uniswap V3 and forks).
+
+    Holds the current sqrt price, active liquidity and the ``liquidityNet`` of
+    every initialized tick that has been loaded; quotes walk across ticks the
+    same way the pool contract does, in floating point.
+    """
+
+    def __init__(
+        self,
+        token0: str,
+        token1: str,
+        fee: int,
+        tick_spacing: int,
+        sqrt_price_x96: int = 0,
+        liquidity: int = 0,
+        tick: int = 0,
+        ticks: Optional[Dict[int, int]] = None,
+    ):
+        self.token0 = token0.lower()
+        self.token1 = token1.lower()
+        self.fee = fee  # hundredths of a bip, e.g. 3000 = 0.3%
+        self.tick_spacing = tick_spacing
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.liquidity = liquidity
+        self.tick = tick
+        self.block_number: Optional[int] = None
+        self.liquidity_net: Dict[int, int] = {}
+        self._sorted_ticks: List[int] = []
+        for t, net in (ticks or {}).items():
+            self.update_tick(t, net)
+
+    def update_tick(self, tick: int, delta_net: int) -> None:
+        net = self.liquidity_net.get(tick, 0) + delta_net
+        if net == 0:
+            if tick in self.liquidity_net:
+                del self.liquidity_net[tick]
+                self._sorted_ticks.pop(bisect.bisect_left(self._sorted_ticks, tick))
+            return
+        if tick not in self.liquidity_net:
+            bisect.insort(self._sorted_ticks, tick)
+        self.liquidity_net[tick] = net
+
+    def get_amount_out(self, amount_in: int, zero_for_one: bool) -> int:
+        if amount_in <= 0 or self.liquidity <= 0 or self.sqrt_price_x96 == 0:
+            return 0
+        remaining = amount_in * (1 - self.fee / 1e6)
+        sqrt_p = self.sqrt_price_x96 / Q96
+        liquidity = float(self.liquidity)
+        out = 0.0
+        if zero_for_one:
+            idx = bisect.bisect_right(self._sorted_ticks, self.tick) - 1
+            while remaining > 0 and liquidity > 0:
+                next_tick = self._sorted_ticks[idx] if idx >= 0 else None
+                sqrt_next = tick_to_sqrt_price(next_tick) if next_tick is not None else 0.0
+                step_max = liquidity * (1 / sqrt_next - 1 / sqrt_p) if sqrt_next > 0 else math.inf
+                if remaining < step_max:
+                    new_sqrt = 1 / (1 / sqrt_p + remaining / liquidity)
+                    out += liquidity * (sqrt_p - new_sqrt)
+                    break
+                out += liquidity * (sqrt_p - sqrt_next)
+                remaining -= step_max
+                sqrt_p = sqrt_next
+                liquidity -= self.liquidity_net[next_tick]
+                idx -= 1
+        else:
+            idx = bisect.bisect_right(self._sorted_ticks, self.tick)
+            while remaining > 0 and liquidity > 0:
+                next_tick = self._sorted_ticks[idx] if idx < len(self._sorted_ticks) else None
+                if next_tick is None:
+                    new_sqrt = sqrt_p + remaining / liquidity
+                    out += liquidity * (1 / sqrt_p - 1 / new_sqrt)
+                    break
+                sqrt_next = tick_to_sqrt_price(next_tick)
+                step_max = liquidity * (sqrt_next - sqrt_p)
+                if remaining < step_max:
+                    new_sqrt = sqrt_p + remaining / liquidity
+                    out += liquidity * (1 / sqrt_p - 1 / new_sqrt)
+                    break
+                out += liquidity * (1 / sqrt_p - 1 / sqrt_next)
+                remaining -= step_max
+                sqrt_p = sqrt_next
+                liquidity += self.liquidity_net[next_tick]
+                idx += 1
+        return int(out)
+
+    def virtual_reserves(self) -> Tuple[float, float, float]:
+        """Constant-product reserves equivalent to the active range (exact until a tick is crossed)."""
+        sqrt_p = self.sqrt_price_x96 / Q96
+        if sqrt_p == 0:
+            return 0.0, 0.0, self.fee / 1e6
+        return self.liquidity / sqrt_p, self.liquidity * sqrt_p, self.fee / 1e6
+
+    def apply_log(self, topic0: bytes, topics: List[bytes], data: bytes) -> bool:
+        words = _words(data)
+        if topic0 == V3_SWAP_TOPIC:
+            self.sqrt_price_x96 = _uint(words[2])
+            self.liquidity = _uint(words[3])
+            self.tick = _int(words[4])
+            return True
+        if topic0 in (V3_MINT_TOPIC, V3_BURN_TOPIC):
+            tick_lower, tick_upper = _int(topics[2]), _int(topics[3])
+            amount = _uint(words[1] if topic0 == V3_MINT_TOPIC else words[0])
+            if topic0 == V3_BURN_TOPIC:
+                amount = -amount
+            self.update_tick(tick_lower, amount)
+            self.update_tick(tick_upper, -amount)
+            if tick_lower <= self.tick < tick_upper:
+                self.liquidity += amount
+            return True
+        return False
+
+
+class QuoteEngine:
+    """In-process pool registry that quotes swaps locally and follows pool logs.
+
+    Pools are bootstrapped once (``load_v2_pool`` / ``load_v3_pool``) and then
+    kept current by feeding ``Sync``/``Swap``/``Mint``/``Burn`` logs into
+    ``apply_logs``; quoting never touches the network.
+    """
+
+    def __init__(self):
+        self.pools: Dict[str, Any] = {}
+        self.logs_applied = 0
+
+    def add_pool(self, address: str, pool: Any) -> Any:
+        self.pools[address.lower()] = pool
+        return pool
+
+    def get_pool(self, address: str) -> Optional[Any]:
+        return self.pools.get(address.lower())
+
+    @property
+    def addresses(self) -> List[str]:
+        return [Web3.to_checksum_address(a) for a in self.pools]
+
+    def apply_log(self, log: Dict[str, Any]) -> bool:
+        pool = self.pools.get(log["address"].lower())
+        if pool is None or not log.get("topics"):
+            return False
+        topics = [_as_bytes(t) for t in log["topics"]]
+        if not pool.apply_log(topics[0], topics, _as_bytes(log["data"])):
+            return False
+        if log.get("blockNumber") is not None:
+            pool.block_number = log["blockNumber"]
+        self.logs_applied += 1
+        return True
+
+    def apply_logs(self, logs: Iterable[Dict[str, Any]]) -> int:
+        return sum(1 for log in logs if self.apply_log(log))
+
+    def quote(self, pool_address: str, token_in: str, amount_in: int) -> int:
+        pool = self.pools[pool_address.lower()]
+        token_in = token_in.lower()
+        if token_in not in (pool.token0, pool.token1):
+            raise ValueError(f"{token_in} is not traded by pool {pool_address}")
+        return pool.get_amount_out(amount_in, token_in == pool.token0)
+
+    # --- Bootstrap (one-off RPC reads) -----------------------------------
+
+    def load_v2_pool(self, web3: Web3, address: str, fee_bps: int = 30) -> V2Pool:
+        pair = web3.eth.contract(address=Web3.to_checksum_address(address), abi=V2_PAIR_ABI)
+        reserve0, reserve1, _ = pair.functions.getReserves().call()
+        pool = V2Pool(pair.functions.token0().call(), pair.functions.token1().call(), reserve0, reserve1, fee_bps)
+        return self.add_pool(address, pool)
+
+    def load_v3_pool(self, web3: Web3, address: str, word_radius: int = 2) -> V3Pool:
+        """Load slot0/liquidity and every initialized tick within ``word_radius`` bitmap words."""
+        contract = web3.eth.contract(address=Web3.to_checksum_address(address), abi=V3_POOL_ABI)
+        sqrt_price_x96, tick = contract.functions.slot0().call()[:2]
+        spacing = contract.functions.tickSpacing().call()
+        pool = V3Pool(
+            contract.functions.token0().call(),
+            contract.functions.token1().call(),
+            contract.functions.fee().call(),
+            spacing,
+            sqrt_price_x96,
+            contract.functions.liquidity().call(),
+            tick,
+        )
+        center = (tick // spacing) >> 8
+        for word in range(center - word_radius, center + word_radius + 1):
+            bitmap = contract.functions.tickBitmap(word).call()
+            while bitmap:
+                bit = (bitmap & -bitmap).bit_length() - 1
+                bitmap &= bitmap - 1
+                t = ((word << 8) + bit) * spacing
+                pool.update_tick(t, contract.functions.ticks(t).call()[1])
+        return self.add_pool(address, pool)
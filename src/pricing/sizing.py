@@ -0,0 +1,159 @@
+# src/pricing/sizing.py
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# (eth_reserve, usdc_reserve, fee_fraction) in whole-token units
+Reserves = Tuple[float, float, float]
+
+
+def pool_reserves(pool: Any, eth_token: str, eth_decimals: int = 18, usd_decimals: int = 6) -> Reserves:
+    """Constant-product view of a ``V2Pool``/``V3Pool`` oriented as (ETH, USD, fee)."""
+    r0, r1, fee = pool.virtual_reserves()
+    if pool.token0 == eth_token.lower():
+        return r0 / 10 ** eth_decimals, r1 / 10 ** usd_decimals, fee
+    return r1 / 10 ** eth_decimals, r0 / 10 ** usd_decimals, fee
+
+
+def mid_price(reserves: Reserves) -> float:
+    eth, usd, _ = reserves
+    return usd / eth if eth else 0.0
+
+
+@lru_cache(maxsize=64)
+def size_grid(max_size: float, min_size: float = 1e-4, n: int = 4096) -> np.ndarray:
+    """Geometric grid: dense at small sizes, where the profit curve bends fastest.
+
+    Grids are cached (the bounds rarely change between blocks) and returned read-only.
+    """
+    grid = np.geomspace(min_size, max_size, n)
+    grid.setflags(write=False)
+    return grid
+
+
+def profit_curve(
+    buy: Reserves,
+    sell: Reserves,
+    sizes: np.ndarray,
+    bridge_fee_bps: float = 8,
+    gas_usd: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> np.ndarray:
+    """Net USD profit of buying ``sizes`` ETH on ``buy``, bridging, and selling on ``sell``.
+
+    Price impact comes from the constant-product curves themselves; the bridge
+    fee is taken from the ETH in flight, ``slippage_bps`` is a haircut on the
+    sell proceeds, and ``gas_usd`` is the fixed cost of both legs.
+    """
+    buy_eth, buy_usd, buy_fee = buy
+    sell_eth, sell_usd, sell_fee = sell
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost = buy_usd * sizes / ((buy_eth - sizes) * (1 - buy_fee))
+        arrived = sizes * (1 - bridge_fee_bps / 10000) * (1 - sell_fee)
+        proceeds = arrived * sell_usd / (sell_eth + arrived) * (1 - slippage_bps / 10000)
+        profit = proceeds - cost - gas_usd
+    return np.where(sizes < buy_eth, profit, -np.inf)
+
+
+def optimal_trade_size(
+    reserves_a: Reserves,
+    reserves_b: Reserves,
+    max_size: Optional[float] = None,
+    n: int = 4096,
+    bridge_fee_bps: float = 8,
+    gas_usd: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> Dict[str, Any]:
+    """Best size and direction for a two-venue arb, evaluated over a whole size grid at once.
+
+    Both directions (buy on A / sell on B and the reverse) are computed in one
+    vectorized pass. Returns the argmax together with the full profit curve of
+    the winning direction.
+    """
+    if max_size is None:
+        max_size = 0.25 * min(reserves_a[0], reserves_b[0])
+    sizes = size_grid(max_size, min(1e-4, max_size / n), n)
+    curves = np.vstack([
+        profit_curve(reserves_a, reserves_b, sizes, bridge_fee_bps, gas_usd, slippage_bps),
+        profit_curve(reserves_b, reserves_a, sizes, bridge_fee_bps, gas_usd, slippage_bps),
+    ])
+    direction, idx = np.unravel_index(np.argmax(curves), curves.shape)
+    return {
+        "buy": "a" if direction == 0 else "b",
+        "size_eth": float(sizes[idx]),
+        "net_profit_usd": float(curves[direction, idx]),
+        "sizes": sizes,
+        "profits": curves[direction],
+    }
+
+
+def sandwich_profit_curve(
+    reserves: Reserves,
+    victim_eth: float,
+    sizes: np.ndarray,
+    gas_usd: float = 0.0,
+    victim_min_out_usd: float = 0.0,
+) -> np.ndarray:
+    """Net USD profit of front-running an ETH->USD swap of ``victim_eth`` with ``sizes`` ETH.
+
+    Front-run, victim and back-run go through the same constant-product pool in
+    order; sizes that would push the victim below ``victim_min_out_usd`` (its
+    ``amountOutMin``) revert the victim and are rejected.
+    """
+    eth, usd, fee = reserves
+    keep = 1 - fee
+    with np.errstate(divide="ignore", invalid="ignore"):
+        front_usd = usd * sizes * keep / (eth + sizes * keep)
+        eth1, usd1 = eth + sizes, usd - front_usd
+        victim_usd = usd1 * victim_eth * keep / (eth1 + victim_eth * keep)
+        eth2, usd2 = eth1 + victim_eth, usd1 - victim_usd
+        back_eth = eth2 * front_usd * keep / (usd2 + front_usd * keep)
+        profit = (back_eth - sizes) * (usd / eth) - gas_usd
+    return np.where(victim_usd >= victim_min_out_usd, profit, -np.inf)
+
+
+def optimal_sandwich(
+    reserves: Reserves,
+    victim_eth: float,
+    max_size: Optional[float] = None,
+    n: int = 1024,
+    gas_usd: float = 0.0,
+    victim_min_out_usd: float = 0.0,
+) -> Dict[str, Any]:
+    """Best front-run size for one pending swap, over a size grid like ``optimal_trade_size``."""
+    if max_size is None:
+        max_size = 0.25 * reserves[0]
+    sizes = size_grid(max_size, min(1e-4, max_size / n), n)
+    profits = sandwich_profit_curve(reserves, victim_eth, sizes, gas_usd, victim_min_out_usd)
+    idx = int(np.argmax(profits))
+    return {"size_eth": float(sizes[idx]), "net_profit_usd": float(profits[idx])}
+
+
+def detect_pair_opportunity(state: Any, pair: Tuple[int, int], params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Detection-pool worker task: size the arb between two rows of a ``SharedPoolState``."""
+    a, b = pair
+    res_a, res_b = state.read(a), state.read(b)
+    if not res_a[0] or not res_b[0]:
+        return None
+    best = optimal_trade_size(
+        res_a, res_b,
+        max_size=params.get("max_size"),
+        n=params.get("grid_size", 4096),
+        bridge_fee_bps=params.get("bridge_fee_bps", 8),
+        gas_usd=state.gas_usd,
+        slippage_bps=params.get("slippage_bps", 20),
+    )
+    if best["net_profit_usd"] <= params.get("min_profit_usd", 0.0):
+        return None
+    buy_a = best["buy"] == "a"
+    return {
+        "pair": (a, b),
+        "buy": a if buy_a else b,
+        "sell": b if buy_a else a,
+        "size_eth": best["size_eth"],
+        "net_profit_usd": best["net_profit_usd"],
+        "price_a": mid_price(res_a),
+        "price_b": mid_price(res_b),
+    }
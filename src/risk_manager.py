@@ -2,6 +2,7 @@ import logging
 from typing import Dict
 
 from .kill_switch import KillSwitch
+from .risk_window import Drawdown
 
 
 class RiskManager:
@@ -13,6 +14,8 @@ class RiskManager:
         self.max_loss_usd = config.get("risk", {}).get("max_loss_usd", 200)
         self.max_trade_size_usd = config.get("trade_amount_usd", 100)
         self.current_drawdown = 0
+        # Percentage drawdown needs a capital base; without one only the USD limit applies
+        self.drawdown = Drawdown(float(config.get("starting_capital") or 0.0))
 
     def check_trade(self, trade_size_usd: float) -> float:
         if self.kill_switch.state >= KillSwitch.PAUSE:
@@ -27,9 +30,12 @@ class RiskManager:
         return trade_size_usd
 
     def update_drawdown(self, pnl: float) -> bool:
+        """Track peak-to-trough equity drawdown; breach on ``max_loss_usd`` or ``max_drawdown_pct``."""
         self.current_drawdown += pnl
-        if abs(self.current_drawdown) > self.max_loss_usd:
-            logging.critical("[RiskManager] Max drawdown breached!")
+        drawdown_usd = self.drawdown.update(pnl)
+        if drawdown_usd > self.max_loss_usd or self.drawdown.drawdown_pct > self.max_drawdown_pct:
+            logging.critical(f"[RiskManager] Max drawdown breached! ${drawdown_usd:.2f} "
+                             f"({self.drawdown.drawdown_pct:.2f}%) below peak")
             if hasattr(self.kill_switch, "record_risk_breach"):
                 self.kill_switch.record_risk_breach("drawdown")
             else:  # pragma: no cover - old API fallback
@@ -0,0 +1,155 @@
+"""Constant-time rolling PnL windows and peak-to-trough drawdown."""
+
+import math
+from array import array
+from typing import Dict, Optional
+
+WINDOW_SPANS = {"1m": 60.0, "1h": 3600.0, "24h": 86400.0}
+DEFAULT_TRADES_PER_MIN = 10.0
+
+
+def window_specs(trades_per_min: float = DEFAULT_TRADES_PER_MIN, spans: Optional[Dict[str, float]] = None,
+                 min_capacity: int = 64) -> Dict[str, tuple]:
+    """(span, capacity) per window, each ring sized to hold ``trades_per_min`` over its whole span.
+
+    Every entry costs 32 bytes, so the 24h ring at 10 trades/min is about 460 KB.
+    """
+    return {name: (span, max(min_capacity, math.ceil(span / 60.0 * trades_per_min)))
+            for name, span in (spans or WINDOW_SPANS).items()}
+
+
+DEFAULT_WINDOWS = window_specs()
+
+
+class RollingWindow:
+    """Sum, count, min and max of the values added in the last ``span`` seconds.
+
+    Entries live in preallocated ring buffers; the sum is maintained on
+    insert/expiry and min/max come from monotonic deques (also rings of entry
+    sequence numbers), so ``add`` is amortised O(1) and allocates nothing per
+    trade. If more than ``capacity`` entries fall inside the span, the oldest
+    are dropped early.
+    """
+
+    def __init__(self, span: float, capacity: int = 4096):
+        self.span = span
+        self.capacity = capacity
+        self._ts = array("d", bytes(8 * capacity))
+        self._val = array("d", bytes(8 * capacity))
+        self._min_q = array("q", bytes(8 * capacity))
+        self._max_q = array("q", bytes(8 * capacity))
+        self._head = self._tail = 0  # entry sequence numbers: oldest live, next free
+        self._min_head = self._min_tail = 0
+        self._max_head = self._max_tail = 0
+        self.sum = 0.0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def _evict(self) -> None:
+        seq = self._head
+        self.sum -= self._val[seq % self.capacity]
+        self._head += 1
+        if self._min_tail > self._min_head and self._min_q[self._min_head % self.capacity] == seq:
+            self._min_head += 1
+        if self._max_tail > self._max_head and self._max_q[self._max_head % self.capacity] == seq:
+            self._max_head += 1
+        if self._head == self._tail:
+            self.sum = 0.0  # shed accumulated rounding error whenever the window empties
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.span
+        cap = self.capacity
+        while self._head < self._tail and self._ts[self._head % cap] <= cutoff:
+            self._evict()
+
+    def add(self, now: float, value: float) -> None:
+        self.expire(now)
+        if self._tail - self._head == self.capacity:
+            self._evict()
+        cap = self.capacity
+        seq = self._tail
+        self._ts[seq % cap] = now
+        self._val[seq % cap] = value
+        self.sum += value
+        val, min_q, max_q = self._val, self._min_q, self._max_q
+        while self._min_tail > self._min_head and val[min_q[(self._min_tail - 1) % cap] % cap] >= value:
+            self._min_tail -= 1
+        min_q[self._min_tail % cap] = seq
+        self._min_tail += 1
+        while self._max_tail > self._max_head and val[max_q[(self._max_tail - 1) % cap] % cap] <= value:
+            self._max_tail -= 1
+        max_q[self._max_tail % cap] = seq
+        self._max_tail += 1
+        self._tail += 1
+
+    @property
+    def min(self) -> float:
+        if self._min_tail == self._min_head:
+            return 0.0
+        return self._val[self._min_q[self._min_head % self.capacity] % self.capacity]
+
+    @property
+    def max(self) -> float:
+        if self._max_tail == self._max_head:
+            return 0.0
+        return self._val[self._max_q[self._max_head % self.capacity] % self.capacity]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"sum": self.sum, "count": len(self), "min": self.min, "max": self.max}
+
+
+class RiskWindows:
+    """The 1m / 1h / 24h PnL windows fed by every trade."""
+
+    def __init__(self, windows: Optional[Dict[str, tuple]] = None):
+        self.windows = {name: RollingWindow(span, cap) for name, (span, cap) in (windows or DEFAULT_WINDOWS).items()}
+
+    def __getitem__(self, name: str) -> RollingWindow:
+        return self.windows[name]
+
+    def add(self, now: float, pnl: float) -> None:
+        for window in self.windows.values():
+            window.add(now, pnl)
+
+    def expire(self, now: float) -> None:
+        for window in self.windows.values():
+            window.expire(now)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: window.snapshot() for name, window in self.windows.items()}
+
+
+class Drawdown:
+    """Running equity with true peak-to-trough drawdown.
+
+    ``capital`` is the starting equity used for the percentage; with no
+    capital only the USD drawdown is meaningful.
+    """
+
+    __slots__ = ("capital", "equity", "peak", "max_drawdown_usd")
+
+    def __init__(self, capital: float = 0.0):
+        self.capital = capital
+        self.equity = capital
+        self.peak = capital
+        self.max_drawdown_usd = 0.0
+
+    def update(self, pnl: float) -> float:
+        self.equity += pnl
+        if self.equity > self.peak:
+            self.peak = self.equity
+        drawdown = self.peak - self.equity
+        if drawdown > self.max_drawdown_usd:
+            self.max_drawdown_usd = drawdown
+        return drawdown
+
+    @property
+    def drawdown_usd(self) -> float:
+        return self.peak - self.equity
+
+    @property
+    def drawdown_pct(self) -> float:
+        if self.capital <= 0 or self.peak <= 0:
+            return 0.0
+        return 100.0 * (self.peak - self.equity) / self.peak
@@ -1,9 +1,15 @@
 import logging
+from typing import Optional
 from web3 import Web3
+from src.services.chain_cache import BlockCache
 
-def is_honeypot_or_scam(web3: Web3, token_address: str) -> bool:
+def is_honeypot_or_scam(web3: Web3, token_address: str, cache: Optional[BlockCache] = None) -> bool:
     try:
-        code = web3.eth.get_code(token_address)
+        if cache is not None:
+            # Bytecode never changes, so each token is fetched once per process
+            code = cache.get_or_fetch(("code", token_address.lower()), lambda: web3.eth.get_code(token_address), immutable=True)
+        else:
+            code = web3.eth.get_code(token_address)
         # If bytecode is minimal or matches known scam patterns, abort
         if len(code) < 40:
             logging.warning(f"[SAFETY] Contract {token_address} is a likely honeypot (tiny code).")
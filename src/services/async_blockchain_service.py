@@ -0,0 +1,282 @@
+# src/services/async_blockchain_service.py
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+from web3 import Web3
+# Private web3 module: requirements.txt pins web3 exactly, re-check this import when bumping it
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+from web3.datastructures import AttributeDict
+
+from ..core.config_manager import rpc_endpoints
+from ..core.metrics import REGISTRY, RPC_LATENCY
+
+logger = logging.getLogger(__name__)
+
+_TX_INT_FIELDS = ("value", "gas", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas", "nonce", "chainId")
+
+
+class RPCError(Exception):
+    """Error object returned by the node for a single JSON-RPC request."""
+
+    def __init__(self, method: str, error: Dict[str, Any]):
+        self.method = method
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{method}: {error.get('message', error)}")
+
+
+class JsonRpcBatcher:
+    """Coalesces requests issued in the same event-loop tick into one JSON-RPC batch.
+
+    Every ``request`` call queues a future; the first call in a tick schedules a
+    flush with ``loop.call_soon`` so all coroutines that reach the batcher before
+    the loop comes around again share a single HTTP POST on a keep-alive session.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_batch_size: int = 100,
+        pool_size: int = 16,
+        timeout: float = 10.0,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        self.url = url
+        self.max_batch_size = max_batch_size
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = session
+        self._owns_session = session is None
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[str, list, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._sends: Set[asyncio.Task] = set()  # strong refs: the loop only keeps weak ones to tasks
+        self.batches_sent = 0
+        self.requests_sent = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._owns_session = True
+        return self._session
+
+    async def request(self, method: str, params: Optional[list] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((method, list(params or []), fut))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        for i in range(0, len(pending), self.max_batch_size):
+            task = asyncio.ensure_future(self._send(pending[i:i + self.max_batch_size]))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: List[Tuple[str, list, asyncio.Future]]) -> None:
+        by_id: Dict[int, Tuple[str, asyncio.Future]] = {}
+        payload = []
+        for method, params, fut in batch:
+            if fut.done():  # caller was cancelled before the flush
+                continue
+            req_id = next(self._ids)
+            by_id[req_id] = (method, fut)
+            payload.append({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+        if not payload:
+            return
+        body: Any = payload if len(payload) > 1 else payload[0]
+        try:
+            async with self._get_session().post(self.url, json=body) as resp:
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+        except asyncio.CancelledError:
+            for _, fut in by_id.values():
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in by_id.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.batches_sent += 1
+        self.requests_sent += len(payload)
+        responses = data if isinstance(data, list) else [data]
+        for item in responses:
+            method, fut = by_id.pop(item.get("id"), (None, None))
+            if fut is None or fut.done():
+                continue
+            if item.get("error") is not None:
+                fut.set_exception(RPCError(method, item["error"]))
+            else:
+                fut.set_result(item.get("result"))
+        for method, fut in by_id.values():
+            if not fut.done():
+                fut.set_exception(RPCError(method, {"message": "missing response in batch"}))
+
+    async def close(self) -> None:
+        for task in self._sends:
+            task.cancel()
+        await asyncio.gather(*self._sends, return_exceptions=True)
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+
+
+def _hex(value: Any) -> str:
+    return value if isinstance(value, str) else Web3.to_hex(value)
+
+
+def _block_param(block_identifier: Any) -> Any:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
+def _format_transaction(transaction: Dict[str, Any]) -> Dict[str, Any]:
+    formatted = {}
+    for key, value in transaction.items():
+        if key in _TX_INT_FIELDS and isinstance(value, int):
+            formatted[key] = hex(value)
+        elif isinstance(value, (bytes, bytearray)):
+            formatted[key] = Web3.to_hex(value)
+        else:
+            formatted[key] = value
+    return formatted
+
+
+def _format_result(method: str, result: Any) -> Any:
+    if result is None:
+        return None
+    formatter = PYTHONIC_RESULT_FORMATTERS.get(method)
+    if formatter is not None:
+        result = formatter(result)
+    if isinstance(result, dict):
+        return AttributeDict.recursive(result)
+    return result
+
+
+class AsyncBlockchainService:
+    """asyncio counterpart of ``BlockchainService`` with batched, pooled HTTP reads.
+
+    Method names and arguments mirror the synchronous service; each read is a
+    coroutine, and reads awaited concurrently (e.g. via ``asyncio.gather``) are
+    sent to the node as one JSON-RPC batch. When several endpoints are configured
+    for the network, requests go through an ``RpcRouter`` instead of a single
+    batcher. ``network`` overrides ``config.network`` for services talking to a
+    second chain.
+    """
+
+    def __init__(
+        self,
+        config,
+        max_batch_size: int = 100,
+        pool_size: int = 16,
+        timeout: float = 10.0,
+        hedge_after: Optional[float] = 0.15,
+        network: Optional[str] = None,
+    ):
+        self.network = network or (config["network"] if isinstance(config, dict) else config.network)
+        self.rpc_urls = rpc_endpoints(config, self.network)
+
+        if not self.rpc_urls:
+            raise ValueError(f"No HTTP RPC URL configured for network: {self.network}")
+        self.rpc_url = self.rpc_urls[0]
+
+        batcher_kwargs = dict(max_batch_size=max_batch_size, pool_size=pool_size, timeout=timeout)
+        if len(self.rpc_urls) > 1:
+            from .rpc_router import RpcRouter
+
+            self.transport = RpcRouter(self.rpc_urls, hedge_after=hedge_after, **batcher_kwargs)
+        else:
+            self.transport = JsonRpcBatcher(self.rpc_url, **batcher_kwargs)
+        logger.info(f"[AsyncBlockchainService] Initialized for network: {self.network} ({len(self.rpc_urls)} endpoint(s))")
+
+    async def request(self, method: str, params: Optional[list] = None) -> Any:
+        """Raw JSON-RPC call through the batching transport, result formatted like web3."""
+        with REGISTRY.timer(RPC_LATENCY, method=method):
+            result = await self.transport.request(method, params)
+        return _format_result(method, result)
+
+    def endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = getattr(self.transport, "stats", None)
+        return stats() if stats else {}
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+    # --- Read-only operations (via HTTP) ---
+
+    async def get_current_block_number(self) -> Optional[int]:
+        try:
+            return await self.request("eth_blockNumber")
+        except Exception as e:
+            logger.error(f"[get_current_block_number] Error: {e}")
+            return None
+
+    async def get_balance(self, address: str, block_identifier: Any = "latest") -> Optional[int]:
+        try:
+            return await self.request("eth_getBalance", [address, _block_param(block_identifier)])
+        except Exception as e:
+            logger.error(f"[get_balance] Error for {address}: {e}")
+            return None
+
+    async def get_block(self, block_identifier: Any, full_transactions: bool = False) -> Optional[Dict[str, Any]]:
+        try:
+            if isinstance(block_identifier, (bytes, bytearray)) or (
+                isinstance(block_identifier, str) and len(block_identifier) == 66
+            ):
+                return await self.request("eth_getBlockByHash", [_hex(block_identifier), full_transactions])
+            return await self.request("eth_getBlockByNumber", [_block_param(block_identifier), full_transactions])
+        except Exception as e:
+            logger.error(f"[get_block] Error for {block_identifier}: {e}")
+            return None
+
+    async def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.request("eth_getTransactionByHash", [_hex(tx_hash)])
+        except Exception as e:
+            logger.error(f"[get_transaction] Error: {e}")
+            return None
+
+    async def get_transaction_receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.request("eth_getTransactionReceipt", [_hex(tx_hash)])
+        except Exception as e:
+            logger.error(f"[get_transaction_receipt] Error: {e}")
+            return None
+
+    async def get_chain_id(self) -> Optional[int]:
+        try:
+            return await self.request("eth_chainId")
+        except Exception as e:
+            logger.error(f"[get_chain_id] Error: {e}")
+            return None
+
+    async def get_gas_price(self) -> Optional[int]:
+        try:
+            return await self.request("eth_gasPrice")
+        except Exception as e:
+            logger.error(f"[get_gas_price] Error: {e}")
+            return None
+
+    async def eth_call(self, transaction: Dict[str, Any], block_identifier: Any = "latest") -> Optional[bytes]:
+        try:
+            return await self.request("eth_call", [_format_transaction(transaction), _block_param(block_identifier)])
+        except Exception as e:
+            logger.error(f"[eth_call] Error: {e}")
+            return None
+
+    async def estimate_gas(self, transaction: Dict[str, Any], block_identifier: Any = "latest") -> Optional[int]:
+        try:
+            return await self.request("eth_estimateGas", [_format_transaction(transaction), _block_param(block_identifier)])
+        except Exception as e:
+            logger.error(f"[estimate_gas] Error: {e}")
+            return None
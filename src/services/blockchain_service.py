@@ -1,28 +1,45 @@
 # src/services/blockchain_service.py
 
+import asyncio
+import json
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import websockets
 from tenacity import retry, wait_random_exponential, stop_after_attempt
 from web3 import Web3
 from web3.providers.rpc import HTTPProvider
 from web3.providers.websocket import WebsocketProvider
-from web3.contract import ContractEvent
+from web3.contract.contract import ContractEvent
 from web3._utils.filters import LogFilter
 
+from ..core.config_manager import rpc_endpoints
+from ..core.metrics import rpc_timer_middleware
+from .chain_cache import BlockCache
+
 logger = logging.getLogger(__name__)
 
 
+def _http_web3(url: str) -> Web3:
+    w3 = Web3(HTTPProvider(url))
+    # Per-method RPC latency; cache hits never reach the provider and are not counted
+    w3.middleware_onion.add(rpc_timer_middleware, "rpc_timer")
+    return w3
+
+
 class BlockchainService:
     def __init__(self, config):
         self.network = config.network
-        self.rpc_url = config.rpc_urls.root.get(self.network)
+        self.rpc_urls = rpc_endpoints(config, self.network)
         self.wss_url = config.wss_urls.root.get(self.network)
 
-        if not self.rpc_url:
+        if not self.rpc_urls:
             raise ValueError(f"No HTTP RPC URL configured for network: {self.network}")
+        self.rpc_url = self.rpc_urls[0]
 
-        self.http_web3 = Web3(HTTPProvider(self.rpc_url))
+        self.http_web3 = _http_web3(self.rpc_url)
         self.wss_web3 = Web3(WebsocketProvider(self.wss_url)) if self.wss_url else None
+        self.cache = BlockCache()
 
         logger.info(f"[BlockchainService] Initialized for network: {self.network}")
         logger.info(f"HTTP RPC: {self.rpc_url}")
@@ -35,11 +52,19 @@ class BlockchainService:
         return self.wss_web3.is_connected() if self.wss_web3 else False
 
     def get_http_web3(self) -> Web3:
-        if not self.is_http_connected():
-            logger.warning("[BlockchainService] HTTP disconnected, reconnecting...")
-            self.http_web3 = Web3(HTTPProvider(self.rpc_url))
+        # No is_connected() probe here: it would cost an extra round trip per call.
+        # Transport failures rotate the endpoint after the fact (_on_http_error)
         return self.http_web3
 
+    def _on_http_error(self, error: Exception) -> None:
+        """Rotate to the next configured endpoint (primary -> fallback -> ...) after a transport failure."""
+        if not isinstance(error, OSError):  # requests' ConnectionError/Timeout are OSErrors; node errors are not
+            return
+        idx = self.rpc_urls.index(self.rpc_url)
+        self.rpc_url = self.rpc_urls[(idx + 1) % len(self.rpc_urls)]
+        logger.warning(f"[BlockchainService] HTTP request failed ({error}), reconnecting to {self.rpc_url}...")
+        self.http_web3 = _http_web3(self.rpc_url)
+
     def get_wss_web3(self) -> Optional[Web3]:
         if self.wss_web3 and not self.is_wss_connected():
             logger.warning("[BlockchainService] WSS disconnected, reconnecting...")
@@ -52,6 +77,7 @@ class BlockchainService:
         try:
             return self.get_http_web3().eth.block_number
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_current_block_number] Error: {e}")
             return None
 
@@ -59,6 +85,7 @@ class BlockchainService:
         try:
             return self.get_http_web3().eth.get_balance(address, block_identifier)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_balance] Error for {address}: {e}")
             return None
 
@@ -66,6 +93,7 @@ class BlockchainService:
         try:
             return self.get_http_web3().eth.get_block(block_identifier, full_transactions)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_block] Error for {block_identifier}: {e}")
             return None
 
@@ -73,6 +101,7 @@ class BlockchainService:
         try:
             return self.get_http_web3().eth.get_transaction(tx_hash)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_transaction] Error: {e}")
             return None
 
@@ -80,37 +109,65 @@ class BlockchainService:
         try:
             return self.get_http_web3().eth.get_transaction_receipt(tx_hash)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_transaction_receipt] Error: {e}")
             return None
 
     def get_chain_id(self) -> Optional[int]:
         try:
-            return self.get_http_web3().eth.chain_id
+            return self.cache.get_or_fetch("chain_id", lambda: self.get_http_web3().eth.chain_id, immutable=True)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_chain_id] Error: {e}")
             return None
 
     def get_gas_price(self) -> Optional[int]:
         try:
-            return self.get_http_web3().eth.gas_price
+            return self.cache.get_or_fetch("gas_price", lambda: self.get_http_web3().eth.gas_price)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[get_gas_price] Error: {e}")
             return None
 
+    def get_code(self, address: str) -> Optional[bytes]:
+        try:
+            return self.cache.get_or_fetch(
+                ("code", address.lower()), lambda: self.get_http_web3().eth.get_code(address), immutable=True
+            )
+        except Exception as e:
+            self._on_http_error(e)
+            logger.error(f"[get_code] Error for {address}: {e}")
+            return None
+
+    def get_transaction_count(self, address: str, block_identifier: Any = "latest") -> Optional[int]:
+        # Never cached: NonceManager owns local nonce state and resyncs from here after gaps
+        try:
+            return self.get_http_web3().eth.get_transaction_count(address, block_identifier)
+        except Exception as e:
+            self._on_http_error(e)
+            logger.error(f"[get_transaction_count] Error for {address}: {e}")
+            return None
+
     def eth_call(self, transaction: Dict[str, Any], block_identifier: Any = "latest") -> Optional[bytes]:
         try:
             return self.get_http_web3().eth.call(transaction, block_identifier=block_identifier)
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[eth_call] Error: {e}")
             return None
 
     # --- Event Subscription (WSS) ---
 
     def subscribe_to_new_blocks(self, callback: Callable[[Dict[str, Any]], None]) -> Optional[Any]:
+        def on_head(header: Dict[str, Any]) -> None:
+            # Invalidate block-scoped reads before anyone reacts to the new head
+            self.cache.on_new_head(header)
+            callback(header)
+
         try:
             w3 = self.get_wss_web3()
             if w3:
-                sub = w3.eth.subscribe("newHeads", callback=callback)
+                sub = w3.eth.subscribe("newHeads", callback=on_head)
                 logger.info("[subscribe_to_new_blocks] Subscribed to new blocks.")
                 return sub
         except Exception as e:
@@ -128,6 +185,69 @@ class BlockchainService:
             logger.error(f"[subscribe_to_pending_transactions] Error: {e}")
         return None
 
+    async def stream_subscriptions(
+        self, subscriptions: Dict[str, List[Any]], reconnect_delay: float = 1.0
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ``(name, result)`` for several ``eth_subscribe`` streams sharing one websocket.
+
+        ``subscriptions`` maps a caller-chosen name to ``eth_subscribe`` params,
+        e.g. ``{"heads": ["newHeads"], "pending": ["newPendingTransactions", True]}``.
+        Payloads are passed through undecoded (hex strings) so consumers can
+        filter before paying for any formatting. The socket is re-opened and
+        every subscription re-issued whenever the connection drops. A
+        subscription the node rejects is logged and dropped; the others keep
+        streaming on the same socket.
+        """
+        if not self.wss_url:
+            raise ValueError(f"No WSS URL configured for network: {self.network}")
+        active = dict(subscriptions)
+        while active:
+            try:
+                async with websockets.connect(self.wss_url, max_size=None, ping_interval=20) as ws:
+                    requests = list(active.items())
+                    for req_id, (_, params) in enumerate(requests, start=1):
+                        await ws.send(json.dumps({"jsonrpc": "2.0", "id": req_id, "method": "eth_subscribe", "params": params}))
+                    by_sub_id: Dict[str, str] = {}
+                    async for message in ws:
+                        msg = json.loads(message)
+                        if msg.get("method") == "eth_subscription":
+                            name = by_sub_id.get(msg["params"]["subscription"])
+                            if name is not None:
+                                yield name, msg["params"]["result"]
+                        elif isinstance(msg.get("id"), int) and 0 < msg["id"] <= len(requests):
+                            name, params = requests[msg["id"] - 1]
+                            if msg.get("error"):
+                                logger.error(f"[stream_subscriptions] {self.network} rejected eth_subscribe "
+                                             f"{params[0]} ({name}): {msg['error']}; dropping it")
+                                active.pop(name, None)
+                                if not active:
+                                    return
+                                continue
+                            by_sub_id[msg["result"]] = name
+                            logger.info(f"[stream_subscriptions] Subscribed to {params[0]} as {name} ({msg['result']})")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[stream_subscriptions] {self.network} connection lost: {e}; reconnecting")
+                await asyncio.sleep(reconnect_delay)
+
+    async def stream_subscription(self, params: List[Any], reconnect_delay: float = 1.0) -> AsyncIterator[Any]:
+        """Yield raw ``eth_subscription`` results for a single subscription."""
+        async for _, result in self.stream_subscriptions({params[0]: params}, reconnect_delay):
+            yield result
+
+    def stream_pending_transactions(self, full_transactions: bool = True) -> AsyncIterator[Any]:
+        """Pending transactions as they hit the node's mempool.
+
+        With ``full_transactions`` the node pushes whole transaction objects
+        (``newPendingTransactions`` with the ``true`` flag), so no per-hash
+        ``eth_getTransactionByHash`` round trip is needed.
+        """
+        params: List[Any] = ["newPendingTransactions"]
+        if full_transactions:
+            params.append(True)
+        return self.stream_subscription(params)
+
     def create_contract_event_filter(
         self,
         contract_address: str,
@@ -146,6 +266,7 @@ class BlockchainService:
                 argument_filters=argument_filters or {}
             )
         except Exception as e:
+            self._on_http_error(e)
             logger.error(f"[create_contract_event_filter] Error: {e}")
             return None
 
@@ -0,0 +1,102 @@
+# src/services/bridge.py
+
+import asyncio
+import itertools
+import logging
+import os
+from decimal import Decimal
+from typing import Dict, Optional, Set, Tuple
+
+from ..core.clock import RealClock
+
+logger = logging.getLogger(__name__)
+
+
+class BridgeError(Exception):
+    pass
+
+
+class BridgeTransfer:
+    """Handle for one in-flight cross-chain transfer."""
+
+    def __init__(self, transfer_id: int, amount: Decimal, net: Decimal, fee: Decimal, started_at: float, eta: float):
+        self.transfer_id = transfer_id
+        self.amount = amount
+        self.net = net
+        self.fee = fee
+        self.started_at = started_at
+        self.eta = eta
+        self._future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    @property
+    def status(self) -> str:
+        if not self._future.done():
+            return "pending"
+        return "failed" if self._future.exception() is not None else "settled"
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    async def wait(self) -> Tuple[float, float]:
+        """Wait for settlement; returns ``(net_amount, fee)`` or raises ``BridgeError``."""
+        return await asyncio.shield(self._future)
+
+
+class SimulatedBridge:
+    """Simulates cross-chain transfer. Replace with real integration for prod.
+
+    ``start_transfer`` returns immediately with a ``BridgeTransfer``; settlement
+    happens on ``clock``, so many transfers can be in flight at once and a
+    ``SimClock`` makes the 10-25s delays elapse instantly.
+    """
+
+    def __init__(self, fee_bps=8, min_delay=10, max_delay=25, fail_rate=0.0, clock=None):
+        self.fee_bps = fee_bps
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.fail_rate = fail_rate
+        self.clock = clock or RealClock()
+        self.in_flight: Dict[int, BridgeTransfer] = {}
+        self._settlements: Set[asyncio.Task] = set()
+        self._ids = itertools.count(1)
+
+    def quote(self, amount_eth) -> Tuple[Decimal, Decimal]:
+        fee = Decimal(amount_eth) * Decimal(self.fee_bps) / 10000
+        return Decimal(amount_eth) - fee, fee
+
+    def start_transfer(self, amount_eth) -> BridgeTransfer:
+        net, fee = self.quote(amount_eth)
+        delay = self.min_delay + int((self.max_delay - self.min_delay) * int.from_bytes(os.urandom(1), "big") / 255)
+        now = self.clock.time()
+        transfer = BridgeTransfer(next(self._ids), Decimal(amount_eth), net, fee, now, now + delay)
+        self.in_flight[transfer.transfer_id] = transfer
+        logger.info(f"[SimulatedBridge] #{transfer.transfer_id} bridging {amount_eth} ETH → {net} ETH, ETA {delay}s, {self.fee_bps}bps fee.")
+        task = asyncio.ensure_future(self._settle(transfer, delay))
+        self._settlements.add(task)
+        task.add_done_callback(self._settlements.discard)
+        return transfer
+
+    async def _settle(self, transfer: BridgeTransfer, delay: float) -> None:
+        try:
+            await self.clock.sleep(delay)
+            if self.fail_rate and int.from_bytes(os.urandom(2), "big") / 65536 < self.fail_rate:
+                transfer._future.set_exception(BridgeError(f"transfer #{transfer.transfer_id} failed"))
+            else:
+                transfer._future.set_result((float(transfer.net), float(transfer.fee)))
+        finally:
+            self.in_flight.pop(transfer.transfer_id, None)
+
+    async def bridge(self, amount_eth) -> Tuple[float, float]:
+        """Start a transfer and wait for it to settle."""
+        return await self.start_transfer(amount_eth).wait()
+
+    async def close(self) -> None:
+        """Stop settling; transfers still in flight fail with ``BridgeError``."""
+        for task in self._settlements:
+            task.cancel()
+        await asyncio.gather(*self._settlements, return_exceptions=True)
+        # A settlement cancelled before its first step never ran its finally block
+        for transfer in self.in_flight.values():
+            if not transfer.done():
+                transfer._future.set_exception(BridgeError(f"transfer #{transfer.transfer_id} abandoned: bridge closed"))
+        self.in_flight.clear()
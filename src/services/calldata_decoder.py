@@ -0,0 +1,335 @@
+# src/services/calldata_decoder.py
+
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+Calldata = Union[bytes, bytearray, memoryview, str]
+
+# Arbitrum Inbox: retryable tickets carry the L2 call in ``data``
+ARBITRUM_INBOX_ABI = [
+    "createRetryableTicket(address to,uint256 l2CallValue,uint256 maxSubmissionCost,address excessFeeRefundAddress,"
+    "address callValueRefundAddress,uint256 gasLimit,uint256 maxFeePerGas,bytes data)",
+    "unsafeCreateRetryableTicket(address to,uint256 l2CallValue,uint256 maxSubmissionCost,address excessFeeRefundAddress,"
+    "address callValueRefundAddress,uint256 gasLimit,uint256 maxFeePerGas,bytes data)",
+    "sendL2Message(bytes messageData)",
+    "sendUnsignedTransaction(uint256 gasLimit,uint256 maxFeePerGas,uint256 nonce,address to,uint256 value,bytes data)",
+]
+
+UNISWAP_V2_ROUTER_ABI = [
+    "swapExactETHForTokens(uint256 amountOutMin,address[] path,address to,uint256 deadline)",
+    "swapETHForExactTokens(uint256 amountOut,address[] path,address to,uint256 deadline)",
+    "swapExactTokensForTokens(uint256 amountIn,uint256 amountOutMin,address[] path,address to,uint256 deadline)",
+    "swapTokensForExactTokens(uint256 amountOut,uint256 amountInMax,address[] path,address to,uint256 deadline)",
+    "swapExactTokensForETH(uint256 amountIn,uint256 amountOutMin,address[] path,address to,uint256 deadline)",
+    "swapTokensForExactETH(uint256 amountOut,uint256 amountInMax,address[] path,address to,uint256 deadline)",
+]
+
+UNISWAP_V3_ROUTER_ABI = [
+    "exactInputSingle((address tokenIn,address tokenOut,uint24 fee,address recipient,uint256 deadline,"
+    "uint256 amountIn,uint256 amountOutMinimum,uint160 sqrtPriceLimitX96) params)",
+    "exactOutputSingle((address tokenIn,address tokenOut,uint24 fee,address recipient,uint256 deadline,"
+    "uint256 amountOut,uint256 amountInMaximum,uint160 sqrtPriceLimitX96) params)",
+    "multicall(bytes[] data)",
+    "multicall(uint256 deadline,bytes[] data)",
+]
+
+# bytes / bytes[] args holding calldata for another contract. sendL2Message's ``messageData`` is
+# deliberately absent: it is an Arbitrum L2 message (a kind byte, then an RLP or packed tx), not ABI calldata
+_NESTED_ARGS = ("data",)
+_SIGNATURE = re.compile(r"^\s*(\w+)\s*\((.*)\)\s*$")
+
+
+def to_bytes(data: Calldata) -> bytes:
+    """Raw calldata bytes; hex strings (as pushed by WSS nodes) are converted exactly once."""
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data[:2] in ("0x", "0X") else data)
+    return bytes(data)
+
+
+def selector_of(value: Union[str, bytes]) -> bytes:
+    """4-byte selector from ``0x``-hex, raw bytes or a text signature like ``transfer(address,uint256)``."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value[:4])
+    if "(" in value:
+        return bytes(Web3.keccak(text=value)[:4])
+    return to_bytes(value)[:4]
+
+
+def _split_top_level(params: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(params):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(params[start:i].strip())
+            start = i + 1
+    tail = params[start:].strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def _split_param(param: str) -> Tuple[str, str]:
+    if param.startswith("("):
+        close = param.rindex(")")
+        return param[:close + 1], param[close + 1:].strip()
+    typ, _, name = param.partition(" ")
+    return typ, name.strip()
+
+
+# --- word readers: (calldata, absolute offset of the head word) -> value ---
+
+def _read_uint(data: bytes, pos: int) -> int:
+    return int.from_bytes(data[pos:pos + 32], "big")
+
+
+def _read_int(data: bytes, pos: int) -> int:
+    return int.from_bytes(data[pos:pos + 32], "big", signed=True)
+
+
+def _read_address(data: bytes, pos: int) -> str:
+    return "0x" + data[pos + 12:pos + 32].hex()
+
+
+def _read_bool(data: bytes, pos: int) -> bool:
+    return data[pos + 31] != 0
+
+
+def _fixed_bytes_reader(size: int) -> Callable[[bytes, int], bytes]:
+    return lambda data, pos: data[pos:pos + size]
+
+
+def _static_reader(typ: str) -> Optional[Callable[[bytes, int], Any]]:
+    if typ.startswith("uint"):
+        return _read_uint
+    if typ.startswith("int"):
+        return _read_int
+    if typ == "address":
+        return _read_address
+    if typ == "bool":
+        return _read_bool
+    if typ.startswith("bytes") and typ[5:].isdigit():
+        return _fixed_bytes_reader(int(typ[5:]))
+    return None
+
+
+def _tail(data: bytes, base: int, pos: int) -> Tuple[int, int]:
+    """(start, length) of a dynamic value whose offset word is at ``pos``, relative to ``base``."""
+    start = base + _read_uint(data, pos)
+    if start + 32 > len(data):
+        raise ValueError("dynamic offset out of range")
+    length = _read_uint(data, start)
+    start += 32
+    return start, length
+
+
+def _dynamic_reader(typ: str) -> Callable[[bytes, int, int], Any]:
+    if typ == "bytes":
+        def read(data, base, pos):
+            start, length = _tail(data, base, pos)
+            if start + length > len(data):
+                raise ValueError("bytes length out of range")
+            return data[start:start + length]
+        return read
+    if typ == "string":
+        def read(data, base, pos):
+            start, length = _tail(data, base, pos)
+            if start + length > len(data):
+                raise ValueError("string length out of range")
+            return data[start:start + length].decode("utf-8", "replace")
+        return read
+    if typ == "bytes[]":
+        def read(data, base, pos):
+            start, count = _tail(data, base, pos)
+            if start + 32 * count > len(data):
+                raise ValueError("array length out of range")
+            items = []
+            for i in range(count):
+                item_start, length = _tail(data, start, start + 32 * i)
+                if item_start + length > len(data):
+                    raise ValueError("bytes length out of range")
+                items.append(data[item_start:item_start + length])
+            return items
+        return read
+    if typ.endswith("[]"):
+        element = _static_reader(typ[:-2])
+        if element is None:
+            raise ValueError(f"Unsupported array element type: {typ}")
+
+        def read(data, base, pos):
+            start, count = _tail(data, base, pos)
+            if start + 32 * count > len(data):
+                raise ValueError("array length out of range")
+            return [element(data, start + 32 * i) for i in range(count)]
+        return read
+    raise ValueError(f"Unsupported ABI type: {typ}")
+
+
+class DecodedCall:
+    """One decoded function call; ``inner`` holds calls decoded from nested calldata args."""
+
+    __slots__ = ("name", "selector", "args", "inner")
+
+    def __init__(self, name: str, selector: bytes, args: Dict[str, Any], inner: Tuple["DecodedCall", ...] = ()):
+        self.name = name
+        self.selector = selector
+        self.args = args
+        self.inner = inner
+
+    def walk(self) -> Iterator["DecodedCall"]:
+        """This call followed by every nested call, depth first."""
+        yield self
+        for call in self.inner:
+            yield from call.walk()
+
+    def __repr__(self) -> str:
+        return f"DecodedCall({self.name}, args={self.args}, inner={list(self.inner)})"
+
+
+class AbiFunction:
+    """Decoder for one function signature, compiled to per-argument readers.
+
+    Only the arguments named in ``fields`` (all by default) are read; static
+    tuples are flattened into their component names. Dynamic tuples are not
+    supported.
+    """
+
+    def __init__(self, signature: str, fields: Optional[Sequence[str]] = None):
+        match = _SIGNATURE.match(signature)
+        if not match:
+            raise ValueError(f"Bad function signature: {signature}")
+        self.name = match.group(1)
+        canonical, slots = [], []
+        for param in _split_top_level(match.group(2)):
+            typ, arg_name = _split_param(param)
+            if typ.startswith("("):
+                members = [_split_param(p) for p in _split_top_level(typ[1:-1])]
+                canonical.append("(" + ",".join(t for t, _ in members) + ")")
+                slots.extend(members)
+            else:
+                canonical.append(typ)
+                slots.append((typ, arg_name))
+        self.signature = f"{self.name}({','.join(canonical)})"
+        self.selector = selector_of(self.signature)
+        self.head_size = 32 * len(slots)
+
+        wanted = set(fields) if fields is not None else None
+        self._readers: List[Tuple[str, int, bool, Callable]] = []
+        for index, (typ, arg_name) in enumerate(slots):
+            arg_name = arg_name or f"arg{index}"
+            if wanted is not None and arg_name not in wanted:
+                continue
+            static = _static_reader(typ)
+            if static is not None:
+                self._readers.append((arg_name, 4 + 32 * index, False, static))
+            elif typ.startswith("("):
+                raise ValueError(f"Dynamic tuples are not supported: {signature}")
+            else:
+                self._readers.append((arg_name, 4 + 32 * index, True, _dynamic_reader(typ)))
+
+    def decode_args(self, data: bytes) -> Dict[str, Any]:
+        if len(data) < 4 + self.head_size:
+            raise ValueError(f"{self.name}: calldata shorter than head")
+        args = {}
+        for arg_name, pos, dynamic, reader in self._readers:
+            args[arg_name] = reader(data, 4, pos) if dynamic else reader(data, pos)
+        return args
+
+
+class CalldataDecoder:
+    """Selector-indexed ABI decoder for the bridge and router calls the bot watches.
+
+    ``decode`` is a dict lookup on the first four bytes followed by fixed-offset
+    reads of the wanted arguments; unknown selectors return None without
+    touching the rest of the calldata. Arguments named in ``nested`` hold
+    calldata for another contract (bridge deposit payloads, router multicalls)
+    and are decoded recursively into ``DecodedCall.inner``.
+    """
+
+    def __init__(self, max_depth: int = 3):
+        self.max_depth = max_depth
+        self._by_selector: Dict[bytes, Tuple[AbiFunction, Tuple[str, ...]]] = {}
+        self._nested_readers: Dict[bytes, Tuple[int, Tuple[Tuple[int, Callable], ...]]] = {}
+
+    def register(
+        self, signature: str, fields: Optional[Sequence[str]] = None, nested: Sequence[str] = _NESTED_ARGS
+    ) -> AbiFunction:
+        fn = AbiFunction(signature, fields)
+        nested_args = tuple(n for n, *_ in fn._readers if n in nested)
+        self._by_selector[fn.selector] = (fn, nested_args)
+        if nested_args:
+            readers = tuple((pos, reader) for n, pos, _, reader in fn._readers if n in nested_args)
+            self._nested_readers[fn.selector] = (4 + fn.head_size, readers)
+        return fn
+
+    def register_abi(self, signatures: Sequence[str], **kwargs) -> None:
+        for signature in signatures:
+            self.register(signature, **kwargs)
+
+    def __contains__(self, selector: Union[str, bytes]) -> bool:
+        return selector_of(selector) in self._by_selector
+
+    def decode(self, data: Calldata, _depth: int = 0) -> Optional[DecodedCall]:
+        """Decode known calldata; None for unknown selectors or malformed input."""
+        if not isinstance(data, bytes):
+            data = to_bytes(data)
+        entry = self._by_selector.get(data[:4])
+        if entry is None:
+            return None
+        fn, nested_args = entry
+        try:
+            args = fn.decode_args(data)
+        except (ValueError, IndexError) as e:
+            logger.debug(f"[CalldataDecoder] Malformed {fn.name} calldata: {e}")
+            return None
+        inner: Tuple[DecodedCall, ...] = ()
+        if nested_args and _depth < self.max_depth:
+            found = []
+            for arg_name in nested_args:
+                value = args[arg_name]
+                for payload in (value if isinstance(value, list) else (value,)):
+                    call = self.decode(payload, _depth + 1)
+                    if call is not None:
+                        found.append(call)
+            inner = tuple(found)
+        return DecodedCall(fn.name, fn.selector, args, inner)
+
+    def calls_selector(self, data: Calldata, selector: Union[str, bytes]) -> bool:
+        """True if ``data`` or any calldata nested inside it invokes ``selector``."""
+        if not isinstance(data, bytes):
+            data = to_bytes(data)
+        return self._calls(data, selector_of(selector), 0)
+
+    def _calls(self, data: bytes, selector: bytes, depth: int) -> bool:
+        # Hot path for mempool matching: only the nested calldata args are read
+        if data[:4] == selector:
+            return True
+        entry = self._nested_readers.get(data[:4])
+        if entry is None or depth >= self.max_depth:
+            return False
+        min_size, readers = entry
+        if len(data) < min_size:
+            return False
+        try:
+            for pos, reader in readers:
+                value = reader(data, 4, pos)
+                for payload in (value if isinstance(value, list) else (value,)):
+                    if self._calls(payload, selector, depth + 1):
+                        return True
+        except (ValueError, IndexError):
+            return False
+        return False
+
+
+def default_decoder() -> CalldataDecoder:
+    decoder = CalldataDecoder()
+    for abi in (ARBITRUM_INBOX_ABI, UNISWAP_V2_ROUTER_ABI, UNISWAP_V3_ROUTER_ABI):
+        decoder.register_abi(abi)
+    return decoder
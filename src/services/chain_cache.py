@@ -0,0 +1,105 @@
+# src/services/chain_cache.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class BlockCache:
+    """Read cache for chain state, scoped to the current head block.
+
+    Values that can only change between blocks (gas price, reserves,
+    estimates) live in a per-block map that is dropped whenever the
+    head advances; a value fetched while the head moved is not stored, since
+    it may belong to either block. Immutable values (bytecode, chain id) live
+    in a bounded LRU that is never invalidated, except that empty results
+    (``get_code`` of an address with no contract yet) are never cached. Until a head has been seen, or if no head has
+    arrived for ``max_block_age`` seconds, per-block reads bypass the cache so a
+    dead ``newHeads`` feed can never serve stale state.
+    """
+
+    def __init__(self, immutable_size: int = 4096, max_block_age: float = 30.0):
+        self.block_number: Optional[int] = None
+        self.immutable_size = immutable_size
+        self.max_block_age = max_block_age
+        self._block_seen_at = 0.0
+        self._block: Dict[Hashable, Any] = {}
+        self._immutable: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    # --- Invalidation --------------------------------------------------
+
+    def advance(self, block_number: int) -> None:
+        if block_number != self.block_number:
+            self._block.clear()
+            self.block_number = block_number
+        self._block_seen_at = time.monotonic()
+
+    def on_new_head(self, header: Dict[str, Any]) -> None:
+        """``newHeads`` subscription callback."""
+        number = header["number"]
+        self.advance(int(number, 16) if isinstance(number, str) else int(number))
+
+    def _block_is_fresh(self) -> bool:
+        return self.block_number is not None and time.monotonic() - self._block_seen_at <= self.max_block_age
+
+    # --- Lookups -------------------------------------------------------
+
+    def _lookup(self, key: Hashable, immutable: bool):
+        if immutable:
+            if key in self._immutable:
+                self._immutable.move_to_end(key)
+                self.hits += 1
+                return True, self._immutable[key]
+        elif self._block_is_fresh() and key in self._block:
+            self.hits += 1
+            return True, self._block[key]
+        return False, None
+
+    def _store(self, key: Hashable, value: Any, immutable: bool, fetched_at: Optional[int]) -> None:
+        if value is None:
+            return
+        if immutable:
+            if isinstance(value, (bytes, bytearray, str)) and value in (b"", "", "0x"):
+                return  # no code yet: a deployment can still land at this address
+            self._immutable[key] = value
+            if len(self._immutable) > self.immutable_size:
+                self._immutable.popitem(last=False)
+        elif self._block_is_fresh() and fetched_at == self.block_number:
+            self._block[key] = value
+        else:
+            self.bypassed += 1
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], immutable: bool = False) -> Any:
+        found, value = self._lookup(key, immutable)
+        if found:
+            return value
+        self.misses += 1
+        fetched_at = self.block_number  # the head may advance while the fetch is in flight
+        value = fetch()
+        self._store(key, value, immutable, fetched_at)
+        return value
+
+    async def aget_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], immutable: bool = False) -> Any:
+        found, value = self._lookup(key, immutable)
+        if found:
+            return value
+        self.misses += 1
+        fetched_at = self.block_number
+        value = await fetch()
+        self._store(key, value, immutable, fetched_at)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "block_number": self.block_number,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / total if total else 0.0,
+            "block_entries": len(self._block),
+            "immutable_entries": len(self._immutable),
+        }
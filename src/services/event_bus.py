@@ -0,0 +1,267 @@
+# src/services/event_bus.py
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from eth_abi import decode as abi_decode
+from web3 import Web3
+
+from .mempool import FanOut, Handler, PendingTxFilter
+
+logger = logging.getLogger(__name__)
+
+EventAbi = Dict[str, Any]
+
+
+def _as_bytes(value: Union[str, bytes]) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    return bytes(value)
+
+
+def _topic_hex(value: Union[str, bytes]) -> str:
+    return value.lower() if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+class EventDecoder:
+    """Decodes one event ABI entry from raw (hex) logs with ``eth_abi``.
+
+    Indexed dynamic values (``string``, ``bytes``, arrays) only exist as their
+    keccak hash in the topics and are returned as 32 raw bytes.
+    """
+
+    def __init__(self, event_abi: EventAbi):
+        self.name = event_abi["name"]
+        inputs = event_abi.get("inputs", [])
+        signature = f"{self.name}({','.join(i['type'] for i in inputs)})"
+        self.topic0 = Web3.keccak(text=signature).hex().lower()
+        if not self.topic0.startswith("0x"):
+            self.topic0 = "0x" + self.topic0
+        self._indexed = [(i["name"], i["type"]) for i in inputs if i.get("indexed")]
+        self._data_names = [i["name"] for i in inputs if not i.get("indexed")]
+        self._data_types = [i["type"] for i in inputs if not i.get("indexed")]
+
+    def decode(self, log: Dict[str, Any]) -> Dict[str, Any]:
+        topics = log["topics"]
+        args: Dict[str, Any] = {}
+        for (arg_name, typ), topic in zip(self._indexed, topics[1:]):
+            raw = _as_bytes(topic)
+            if typ in ("string", "bytes") or typ.endswith("]"):
+                args[arg_name] = raw
+            else:
+                args[arg_name] = abi_decode([typ], raw)[0]
+        if self._data_types:
+            args.update(zip(self._data_names, abi_decode(self._data_types, _as_bytes(log["data"]))))
+        return args
+
+
+class ChainFeed:
+    """Every event the bot needs from one chain, over a single upstream websocket.
+
+    New heads, pending transactions and logs of subscribed contracts arrive as
+    multiplexed subscriptions on one connection (``stream_subscriptions``).
+    Heads advance the service's ``BlockCache`` before any handler sees them;
+    logs with a registered event ABI are decoded once and published with
+    ``event`` and ``args`` added to the raw log, so every handler shares the
+    same decode pass.
+    """
+
+    def __init__(self, chain: str, service: Any, maxsize: int = 1024):
+        self.chain = chain
+        self.service = service
+        self.heads = FanOut(maxsize, name=f"{chain}-heads")
+        self.pending = FanOut(maxsize, name=f"{chain}-pending")
+        self.logs = FanOut(maxsize, name=f"{chain}-logs")
+        self.log_addresses: set = set()
+        self._decoders: Dict[Tuple[str, str], EventDecoder] = {}
+        self.decode_errors = 0
+
+    def add_log_decoder(self, addresses: Iterable[str], event_abi: EventAbi) -> EventDecoder:
+        decoder = EventDecoder(event_abi)
+        for address in addresses:
+            self._decoders[(address.lower(), decoder.topic0)] = decoder
+        return decoder
+
+    def subscriptions(self) -> Dict[str, List[Any]]:
+        subs: Dict[str, List[Any]] = {}
+        if len(self.heads):
+            subs["heads"] = ["newHeads"]
+        if len(self.pending):
+            subs["pending"] = ["newPendingTransactions", True]
+        if len(self.logs) and self.log_addresses:
+            subs["logs"] = ["logs", {"address": sorted(self.log_addresses)}]
+        return subs
+
+    def decode_log(self, log: Dict[str, Any]) -> Dict[str, Any]:
+        topics = log.get("topics") or []
+        if not topics:
+            return log
+        decoder = self._decoders.get((log["address"].lower(), _topic_hex(topics[0])))
+        if decoder is None:
+            return log
+        try:
+            return dict(log, event=decoder.name, args=decoder.decode(log))
+        except Exception as e:
+            self.decode_errors += 1
+            logger.error(f"[ChainFeed] {self.chain} failed to decode {decoder.name} log: {e}")
+            return log
+
+    def dispatch(self, kind: str, payload: Any) -> None:
+        if kind == "heads":
+            cache = getattr(self.service, "cache", None)
+            if cache is not None:
+                # Invalidate block-scoped reads before anyone reacts to the new head
+                cache.on_new_head(payload)
+            self.heads.publish(payload)
+        elif kind == "pending":
+            if isinstance(payload, dict):  # nodes without full-tx support push bare hashes
+                self.pending.publish(payload)
+        elif kind == "logs":
+            self.logs.publish(self.decode_log(payload))
+
+    async def run(self) -> None:
+        subs = self.subscriptions()
+        if not subs:
+            return
+        fanouts = (self.heads, self.pending, self.logs)
+        for fanout in fanouts:
+            fanout.start()
+        try:
+            async for kind, payload in self.service.stream_subscriptions(subs):
+                self.dispatch(kind, payload)
+                await asyncio.sleep(0)
+        finally:
+            for fanout in fanouts:
+                await fanout.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "heads": self.heads.consumer_stats(),
+            "pending": self.pending.consumer_stats(),
+            "logs": self.logs.consumer_stats(),
+            "decode_errors": self.decode_errors,
+        }
+
+
+class EventBus:
+    """In-process bus that strategies subscribe to instead of polling their own RPC.
+
+    One ``ChainFeed`` (and so one upstream connection) is created per chain on
+    first use. Register handlers before ``run()``: the upstream subscriptions
+    are derived from the registered handlers when the feed starts.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, services: Optional[Dict[str, Any]] = None, maxsize: int = 1024):
+        self.config = config or {}
+        self.services = dict(services or {})
+        self.maxsize = maxsize
+        self.feeds: Dict[str, ChainFeed] = {}
+        self._stop_hooks: List[Callable[[], Any]] = []
+
+    def _service(self, chain: str) -> Any:
+        if chain not in self.services:
+            from ..core.config_manager import AppConfig
+            from .blockchain_service import BlockchainService
+
+            self.services[chain] = BlockchainService(AppConfig.model_validate({**self.config, "network": chain}))
+        return self.services[chain]
+
+    def chain(self, chain: str) -> ChainFeed:
+        if chain not in self.feeds:
+            self.feeds[chain] = ChainFeed(chain, self._service(chain), self.maxsize)
+        return self.feeds[chain]
+
+    def __len__(self) -> int:
+        return len(self.feeds)
+
+    @staticmethod
+    def _addresses(addresses: Iterable[str], name: str) -> List[str]:
+        # A malformed address would make the node reject the whole eth_subscribe for this chain
+        addresses = list(addresses)
+        bad = [a for a in addresses if not (isinstance(a, str) and Web3.is_address(a))]
+        if bad:
+            raise ValueError(f"[EventBus] {name}: invalid contract address(es) {bad}")
+        return addresses
+
+    @staticmethod
+    def _name(handler: Handler, name: Optional[str]) -> str:
+        return name or getattr(handler, "__qualname__", repr(handler))
+
+    def on_head(self, chain: str, handler: Handler, name: Optional[str] = None) -> None:
+        self.chain(chain).heads.add_consumer(self._name(handler, name), handler)
+
+    def on_pending_tx(
+        self,
+        chain: str,
+        handler: Handler,
+        addresses: Optional[Iterable[str]] = None,
+        selectors: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        """``handler`` receives full raw pending txs whose ``to``/selector pass the pre-filter."""
+        name = self._name(handler, name)
+        if addresses:
+            addresses = self._addresses(addresses, name)
+        accept = PendingTxFilter(addresses, selectors) if (addresses or selectors) else None
+        self.chain(chain).pending.add_consumer(name, handler, accept=accept)
+
+    def on_log(
+        self,
+        chain: str,
+        addresses: Iterable[str],
+        handler: Handler,
+        event_abi: Optional[Union[EventAbi, List[EventAbi]]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        """``handler`` receives logs emitted by ``addresses``; decoded when ``event_abi`` is given.
+
+        With ``event_abi`` only the matching events are delivered, each with
+        ``event`` and ``args`` keys; without it every raw log from the
+        addresses is delivered.
+        """
+        name = self._name(handler, name)
+        wanted = {a.lower() for a in self._addresses(addresses, name)}
+        feed = self.chain(chain)
+        feed.log_addresses |= wanted
+        topics = None
+        if event_abi is not None:
+            abis = event_abi if isinstance(event_abi, list) else [event_abi]
+            topics = {feed.add_log_decoder(wanted, abi).topic0 for abi in abis if abi.get("type", "event") == "event"}
+
+        def accept(log: Dict[str, Any]) -> bool:
+            if log["address"].lower() not in wanted:
+                return False
+            return topics is None or (bool(log.get("topics")) and _topic_hex(log["topics"][0]) in topics)
+
+        feed.logs.add_consumer(name, handler, accept=accept)
+
+    def on_stop(self, hook: Callable[[], Any]) -> None:
+        """Call ``hook`` once ``run`` ends, e.g. to release worker processes a subscriber started."""
+        self._stop_hooks.append(hook)
+
+    async def run(self) -> None:
+        """Run every chain feed until cancelled; a failing feed is logged without stopping the others."""
+        async def run_feed(feed: ChainFeed) -> None:
+            try:
+                await feed.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[EventBus] {feed.chain} feed stopped: {e}")
+
+        try:
+            await asyncio.gather(*(run_feed(feed) for feed in list(self.feeds.values())))
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        hooks, self._stop_hooks = self._stop_hooks, []
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"[EventBus] stop hook failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {chain: feed.stats() for chain, feed in self.feeds.items()}
@@ -0,0 +1,190 @@
+# src/services/mempool.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PendingTx = Dict[str, Any]
+Handler = Callable[[PendingTx], Union[None, Awaitable[None]]]
+
+
+class PendingTxFilter:
+    """Cheap address/selector pre-filter applied to raw (hex) pending transactions.
+
+    Runs before any decoding: a transaction passes when its ``to`` is one of
+    ``addresses`` (if given) and its calldata starts with one of ``selectors``
+    (if given). Comparisons are on lower-cased hex strings only.
+    """
+
+    def __init__(self, addresses: Optional[Iterable[str]] = None, selectors: Optional[Iterable[str]] = None):
+        self.addresses = frozenset(a.lower() for a in addresses) if addresses else None
+        self.selectors = frozenset(s.lower()[:10] for s in selectors) if selectors else None
+
+    def __call__(self, tx: PendingTx) -> bool:
+        if self.addresses is not None:
+            to = tx.get("to")
+            if not to or to.lower() not in self.addresses:
+                return False
+        if self.selectors is not None:
+            data = tx.get("input") or tx.get("data") or ""
+            if not isinstance(data, str):
+                data = "0x" + bytes(data).hex()
+            if data[:10].lower() not in self.selectors:
+                return False
+        return True
+
+
+class DropOldestQueue:
+    """Bounded asyncio queue that evicts the oldest item instead of blocking producers.
+
+    Stale mempool transactions are worthless, so under backpressure the
+    freshest ``maxsize`` items are kept and ``dropped`` counts the evictions.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._items: Deque[Any] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, item: Any) -> None:
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append(item)
+        self._ready.set()
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+
+class _Consumer:
+    def __init__(self, name: str, handler: Handler, maxsize: int, accept: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.handler = handler
+        self.accept = accept
+        self.queue = DropOldestQueue(maxsize)
+        self.handled = 0
+        self.errors = 0
+        self.busy = False
+
+
+class FanOut:
+    """Publish/subscribe fan-out with one bounded ``DropOldestQueue`` and worker per consumer.
+
+    A slow consumer only loses its own oldest items and never stalls the
+    publisher or the other consumers. Consumers may pass ``accept`` to see only
+    matching events. Handlers may be plain functions or coroutines; exceptions
+    are logged and counted, not propagated.
+    """
+
+    def __init__(self, maxsize: int = 1024, name: str = "fanout"):
+        self.maxsize = maxsize
+        self.name = name
+        self._consumers: List[_Consumer] = []
+        self._workers: List[asyncio.Task] = []
+        self.published = 0
+
+    def add_consumer(
+        self, name: str, handler: Handler, maxsize: Optional[int] = None, accept: Optional[Callable[[Any], bool]] = None
+    ) -> None:
+        consumer = _Consumer(name, handler, maxsize or self.maxsize, accept)
+        self._consumers.append(consumer)
+        if self._workers:  # already running: give the late consumer its worker too
+            self._workers.append(asyncio.ensure_future(self._consume(consumer)))
+
+    def __len__(self) -> int:
+        return len(self._consumers)
+
+    def publish(self, item: Any) -> int:
+        """Queue ``item`` for every accepting consumer; returns how many took it."""
+        self.published += 1
+        delivered = 0
+        for consumer in self._consumers:
+            if consumer.accept is None or consumer.accept(item):
+                consumer.queue.put_nowait(item)
+                delivered += 1
+        return delivered
+
+    async def _consume(self, consumer: _Consumer) -> None:
+        while True:
+            item = await consumer.queue.get()
+            consumer.busy = True
+            try:
+                result = consumer.handler(item)
+                if asyncio.iscoroutine(result):
+                    await result
+                consumer.handled += 1
+            except Exception as e:
+                consumer.errors += 1
+                ref = item.get("hash") if isinstance(item, dict) else item
+                logger.error(f"[{type(self).__name__}] Consumer {consumer.name} failed on {ref}: {e}")
+            finally:
+                consumer.busy = False
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._consume(c)) for c in self._consumers]
+
+    async def drain(self) -> None:
+        while any(len(c.queue) or c.busy for c in self._consumers):
+            await asyncio.sleep(0.001)
+
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def consumer_stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            c.name: {"handled": c.handled, "errors": c.errors, "dropped": c.queue.dropped, "queued": len(c.queue)}
+            for c in self._consumers
+        }
+
+
+class MempoolPipeline(FanOut):
+    """Streaming mempool fan-out: ingest -> pre-filter -> per-consumer bounded queues.
+
+    ``tx_filter`` (typically a ``PendingTxFilter``) runs once per transaction
+    before anything is queued; hash-only payloads are ignored.
+    """
+
+    def __init__(self, tx_filter: Optional[Callable[[PendingTx], bool]] = None, maxsize: int = 1024):
+        super().__init__(maxsize, name="mempool")
+        self.tx_filter = tx_filter or PendingTxFilter()
+        self.seen = 0
+        self.matched = 0
+
+    def publish(self, tx: Any) -> bool:
+        """Offer one raw pending transaction; returns True if it passed the filter."""
+        self.seen += 1
+        if not isinstance(tx, dict) or not self.tx_filter(tx):
+            return False
+        self.matched += 1
+        super().publish(tx)
+        return True
+
+    async def run(self, source: AsyncIterator[Any]) -> None:
+        """Drain ``source`` (e.g. ``BlockchainService.stream_pending_transactions()``) into the consumers."""
+        self.start()
+        try:
+            async for tx in source:
+                self.publish(tx)
+                # Let consumers run between bursts from the socket
+                await asyncio.sleep(0)
+            await self.drain()
+        finally:
+            await self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"seen": self.seen, "matched": self.matched, "consumers": self.consumer_stats()}
@@ -0,0 +1,172 @@
+# src/services/performance_store.py
+
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_TAIL_QUERY = (
+    "SELECT rowid, strategy_id, status, timestamp_start, timestamp_end, pnl_usd_leg1 "
+    "FROM trades WHERE rowid > ? ORDER BY rowid LIMIT ?"
+)
+
+
+class StrategyPerf:
+    """Streaming per-strategy statistics; ``update`` and ``snapshot`` are O(1).
+
+    Running totals give win rate, average PnL and fail count over the whole
+    history; drawdown is the largest peak-to-trough fall of cumulative PnL
+    (USD, peak starting at zero). ``ewma_pnl``/``ewma_winrate`` decay with a
+    half-life of ``halflife`` trades, so they follow a strategy whose edge
+    is fading long before the lifetime averages move.
+    """
+
+    __slots__ = ("alpha", "trades", "wins", "fails", "pnl_sum", "loss", "equity", "peak", "max_drawdown",
+                 "ewma_pnl", "ewma_winrate", "last_ts")
+
+    def __init__(self, halflife: float = 20.0):
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        self.trades = 0
+        self.wins = 0
+        self.fails = 0
+        self.pnl_sum = 0.0
+        self.loss = 0.0
+        self.equity = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.ewma_pnl: Optional[float] = None
+        self.ewma_winrate: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    def update(self, pnl: float, success: bool = True, ts: Optional[float] = None) -> None:
+        win = 1.0 if pnl > 0 else 0.0
+        self.trades += 1
+        self.wins += int(win)
+        if not success:
+            self.fails += 1
+        self.pnl_sum += pnl
+        if pnl < 0:
+            self.loss -= pnl
+        self.equity += pnl
+        if self.equity > self.peak:
+            self.peak = self.equity
+        elif self.peak - self.equity > self.max_drawdown:
+            self.max_drawdown = self.peak - self.equity
+        if self.ewma_pnl is None:
+            self.ewma_pnl, self.ewma_winrate = pnl, win
+        else:
+            self.ewma_pnl += self.alpha * (pnl - self.ewma_pnl)
+            self.ewma_winrate += self.alpha * (win - self.ewma_winrate)
+        if ts is not None:
+            self.last_ts = ts
+
+    def snapshot(self) -> Dict[str, float]:
+        trades = self.trades
+        return {
+            "trades": trades,
+            "winrate": self.wins / trades if trades else 0.0,
+            "avg_pnl": self.pnl_sum / trades if trades else 0.0,
+            "total_pnl": self.pnl_sum,
+            "loss": self.loss,
+            "drawdown": self.max_drawdown,
+            "fail_count": self.fails,
+            "ewma_pnl": self.ewma_pnl or 0.0,
+            "ewma_winrate": self.ewma_winrate or 0.0,
+            "last_ts": self.last_ts,
+        }
+
+
+class PerformanceStore:
+    """Per-strategy ``StrategyPerf`` kept current from the ``trades`` table.
+
+    ``poll`` folds in only the rows journalled since the previous poll (by
+    ``rowid``), so it is cheap enough to run every block; ``version`` changes
+    whenever any statistic did. With ``path=None`` the store is fed directly
+    through ``record``.
+    """
+
+    def __init__(self, path: Optional[str] = None, halflife: float = 20.0, batch_size: int = 5000):
+        self.path = path
+        self.halflife = halflife
+        self.batch_size = batch_size
+        self.strategies: Dict[str, StrategyPerf] = {}
+        self.last_rowid = 0
+        self.version = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.path is not None:
+            try:
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+                self._conn.execute("SELECT 1 FROM trades LIMIT 1")
+            except sqlite3.Error as e:
+                logger.warning(f"[PerformanceStore] Journal {self.path} not readable yet: {e}")
+                self.close()
+        return self._conn
+
+    def _perf(self, strategy: str) -> StrategyPerf:
+        perf = self.strategies.get(strategy)
+        if perf is None:
+            perf = self.strategies[strategy] = StrategyPerf(self.halflife)
+        return perf
+
+    def record(self, strategy: str, pnl: float, success: bool = True, ts: Optional[float] = None) -> None:
+        with self._lock:
+            self._perf(strategy).update(pnl, success, ts)
+            self.version += 1
+
+    def apply(self, rows: List[tuple]) -> None:
+        with self._lock:
+            for rowid, strategy, status, ts_start, ts_end, pnl in rows:
+                self._perf(strategy or "unknown").update(pnl or 0.0, status != "failed", ts_end or ts_start)
+                if rowid > self.last_rowid:
+                    self.last_rowid = rowid
+            if rows:
+                self.version += 1
+
+    def poll(self) -> int:
+        """Fold newly journalled trades into the statistics; returns how many were read."""
+        conn = self._connect()
+        if conn is None:
+            return 0
+        read = 0
+        while True:
+            try:
+                rows = conn.execute(_TAIL_QUERY, (self.last_rowid, self.batch_size)).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"[PerformanceStore] Journal read failed: {e}")
+                self.close()
+                return read
+            self.apply(rows)
+            read += len(rows)
+            if len(rows) < self.batch_size:
+                return read
+
+    def snapshot(self, strategy: str) -> Optional[Dict[str, float]]:
+        perf = self.strategies.get(strategy)
+        return perf.snapshot() if perf is not None else None
+
+    def snapshots(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: perf.snapshot() for name, perf in self.strategies.items()}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_STORES: Dict[str, PerformanceStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_performance_store(path: str) -> PerformanceStore:
+    """Shared store per journal, so repeated callers only ever read the new rows."""
+    store = _STORES.get(path)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.setdefault(path, PerformanceStore(path))
+    return store
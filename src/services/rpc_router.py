@@ -0,0 +1,224 @@
+# src/services/rpc_router.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from .async_blockchain_service import JsonRpcBatcher, RPCError
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointStats:
+    """Rolling latency and error-rate window for one RPC endpoint.
+
+    Percentiles come from a sorted snapshot of the window that is refreshed
+    every ``resort_every`` new latencies or ``resort_interval`` seconds,
+    whichever comes first, so ranking does not re-sort on every request.
+    """
+
+    def __init__(self, window: int = 256, resort_every: int = 32, resort_interval: float = 1.0):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.errors = 0
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.resort_every = resort_every
+        self.resort_interval = resort_interval
+        self._sorted: Optional[List[float]] = None
+        self._sorted_at = 0.0
+        self._unsorted = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.requests += 1
+        if len(self.outcomes) == self.outcomes.maxlen and not self.outcomes[0]:
+            self.errors -= 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency)
+            self._unsorted += 1
+            self.consecutive_failures = 0
+        else:
+            self.errors += 1
+            self.consecutive_failures += 1
+
+    def reset_health(self) -> None:
+        """Forget the failures behind a bench so the endpoint is judged afresh (latencies are kept)."""
+        self.outcomes.clear()
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        now = time.monotonic()
+        if (self._sorted is None or self._unsorted >= self.resort_every
+                or (self._unsorted and now - self._sorted_at >= self.resort_interval)):
+            self._sorted, self._sorted_at, self._unsorted = sorted(self.latencies), now, 0
+        idx = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[idx]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / len(self.outcomes) if self.outcomes else 0.0
+
+
+class Endpoint:
+    def __init__(self, url: str, transport: Any, window: int = 256):
+        self.url = url
+        self.transport = transport
+        self.stats = EndpointStats(window)
+
+
+class RpcRouter:
+    """Routes JSON-RPC reads to the fastest healthy endpoint.
+
+    Endpoints are ranked by rolling p50 latency; an endpoint whose error rate
+    exceeds ``max_error_rate`` (once at least ``min_error_samples`` outcomes are
+    in its window) or that fails ``max_consecutive_failures`` times in a row is
+    benched for ``cooldown`` seconds. When the bench expires its
+    error window is cleared, so the next requests decide whether it has
+    recovered or goes straight back on the bench. Methods in ``HEDGED_METHODS``
+    are re-sent to the runner-up endpoint if the first has not answered within
+    ``hedge_after`` seconds, and whichever answer lands first wins.
+    """
+
+    HEDGED_METHODS = frozenset({"eth_call", "eth_estimateGas"})
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        hedge_after: Optional[float] = 0.15,
+        max_error_rate: float = 0.25,
+        min_error_samples: int = 20,
+        max_consecutive_failures: int = 3,
+        cooldown: float = 30.0,
+        window: int = 256,
+        **batcher_kwargs,
+    ):
+        self.endpoints = [Endpoint(url, JsonRpcBatcher(url, **batcher_kwargs), window) for url in urls]
+        if not self.endpoints:
+            raise ValueError("RpcRouter needs at least one endpoint")
+        self.hedge_after = hedge_after
+        self.max_error_rate = max_error_rate
+        self.min_error_samples = min_error_samples
+        self.max_consecutive_failures = max_consecutive_failures
+        self.cooldown = cooldown
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def error_rate_exceeded(self, ep: Endpoint) -> bool:
+        # A nearly empty window says nothing: one failure in the first request would read as 100%
+        return len(ep.stats.outcomes) >= self.min_error_samples and ep.stats.error_rate > self.max_error_rate
+
+    def is_healthy(self, ep: Endpoint) -> bool:
+        return time.monotonic() >= ep.stats.cooldown_until and not self.error_rate_exceeded(ep)
+
+    def ranked(self) -> List[Endpoint]:
+        """Healthy endpoints fastest-first, then benched ones as a last resort."""
+        now = time.monotonic()
+        for ep in self.endpoints:
+            if ep.stats.cooldown_until and now >= ep.stats.cooldown_until:
+                logger.info(f"[RpcRouter] Bench over for {ep.url}; retrying it")
+                ep.stats.reset_health()
+        order = {id(ep): i for i, ep in enumerate(self.endpoints)}
+        healthy = [ep for ep in self.endpoints if self.is_healthy(ep)]
+        benched = [ep for ep in self.endpoints if not self.is_healthy(ep)]
+        healthy.sort(key=lambda ep: (ep.stats.p50, order[id(ep)]))
+        benched.sort(key=lambda ep: ep.stats.cooldown_until)
+        return healthy + benched
+
+    async def _call(self, ep: Endpoint, method: str, params: Optional[list]) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await ep.transport.request(method, params)
+        except RPCError:
+            # The node answered; the error belongs to the request, not the endpoint.
+            ep.stats.record(time.perf_counter() - start, True)
+            raise
+        except Exception:
+            ep.stats.record(time.perf_counter() - start, False)
+            if ep.stats.consecutive_failures >= self.max_consecutive_failures or self.error_rate_exceeded(ep):
+                ep.stats.cooldown_until = time.monotonic() + self.cooldown
+                logger.warning(f"[RpcRouter] Benching {ep.url} for {self.cooldown}s")
+            raise
+        ep.stats.record(time.perf_counter() - start, True)
+        return result
+
+    async def request(self, method: str, params: Optional[list] = None, hedge: Optional[bool] = None) -> Any:
+        ranked = self.ranked()
+        if hedge is None:
+            hedge = method in self.HEDGED_METHODS
+        if hedge and self.hedge_after is not None and len(ranked) > 1:
+            return await self._hedged(ranked, method, params)
+        return await self._failover(ranked, method, params)
+
+    async def _failover(self, ranked: List[Endpoint], method: str, params: Optional[list]) -> Any:
+        last_exc: Optional[Exception] = None
+        for ep in ranked:
+            try:
+                return await self._call(ep, method, params)
+            except RPCError:
+                raise
+            except Exception as e:
+                logger.warning(f"[RpcRouter] {method} failed on {ep.url}: {e}")
+                last_exc = e
+        raise last_exc  # type: ignore[misc]
+
+    async def _hedged(self, ranked: List[Endpoint], method: str, params: Optional[list]) -> Any:
+        first = asyncio.ensure_future(self._call(ranked[0], method, params))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done and (first.exception() is None or isinstance(first.exception(), RPCError)):
+            return first.result()
+        if done:
+            return await self._failover(ranked[1:], method, params)
+
+        self.hedges_sent += 1
+        second = asyncio.ensure_future(self._call(ranked[1], method, params))
+        pending = {first, second}
+        last_exc: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is None or isinstance(exc, RPCError):
+                        if task is second:
+                            self.hedges_won += 1
+                        return task.result()
+                    last_exc = exc
+            if len(ranked) > 2:
+                return await self._failover(ranked[2:], method, params)
+            raise last_exc  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint latency/error snapshot (latencies in milliseconds)."""
+        return {
+            ep.url: {
+                "p50_ms": ep.stats.p50 * 1000,
+                "p99_ms": ep.stats.p99 * 1000,
+                "error_rate": ep.stats.error_rate,
+                "requests": ep.stats.requests,
+                "healthy": self.is_healthy(ep),
+            }
+            for ep in self.endpoints
+        }
+
+    async def close(self) -> None:
+        for ep in self.endpoints:
+            await ep.transport.close()
@@ -0,0 +1,187 @@
+# src/services/trade_aggregates.py
+
+import logging
+import sqlite3
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Values accumulated per trade; see TradeAggregator._values
+FIELDS = ("trades", "wins", "pnl_usd", "gas_eth")
+
+DEFAULT_WINDOWS = {"1m": 60.0, "1h": 3600.0, "24h": 86400.0}
+
+_TAIL_QUERY = (
+    "SELECT rowid, strategy_id, timestamp_start, timestamp_end, pnl_usd_leg1, gas_used_leg1, "
+    "gas_price_leg1_gwei_effective FROM trades WHERE rowid > ? ORDER BY rowid LIMIT ?"
+)
+# Served by idx_trades_timestamp_start, so the 24h backfill never scans the whole table
+_BACKFILL_QUERY = (
+    "SELECT rowid, strategy_id, timestamp_start, timestamp_end, pnl_usd_leg1, gas_used_leg1, "
+    "gas_price_leg1_gwei_effective FROM trades WHERE timestamp_start >= ? AND rowid <= ?"
+)
+
+
+class BucketedWindow:
+    """Running totals of ``FIELDS`` over the last ``span`` seconds, in ``buckets`` time slots.
+
+    Adding a trade touches one slot and the totals; slots are retired as time
+    moves past them, so reads are O(1) and memory is fixed. Expiry is at slot
+    granularity (``span / buckets``), which is plenty for a dashboard.
+    """
+
+    def __init__(self, span: float, buckets: int = 60):
+        self.span = span
+        self.width = span / buckets
+        self.buckets = buckets
+        self.slots = [[0.0] * len(FIELDS) for _ in range(buckets)]
+        self.slot_ids = [-1] * buckets
+        self.totals = [0.0] * len(FIELDS)
+        self.head: Optional[int] = None
+
+    def _retire(self, index: int) -> None:
+        slot = self.slots[index]
+        for k, v in enumerate(slot):
+            self.totals[k] -= v
+            slot[k] = 0.0
+        self.slot_ids[index] = -1
+
+    def advance(self, now: float) -> None:
+        bucket = int(now // self.width)
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+        for b in range(max(self.head + 1, bucket - self.buckets + 1), bucket + 1):
+            index = b % self.buckets
+            if self.slot_ids[index] != -1:
+                self._retire(index)
+        self.head = bucket
+        if not any(i != -1 for i in self.slot_ids):
+            self.totals = [0.0] * len(FIELDS)  # drop rounding residue once empty
+
+    def add(self, ts: float, values: Sequence[float]) -> None:
+        self.advance(ts)
+        bucket = int(ts // self.width)
+        if bucket <= self.head - self.buckets:
+            return  # older than the window
+        index = bucket % self.buckets
+        self.slot_ids[index] = bucket
+        slot = self.slots[index]
+        for k, v in enumerate(values):
+            slot[k] += v
+            self.totals[k] += v
+
+    def snapshot(self) -> Dict[str, float]:
+        trades, wins, pnl, gas = self.totals
+        trades = int(round(trades))
+        return {
+            "trades": trades,
+            "wins": int(round(wins)),
+            "win_rate": wins / trades if trades else 0.0,
+            "pnl_usd": pnl,
+            "gas_eth": gas,
+        }
+
+
+class TradeAggregator:
+    """Per-strategy windowed aggregates maintained incrementally from the trade journal.
+
+    ``bootstrap`` replays only the last 24h (by indexed ``timestamp_start``);
+    after that ``poll`` reads just the rows appended since the last poll via
+    ``rowid``. The dashboard process owns its own read-only connection, so
+    readers never contend with the bot's journal writer (WAL mode).
+    """
+
+    def __init__(self, path: str, windows: Optional[Dict[str, float]] = None, batch_size: int = 5000,
+                 clock=time.time):
+        self.path = path
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.batch_size = batch_size
+        self.clock = clock
+        self.strategies: Dict[str, Dict[str, BucketedWindow]] = {}
+        self.last_rowid = 0
+        self.rows_seen = 0
+        self.bootstrapped = False
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            try:
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+                self._conn.execute("SELECT 1 FROM trades LIMIT 1")
+            except sqlite3.Error as e:
+                logger.warning(f"[TradeAggregator] Journal {self.path} not readable yet: {e}")
+                self.close()
+        return self._conn
+
+    def _windows_for(self, strategy: str) -> Dict[str, BucketedWindow]:
+        windows = self.strategies.get(strategy)
+        if windows is None:
+            windows = self.strategies[strategy] = {name: BucketedWindow(span) for name, span in self.windows.items()}
+        return windows
+
+    @staticmethod
+    def _values(pnl: Optional[float], gas_used: Optional[int], gas_price_gwei: Optional[float]) -> Tuple[float, ...]:
+        pnl = pnl or 0.0
+        gas_eth = (gas_used or 0) * (gas_price_gwei or 0.0) / 1e9
+        return 1.0, 1.0 if pnl > 0 else 0.0, pnl, gas_eth
+
+    def apply(self, rows: List[tuple]) -> None:
+        for rowid, strategy, ts_start, ts_end, pnl, gas_used, gas_price in rows:
+            ts = ts_end or ts_start
+            if ts is not None:
+                values = self._values(pnl, gas_used, gas_price)
+                for window in self._windows_for(strategy or "unknown").values():
+                    window.add(ts, values)
+            if rowid > self.last_rowid:
+                self.last_rowid = rowid
+            self.rows_seen += 1
+
+    def bootstrap(self) -> bool:
+        conn = self._connect()
+        if conn is None:
+            return False
+        top = conn.execute("SELECT MAX(rowid) FROM trades").fetchone()[0] or 0
+        since = self.clock() - max(self.windows.values())
+        self.apply(conn.execute(_BACKFILL_QUERY, (since, top)).fetchall())
+        self.last_rowid = top
+        self.bootstrapped = True
+        return True
+
+    def poll(self) -> int:
+        """Fold newly journalled trades into the windows; returns how many were read."""
+        if not self.bootstrapped:
+            before = self.rows_seen
+            return self.rows_seen - before if self.bootstrap() else 0
+        conn = self._connect()
+        if conn is None:
+            return 0
+        read = 0
+        while True:
+            try:
+                rows = conn.execute(_TAIL_QUERY, (self.last_rowid, self.batch_size)).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"[TradeAggregator] Journal read failed: {e}")
+                self.close()
+                return read
+            self.apply(rows)
+            read += len(rows)
+            if len(rows) < self.batch_size:
+                return read
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        now = self.clock()
+        out = {}
+        for strategy, windows in self.strategies.items():
+            for window in windows.values():
+                window.advance(now)
+            out[strategy] = {name: window.snapshot() for name, window in windows.items()}
+        return out
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
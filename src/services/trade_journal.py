@@ -0,0 +1,193 @@
+# src/services/trade_journal.py
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRADE_COLUMNS = (
+    "opportunity_id",
+    "strategy_id",
+    "status",
+    "timestamp_start",
+    "timestamp_end",
+    "token_in_address",
+    "token_in_amount_wei",
+    "token_out_address",
+    "token_out_amount_min_wei",
+    "token_out_amount_actual_wei",
+    "tx_hash_leg1",
+    "gas_used_leg1",
+    "gas_price_leg1_gwei_effective",
+    "pnl_usd_leg1",
+    "error_message_leg1",
+)
+
+_COLUMN_TYPES = {
+    "timestamp_start": "REAL",
+    "timestamp_end": "REAL",
+    "gas_used_leg1": "INTEGER",
+    "gas_price_leg1_gwei_effective": "REAL",
+    "pnl_usd_leg1": "REAL",
+}
+
+TRADES_SCHEMA = "CREATE TABLE IF NOT EXISTS trades (\n    " + ",\n    ".join(
+    f"{col} {_COLUMN_TYPES.get(col, 'TEXT')}" for col in TRADE_COLUMNS
+) + "\n)"
+
+TRADES_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_trades_strategy_id ON trades (strategy_id)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_timestamp_start ON trades (timestamp_start)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_tx_hash_leg1 ON trades (tx_hash_leg1)",
+)
+
+INSERT_TRADE = f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(TRADE_COLUMNS))})"
+
+
+def init_trades_schema(conn: sqlite3.Connection) -> None:
+    """Create the ``trades`` table and its query indexes (idempotent)."""
+    conn.execute(TRADES_SCHEMA)
+    for stmt in TRADES_INDEXES:
+        conn.execute(stmt)
+    conn.commit()
+
+
+def connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """SQLite connection in WAL mode, so dashboard readers never block the journal writer."""
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def trade_row(trade: Dict[str, Any]) -> tuple:
+    return tuple(trade.get(col) for col in TRADE_COLUMNS)
+
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class TradeJournal:
+    """Append-only trade journal with a dedicated SQLite writer thread.
+
+    ``record`` only enqueues the row, so the trading loop never waits on disk.
+    The writer drains whatever has accumulated (a block's worth of trades, or
+    up to ``batch_size`` rows) and inserts it with one prepared
+    ``executemany`` in a single transaction.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, linger: float = 0.005):
+        self.path = path
+        self.batch_size = batch_size
+        self.linger = linger
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.rows_written = 0
+        self.batches_written = 0
+        self.errors = 0
+        conn = connect(path)
+        init_trades_schema(conn)
+        conn.close()
+        self._thread = threading.Thread(target=self._writer, name="trade-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, trade: Dict[str, Any]) -> None:
+        """Queue one trade (keys from ``TRADE_COLUMNS``; missing keys are NULL). Never blocks."""
+        self._queue.put(trade_row(trade))
+
+    def record_many(self, trades: Iterable[Dict[str, Any]]) -> None:
+        for trade in trades:
+            self._queue.put(trade_row(trade))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every trade recorded so far is committed."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def backlog(self) -> int:
+        """Rows (and markers) queued but not yet picked up by the writer."""
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join(timeout)
+
+    def _write(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        try:
+            with conn:
+                conn.executemany(INSERT_TRADE, rows)
+            self.rows_written += len(rows)
+            self.batches_written += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error(f"[TradeJournal] Failed to write {len(rows)} trades: {e}")
+
+    def _writer(self) -> None:
+        conn = connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                rows: List[tuple] = []
+                waiters: List[threading.Event] = []
+                closing = False
+                while True:
+                    if item is _CLOSE:
+                        closing = True
+                    elif isinstance(item, tuple) and item and item[0] is _FLUSH:
+                        waiters.append(item[1])
+                    else:
+                        rows.append(item)
+                    if closing or len(rows) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=self.linger) if not waiters else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if rows:
+                    self._write(conn, rows)
+                for waiter in waiters:
+                    waiter.set()
+                if closing:
+                    # Anything queued behind the close marker is still persisted
+                    rest = []
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                            item[1].set()
+                        elif item is not _CLOSE:
+                            rest.append(item)
+                    if rest:
+                        self._write(conn, rest)
+                    return
+        finally:
+            conn.close()
+
+
+JOURNAL: Optional[TradeJournal] = None
+_GLOBAL_LOCK = threading.Lock()
+
+
+def init_trade_journal(path: str) -> TradeJournal:
+    """Initialise the process-wide journal that strategies record their trades to."""
+    global JOURNAL
+    if JOURNAL is None:
+        with _GLOBAL_LOCK:
+            if JOURNAL is None:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                JOURNAL = TradeJournal(path)
+    return JOURNAL
+
+
+def get_trade_journal() -> Optional[TradeJournal]:
+    return JOURNAL
@@ -0,0 +1,134 @@
+# src/services/tx_pipeline.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+NONCE_ERRORS = ("nonce too low", "nonce too high", "already known", "replacement transaction underpriced")
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+class NonceManager:
+    """Local nonce allocator for the wallets on one chain.
+
+    The first reservation for a wallet reads its ``pending`` transaction count;
+    after that nonces are handed out locally, so N transactions can be built and
+    sent back to back without an RPC each. Releasing the newest reservation
+    hands the nonce back; releasing an older one leaves a gap, so the wallet is
+    resynced from the chain on its next reservation.
+    """
+
+    def __init__(self, fetch_nonce: Callable[[str], int]):
+        self.fetch_nonce = fetch_nonce
+        self._next: Dict[str, int] = {}
+        self._outstanding: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, wallet: str) -> int:
+        with self._lock:
+            if wallet not in self._next:
+                self._next[wallet] = self.fetch_nonce(wallet)
+            nonce = self._next[wallet]
+            self._next[wallet] = nonce + 1
+            self._outstanding.setdefault(wallet, set()).add(nonce)
+            return nonce
+
+    def confirm(self, wallet: str, nonce: int) -> None:
+        """The transaction using ``nonce`` was mined (successfully or not)."""
+        with self._lock:
+            self._outstanding.get(wallet, set()).discard(nonce)
+
+    def release(self, wallet: str, nonce: int) -> None:
+        """The transaction using ``nonce`` was never broadcast."""
+        with self._lock:
+            self._outstanding.get(wallet, set()).discard(nonce)
+            if self._next.get(wallet) == nonce + 1:
+                self._next[wallet] = nonce
+            else:
+                logger.warning(f"[NonceManager] Gap at nonce {nonce} for {wallet}, resyncing")
+                self._next.pop(wallet, None)
+
+    def resync(self, wallet: str) -> None:
+        with self._lock:
+            self._next.pop(wallet, None)
+
+    def in_flight(self, wallet: str) -> int:
+        return len(self._outstanding.get(wallet, ()))
+
+
+class ReceiptPoller:
+    """Resolves receipts for every in-flight transaction with one pass per block.
+
+    ``track`` returns a future per transaction hash; ``on_block`` asks for all
+    outstanding receipts concurrently (a single JSON-RPC batch when
+    ``fetch_receipt`` goes through ``AsyncBlockchainService``) and resolves the
+    ones that were mined. The timeout is in seconds rather than blocks, so it
+    means the same on a 12 s chain and a 250 ms one. A transaction still
+    missing after ``timeout`` fails its future with ``TimeoutError`` but stays
+    tracked, since it may yet be mined; when it is, ``on_late_receipt(tx_hash,
+    receipt)`` is called.
+    """
+
+    def __init__(self, fetch_receipt: Callable[[Any], Awaitable[Optional[Any]]], timeout: float = 120.0,
+                 on_late_receipt: Optional[Callable[[Any, Any], None]] = None):
+        self.fetch_receipt = fetch_receipt
+        self.timeout = timeout
+        self.on_late_receipt = on_late_receipt
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._deadline: Dict[Any, float] = {}
+        self.block_number: Optional[int] = None
+
+    def track(self, tx_hash: Any) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[tx_hash] = fut
+        self._deadline[tx_hash] = time.monotonic() + self.timeout
+        return fut
+
+    @property
+    def pending(self) -> int:
+        """Transactions with no receipt yet, including overdue ones."""
+        return len(self._pending)
+
+    @property
+    def overdue(self) -> int:
+        return sum(1 for fut in self._pending.values() if fut.done())
+
+    async def on_block(self, block_number: int) -> None:
+        self.block_number = block_number
+        hashes = list(self._pending)
+        receipts = await asyncio.gather(*(self.fetch_receipt(h) for h in hashes), return_exceptions=True)
+        now = time.monotonic()
+        for tx_hash, receipt in zip(hashes, receipts):
+            fut = self._pending[tx_hash]
+            if receipt is not None and not isinstance(receipt, Exception):
+                del self._pending[tx_hash], self._deadline[tx_hash]
+                if not fut.done():
+                    fut.set_result(receipt)
+                elif self.on_late_receipt is not None:
+                    self.on_late_receipt(tx_hash, receipt)
+            elif not fut.done() and now >= self._deadline[tx_hash]:
+                fut.set_exception(TimeoutError(f"no receipt for {tx_hash!r} after {self.timeout}s; still tracking it"))
+
+    async def run(self, get_block_number: Callable[[], Awaitable[Optional[int]]], poll_interval: float = 1.0,
+                  keep_running: Callable[[], bool] = lambda: True) -> None:
+        """Poll the head and call ``on_block`` whenever it advances."""
+        last = None
+        while keep_running():
+            try:
+                block_number = await get_block_number()
+                if block_number is not None and block_number != last:
+                    last = block_number
+                    self.block_number = block_number
+                    if self._pending:
+                        await self.on_block(block_number)
+            except Exception as e:
+                logger.warning(f"[ReceiptPoller] poll failed: {e}")
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,89 @@
+# src/services/tx_templates.py
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector
+from web3 import Web3
+
+
+class CallTemplate:
+    """ABI-encoded contract call with patchable ``uint256`` arguments.
+
+    The calldata is encoded once with placeholders; ``encode`` copies the
+    buffer and overwrites only the 32-byte head words of the patchable
+    arguments, so no ABI machinery runs per transaction.
+    """
+
+    def __init__(self, fn_name: str, arg_types: Sequence[str], args: Sequence[Any]):
+        self.signature = f"{fn_name}({','.join(arg_types)})"
+        self.selector = function_signature_to_4byte_selector(self.signature)
+        self.slots = [i for i, arg in enumerate(args) if arg is None]
+        for i in self.slots:
+            if arg_types[i] != "uint256":
+                raise ValueError(f"Only uint256 arguments can be patched, got {arg_types[i]}")
+        placeholder = [0 if arg is None else arg for arg in args]
+        self._calldata = bytes(self.selector) + encode(list(arg_types), placeholder)
+
+    def encode(self, *values: int) -> bytes:
+        if len(values) != len(self.slots):
+            raise ValueError(f"{self.signature} expects {len(self.slots)} patch values")
+        buf = bytearray(self._calldata)
+        for slot, value in zip(self.slots, values):
+            start = 4 + 32 * slot
+            buf[start:start + 32] = int(value).to_bytes(32, "big")
+        return bytes(buf)
+
+
+def swap_exact_eth_for_tokens(path: Sequence[str], recipient: str) -> CallTemplate:
+    """``swapExactETHForTokens(amountOutMin, path, to, deadline)``; patch values are (amountOutMin, deadline)."""
+    return CallTemplate(
+        "swapExactETHForTokens",
+        ["uint256", "address[]", "address", "uint256"],
+        [None, [Web3.to_checksum_address(a) for a in path], Web3.to_checksum_address(recipient), None],
+    )
+
+
+class TemplateCache:
+    """Templates for recurring calls, keyed by whatever identifies the call (router, path, recipient)."""
+
+    def __init__(self):
+        self._templates: Dict[Hashable, CallTemplate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], CallTemplate]) -> CallTemplate:
+        template = self._templates.get(key)
+        if template is None:
+            self.misses += 1
+            template = self._templates[key] = factory()
+        else:
+            self.hits += 1
+        return template
+
+
+class PresignedLadder:
+    """The same transaction signed at several gas prices; sending is a lookup."""
+
+    def __init__(self, nonce: int, signed: Dict[int, bytes]):
+        self.nonce = nonce
+        self.gas_prices: List[int] = sorted(signed)
+        self.signed = signed
+
+    def select(self, min_gas_price: int) -> Optional[bytes]:
+        """Cheapest pre-signed variant paying at least ``min_gas_price``, if any."""
+        idx = bisect_left(self.gas_prices, min_gas_price)
+        if idx == len(self.gas_prices):
+            return None
+        return self.signed[self.gas_prices[idx]]
+
+
+def gas_ladder(base_gas_price: int, steps: Iterable[float] = (1.0, 1.125, 1.25, 1.5)) -> List[int]:
+    return [int(base_gas_price * step) for step in steps]
+
+
+def presign_ladder(sign_raw: Callable[[dict], bytes], tx_dict: dict, gas_prices: Iterable[int]) -> PresignedLadder:
+    """Sign ``tx_dict`` once per gas price (all variants share one nonce)."""
+    signed = {gp: sign_raw(dict(tx_dict, gasPrice=gp)) for gp in gas_prices}
+    return PresignedLadder(tx_dict["nonce"], signed)
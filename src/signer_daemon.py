@@ -0,0 +1,201 @@
+"""Long-lived local signing daemon.
+
+The encrypted key is decrypted (250k PBKDF2 iterations) once, when the daemon
+starts. Bot processes attach to its Unix socket with ``RemoteSigner`` and get
+signatures back over newline-delimited JSON, so restarts after a kill-switch
+recovery reach their first trade without paying the key derivation again.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Dict, Optional
+
+from .core.metrics import timed_stage
+from .services.tx_templates import PresignedLadder, gas_ladder, presign_ladder
+from .signer_service import SignerService
+
+DEFAULT_SOCKET_PATH = "/tmp/mev_og_signer.sock"
+
+
+def socket_path_from_config(config: Dict[str, Any]) -> Optional[str]:
+    """Socket path if ``signer.type`` is ``daemon`` (endpoint ``unix:///path``), else None."""
+    signer_cfg = config.get("signer") or {}
+    if signer_cfg.get("type") != "daemon":
+        return None
+    endpoint = signer_cfg.get("endpoint") or ""
+    return endpoint[len("unix://"):] if endpoint.startswith("unix://") else DEFAULT_SOCKET_PATH
+
+
+def _socket_in_use(path: str) -> bool:
+    """True if something is accepting connections on the Unix socket at ``path``."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _jsonable_tx(tx_dict: dict) -> dict:
+    return {k: ("0x" + bytes(v).hex() if isinstance(v, (bytes, bytearray)) else v) for k, v in tx_dict.items()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        if not self.server.peer_allowed(self.request):
+            logging.warning("[SignerDaemon] Rejected connection from foreign uid")
+            return
+        for line in self.rfile:
+            try:
+                req = json.loads(line)
+                if req.get("op") == "address":
+                    resp = {"address": self.server.signer.get_eth_address()}
+                elif req.get("op") == "sign":
+                    resp = {"raw": "0x" + bytes(self.server.signer.sign_eth_tx(req["tx"])).hex()}
+                else:
+                    resp = {"error": f"unknown op {req.get('op')!r}"}
+            except Exception as e:
+                resp = {"error": str(e)}
+            self.wfile.write(json.dumps(resp).encode() + b"\n")
+            self.wfile.flush()
+
+
+class SignerDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves ``address`` and ``sign`` requests for one in-memory key.
+
+    The socket is created mode 0600 and peers are checked with SO_PEERCRED,
+    so only processes running as the same user can request signatures.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, signer: Optional[SignerService] = None):
+        self.socket_path = socket_path
+        self.signer = signer or SignerService()
+        if os.path.exists(socket_path):
+            # Only clear a stale socket left by a crashed daemon, never a live one
+            if _socket_in_use(socket_path):
+                raise FileExistsError(f"signer daemon already listening on {socket_path}")
+            os.unlink(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        logging.info(f"[SignerDaemon] Serving {self.signer.get_eth_address()} on {socket_path}")
+
+    def peer_allowed(self, conn: socket.socket) -> bool:
+        if not hasattr(socket, "SO_PEERCRED"):  # pragma: no cover - non-Linux
+            return True
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return uid == os.getuid()
+
+    def serve_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="signer-daemon", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class RemoteSigner:
+    """Drop-in for ``SignerService`` backed by a running ``SignerDaemon``."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._connect()
+        self._address = self._call({"op": "address"})["address"]
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock, self._file = sock, sock.makefile("rb")
+
+    def _drop(self) -> None:
+        # A stream that failed mid-request may still hold (or later receive) that request's
+        # response, so it is never reused: the next call starts on a fresh connection
+        if self._file is not None:
+            self._file.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+    def _roundtrip(self, payload: bytes) -> bytes:
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(payload)
+            line = self._file.readline()
+            if not line.endswith(b"\n"):
+                raise ConnectionError("signer daemon closed the connection")
+        except OSError:  # includes timeouts
+            self._drop()
+            raise
+        return line
+
+    def _call(self, req: dict) -> dict:
+        payload = json.dumps(req).encode() + b"\n"
+        with self._lock:
+            try:
+                line = self._roundtrip(payload)
+            except (ConnectionError, BrokenPipeError) as e:
+                # The daemon restarted under us; signing is idempotent, so reconnect and retry once
+                logging.warning(f"[RemoteSigner] Lost daemon connection ({e}); reconnecting")
+                line = self._roundtrip(payload)
+        resp = json.loads(line)
+        if "error" in resp:
+            raise RuntimeError(f"signer daemon: {resp['error']}")
+        return resp
+
+    @timed_stage("sign")
+    def sign_eth_tx(self, tx_dict: dict) -> bytes:
+        return bytes.fromhex(self._call({"op": "sign", "tx": _jsonable_tx(tx_dict)})["raw"][2:])
+
+    def presign_gas_ladder(self, tx_dict: dict, gas_prices: Optional[list] = None) -> PresignedLadder:
+        return presign_ladder(self.sign_eth_tx, tx_dict, gas_prices or gas_ladder(tx_dict["gasPrice"]))
+
+    def get_eth_address(self) -> str:
+        return self._address
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+
+def connect_signer(config: Dict[str, Any], fallback=SignerService):
+    """Attach to the signing daemon when one is configured and running; otherwise build ``fallback()``."""
+    path = socket_path_from_config(config)
+    if path and os.path.exists(path):
+        try:
+            return RemoteSigner(path)
+        except Exception as e:
+            logging.warning(f"[Signer] Daemon at {path} unavailable ({e}); decrypting key locally")
+    return fallback()
+
+
+def run_signer_daemon(config: Dict[str, Any]) -> None:
+    daemon = SignerDaemon(socket_path_from_config(config) or DEFAULT_SOCKET_PATH)
+    try:
+        daemon.serve_forever()
+    finally:
+        daemon.server_close()
@@ -5,18 +5,19 @@ from src.services.blockchain_service import BlockchainService
 def test_rpc_disconnect_recovery(monkeypatch):
     config = SimpleNamespace(
         network="mainnet",
-        rpc_urls=SimpleNamespace(root={"mainnet": "http://localhost:8545"}),
+        rpc=SimpleNamespace(root={"mainnet": {"primary": "http://127.0.0.1:1", "fallback": "http://localhost:8545"}}),
+        rpc_urls=SimpleNamespace(root={"mainnet": "http://127.0.0.1:1"}),
         wss_urls=SimpleNamespace(root={"mainnet": None})
     )
     service = BlockchainService(config)
 
-    call_count = {"n": 0}
+    probes = {"n": 0}
 
     def fake_is_connected():
-        call_count["n"] += 1
-        return call_count["n"] > 1
+        probes["n"] += 1
+        return True
 
     monkeypatch.setattr(service.http_web3, "is_connected", fake_is_connected)
-    _ = service.get_current_block_number()
-    assert call_count["n"] >= 1
-
+    assert service.get_current_block_number() is None
+    assert probes["n"] == 0  # no liveness probe per request
+    assert service.rpc_url == "http://localhost:8545"  # the connection error rotated to the fallback
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from src.ai import alpha_scraper
+from src.ai.alpha_scraper import FeedCache, Source, fetch_feeds, scrape_alpha
+from src.ai.llm_gateway import LLMGateway, StubBackend, set_llm_gateway
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _with_server(fn):
+    hits = {"fast": 0, "slow": 0, "commits": 0, "conditional": 0}
+    state = {"etag": '"v1"', "body": [{"commit": {"message": "fix bridge"}}]}
+
+    async def fast(request):
+        hits["fast"] += 1
+        return web.Response(text="fast feed")
+
+    async def slow(request):
+        hits["slow"] += 1
+        await asyncio.sleep(0.3)
+        return web.Response(text="slow feed")
+
+    async def hang(request):
+        await asyncio.sleep(1.0)
+        return web.Response(text="never")
+
+    async def commits(request):
+        hits["commits"] += 1
+        if request.headers.get("If-None-Match") == state["etag"]:
+            hits["conditional"] += 1
+            return web.Response(status=304)
+        return web.json_response(state["body"], headers={"ETag": state["etag"]})
+
+    app = web.Application()
+    for path, handler in (("/fast", fast), ("/slow", slow), ("/hang", hang), ("/commits", commits)):
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    try:
+        return await fn(base, hits, state)
+    finally:
+        await runner.cleanup()
+
+
+def test_fetch_is_concurrent_and_bounded_by_timeouts(tmp_path):
+    async def scenario(base, hits, state):
+        cache = FeedCache(str(tmp_path))
+        sources = [Source(f"slow{i}", f"{base}/slow") for i in range(4)]
+        sources += [Source("hang", f"{base}/hang", timeout=0.3), Source("static", static=lambda: "local")]
+        start = time.perf_counter()
+        feeds = await fetch_feeds(sources, cache)
+        return feeds, time.perf_counter() - start
+
+    feeds, elapsed = asyncio.run(_with_server(scenario))
+    assert feeds == ["slow feed"] * 4 + ["", "local"]
+    # four 0.3s sources and a 0.3s timeout in parallel, not 1.5s in sequence
+    assert elapsed < 1.0
+
+
+def test_ttl_cache_and_etag_revalidation(tmp_path):
+    clock = Clock()
+
+    async def scenario(base, hits, state):
+        cache = FeedCache(str(tmp_path), clock=clock)
+        sources = [Source("gh", f"{base}/commits", alpha_scraper._github_commits("org/repo"), ttl=60),
+                   Source("fast", f"{base}/fast", ttl=60)]
+        first = await fetch_feeds(sources, cache)
+        clock.now += 30
+        cached = await fetch_feeds(sources, cache)
+        assert (hits["commits"], hits["fast"]) == (1, 1)  # within TTL: no requests at all
+        clock.now += 60
+        revalidated = await fetch_feeds(sources, cache)
+        assert hits["conditional"] == 1 and hits["fast"] == 2
+        return first, cached, revalidated
+
+    first, cached, revalidated = asyncio.run(_with_server(scenario))
+    assert first == cached == revalidated == ["org/repo: fix bridge", "fast feed"]
+
+
+def test_unchanged_feeds_skip_the_summarizer(tmp_path):
+    backend = StubBackend(lambda messages: f"summary {len(backend.calls)}")
+    set_llm_gateway(LLMGateway(backend))
+    try:
+        feed = {"text": "alpha"}
+        sources = [Source("local", static=lambda: feed["text"])]
+        cache = FeedCache(str(tmp_path))
+        assert asyncio.run(scrape_alpha(sources, cache)) == ("summary 1", True)
+        assert asyncio.run(scrape_alpha(sources, cache)) == ("summary 1", False)
+        feed["text"] = "new alpha"
+        assert asyncio.run(scrape_alpha(sources, cache)) == ("summary 2", True)
+        assert [calls[-1]["content"].rsplit("\n", 1)[-1] for calls in backend.calls] == ["alpha", "new alpha"]
+    finally:
+        set_llm_gateway(None)
+
+
+def test_failed_fetch_serves_stale_cache(tmp_path):
+    cache = FeedCache(str(tmp_path), clock=Clock())
+    cache.put("down", {"fetched_at": 0.0, "text": "stale", "hash": "x"})
+    feeds = asyncio.run(fetch_feeds([Source("down", "http://127.0.0.1:9/feed", timeout=0.5)], cache))
+    assert feeds == ["stale"]
+    assert json.loads(open(cache._path("down")).read())["text"] == "stale"
@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from src.alpha.cross_chain_arb import TransactionManager
+from src.services.async_blockchain_service import AsyncBlockchainService, JsonRpcBatcher, RPCError
+
+ADDR = "0x" + "11" * 20
+MINED = "0x" + "ab" * 32
+
+
+def _answer(req):
+    if req["method"] == "eth_blockNumber":
+        return {"jsonrpc": "2.0", "id": req["id"], "result": "0x10"}
+    if req["method"] == "eth_getBalance":
+        return {"jsonrpc": "2.0", "id": req["id"], "result": "0xde0b6b3a7640000"}
+    if req["method"] == "eth_getBlockByNumber":
+        return {"jsonrpc": "2.0", "id": req["id"], "result": {"number": "0x10", "gasUsed": "0x5208", "transactions": []}}
+    if req["method"] == "eth_getTransactionReceipt":
+        receipt = {"status": "0x1", "blockNumber": "0x10", "gasUsed": "0x5208"} if req["params"][0] == MINED else None
+        return {"jsonrpc": "2.0", "id": req["id"], "result": receipt}
+    return {"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32601, "message": "method not found"}}
+
+
+async def _with_node(fn):
+    posts = []
+
+    async def handler(request):
+        body = await request.json()
+        posts.append(body)
+        if isinstance(body, list):
+            return web.json_response([_answer(r) for r in body])
+        return web.json_response(_answer(body))
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    config = SimpleNamespace(network="mainnet", rpc_urls=SimpleNamespace(root={"mainnet": f"http://127.0.0.1:{port}"}))
+    service = AsyncBlockchainService(config)
+    try:
+        return await fn(service), posts
+    finally:
+        await service.close()
+        await runner.cleanup()
+
+
+def test_concurrent_reads_share_one_batch():
+    async def reads(service):
+        return await asyncio.gather(
+            service.get_current_block_number(),
+            service.get_balance(ADDR),
+            service.get_block(16),
+        )
+
+    (block_number, balance, block), posts = asyncio.run(_with_node(reads))
+    assert block_number == 16
+    assert balance == 10 ** 18
+    assert block.number == 16 and block.gasUsed == 21000
+    assert len(posts) == 1 and len(posts[0]) == 3
+
+
+def test_rpc_error_is_isolated_to_its_request():
+    async def reads(service):
+        ok = service.get_current_block_number()
+        bad = service.request("eth_unknown")
+        return await asyncio.gather(ok, bad, return_exceptions=True)
+
+    (block_number, err), posts = asyncio.run(_with_node(reads))
+    assert block_number == 16
+    assert isinstance(err, RPCError) and err.code == -32601
+    assert len(posts) == 1
+
+
+def test_sequential_reads_are_sent_unbatched():
+    async def reads(service):
+        await service.get_current_block_number()
+        return await service.get_chain_id()
+
+    chain_id, posts = asyncio.run(_with_node(reads))
+    assert chain_id is None  # error is logged and swallowed like the sync service
+    assert all(isinstance(p, dict) for p in posts)
+
+
+def test_receipt_poller_fetches_a_block_of_receipts_in_one_batch():
+    async def poll(service):
+        txm = TransactionManager(None, ADDR, None, rpc=service)
+        pending = [bytes.fromhex("cd" * 32), bytes.fromhex("ef" * 32)]
+        futs = [txm.receipts.track(h) for h in [bytes.fromhex(MINED[2:])] + pending]
+        await txm.receipts.on_block(await txm._block_number())
+        return futs
+
+    (mined, *pending), posts = asyncio.run(_with_node(poll))
+    assert mined.result().status == 1 and mined.result().gasUsed == 21000
+    assert not any(f.done() for f in pending)
+    assert len(posts) == 2 and len(posts[1]) == 3  # eth_blockNumber, then one batch for all three hashes
+
+
+def test_close_cancels_batches_still_on_the_wire():
+    async def main():
+        release = asyncio.Event()
+
+        async def stall(request):
+            await release.wait()
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post("/", stall)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        batcher = JsonRpcBatcher(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+        try:
+            call = asyncio.ensure_future(batcher.request("eth_blockNumber"))
+            await asyncio.sleep(0.05)
+            assert len(batcher._sends) == 1
+            await batcher.close()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            return batcher
+        finally:
+            release.set()
+            await runner.cleanup()
+
+    assert not asyncio.run(main())._sends
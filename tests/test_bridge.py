@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.clock import SimClock
+from src.services.bridge import BridgeError, SimulatedBridge
+
+
+def test_sim_clock_fires_in_deadline_order():
+    clock = SimClock(start=0)
+    fired = []
+
+    async def sleeper(name, delay):
+        await clock.sleep(delay)
+        fired.append((name, clock.time()))
+
+    async def main():
+        await asyncio.gather(sleeper("slow", 25), sleeper("fast", 10), sleeper("mid", 12))
+
+    asyncio.run(main())
+    assert fired == [("fast", 10), ("mid", 12), ("slow", 25)]
+
+
+def test_many_transfers_in_flight_settle_fast():
+    clock = SimClock(start=0)
+    bridge = SimulatedBridge(fee_bps=10, clock=clock)
+
+    async def main():
+        transfers = [bridge.start_transfer(1) for _ in range(50)]
+        assert len(bridge.in_flight) == 50
+        assert all(t.status == "pending" for t in transfers)
+        return await asyncio.gather(*(t.wait() for t in transfers)), transfers
+
+    start = time.perf_counter()
+    results, transfers = asyncio.run(main())
+    assert time.perf_counter() - start < 1.0
+    assert all(net == pytest.approx(0.999) and fee == pytest.approx(0.001) for net, fee in results)
+    assert not bridge.in_flight and all(t.status == "settled" for t in transfers)
+    assert 10 <= clock.time() <= 25
+
+
+def test_failed_transfer_raises():
+    bridge = SimulatedBridge(fail_rate=1.0, clock=SimClock())
+
+    async def main():
+        transfer = bridge.start_transfer(1)
+        with pytest.raises(BridgeError):
+            await transfer.wait()
+        return transfer
+
+    assert asyncio.run(main()).status == "failed"
+
+
+def test_close_fails_transfers_still_in_flight():
+    clock = SimClock(start=0)
+    bridge = SimulatedBridge(clock=clock)
+
+    async def main():
+        transfer = bridge.start_transfer(1)
+        assert len(bridge._settlements) == 1
+        await bridge.close()
+        with pytest.raises(BridgeError):
+            await transfer.wait()
+        return transfer
+
+    transfer = asyncio.run(main())
+    assert transfer.status == "failed" and not bridge._settlements and not bridge.in_flight
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from src.safety.honeypot_scanner import is_honeypot_or_scam
+from src.services.chain_cache import BlockCache
+
+
+def counter(value):
+    calls = {"n": 0}
+
+    def fetch():
+        calls["n"] += 1
+        return value
+
+    return fetch, calls
+
+
+def test_block_values_reset_on_new_head():
+    cache = BlockCache()
+    fetch, calls = counter(30 * 10 ** 9)
+    cache.on_new_head({"number": "0x10"})
+    assert cache.get_or_fetch("gas_price", fetch) == 30 * 10 ** 9
+    cache.get_or_fetch("gas_price", fetch)
+    assert calls["n"] == 1
+    cache.on_new_head({"number": "0x11"})
+    cache.get_or_fetch("gas_price", fetch)
+    assert calls["n"] == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_block_values_bypass_without_head():
+    cache = BlockCache()
+    fetch, calls = counter(1)
+    cache.get_or_fetch("gas_price", fetch)
+    cache.get_or_fetch("gas_price", fetch)
+    assert calls["n"] == 2
+    assert cache.stats()["bypassed"] == 2
+
+
+def test_value_fetched_across_a_head_change_is_not_stored():
+    cache = BlockCache()
+    cache.on_new_head({"number": "0x10"})
+
+    def fetch():
+        cache.on_new_head({"number": "0x11"})  # head lands mid-request
+        return 30 * 10 ** 9
+
+    assert cache.get_or_fetch("gas_price", fetch) == 30 * 10 ** 9
+    later, calls = counter(31 * 10 ** 9)
+    assert cache.get_or_fetch("gas_price", later) == 31 * 10 ** 9
+    assert calls["n"] == 1 and cache.stats()["bypassed"] == 1
+
+
+def test_empty_code_is_not_cached_as_immutable():
+    cache = BlockCache()
+    fetch, calls = counter(b"")
+    cache.get_or_fetch(("code", "a"), fetch, immutable=True)
+    cache.get_or_fetch(("code", "a"), fetch, immutable=True)
+    assert calls["n"] == 2 and cache.stats()["immutable_entries"] == 0
+
+
+def test_immutable_lru_survives_heads_and_is_bounded():
+    cache = BlockCache(immutable_size=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_fetch(("code", key), lambda: b"\x60" * 64, immutable=True)
+    cache.on_new_head({"number": 5})
+    fetch, calls = counter(b"\x00")
+    cache.get_or_fetch(("code", "c"), fetch, immutable=True)
+    cache.get_or_fetch(("code", "a"), fetch, immutable=True)
+    assert calls["n"] == 1  # "a" was evicted, "c" was not
+    assert cache.stats()["immutable_entries"] == 2
+
+
+def test_honeypot_scanner_fetches_code_once():
+    calls = {"n": 0}
+
+    def get_code(addr):
+        calls["n"] += 1
+        return b"\x60" * 100
+
+    web3 = SimpleNamespace(eth=SimpleNamespace(get_code=get_code))
+    cache = BlockCache()
+    assert not is_honeypot_or_scam(web3, "0xToken", cache)
+    assert not is_honeypot_or_scam(web3, "0xTOKEN", cache)
+    assert calls["n"] == 1
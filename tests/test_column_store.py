@@ -0,0 +1,96 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.core.chain_store import ChainStore, import_recording
+from src.core.column_store import ColumnTable
+from src.core.replay import read_events, run_backtest
+from tests.test_replay import CONFIG, _record
+
+SCHEMA = {"ts": "f8", "block": "u8", "address": "address", "topic0": "S32", "data": "blob"}
+
+
+def test_append_and_zero_copy_scan(tmp_path):
+    table = ColumnTable.create(str(tmp_path / "logs"), SCHEMA)
+    table.append_rows([
+        {"ts": 1.0, "block": 10, "address": "0xAbC0", "topic0": b"\x01" * 32, "data": b"hello"},
+        {"ts": 2.0, "block": 11, "address": "0xabc0", "data": b""},
+        {"ts": 3.0, "block": 12, "address": "0xdef1", "topic0": b"\x02", "data": b"xyz"},
+    ])
+    assert len(table) == 3
+    block = table.column("block")
+    assert isinstance(block, np.memmap) and not block.flags.writeable
+    assert block.tolist() == [10, 11, 12]
+    # addresses are lower-cased and dictionary-encoded
+    assert table.column("address").tolist() == [0, 0, 1]
+    assert table.decode("address", table.column("address")) == ["0xabc0", "0xabc0", "0xdef1"]
+    mask = table.column("address") == table.lookup("address", "0xABC0")
+    assert table.column("ts")[mask].tolist() == [1.0, 2.0]
+    data = table.blob("data")
+    assert [bytes(data[i]) for i in range(3)] == [b"hello", b"", b"xyz"]
+
+
+def test_reopen_appends_after_committed_rows(tmp_path):
+    path = str(tmp_path / "t")
+    table = ColumnTable.create(path, SCHEMA)
+    table.append({"ts": [1.0, 2.0], "block": [1, 2], "address": ["0xa", "0xb"], "data": [b"a", b"bb"]})
+    reopened = ColumnTable.create(path, SCHEMA)
+    assert len(reopened) == 2 and reopened.lookup("address", "0xb") == 1
+    reopened.append({"ts": [3.0], "block": [3], "address": ["0xc"], "data": [b"ccc"]})
+    table.refresh()
+    assert table.column("block").tolist() == [1, 2, 3]
+    assert bytes(table.blob("data")[2]) == b"ccc"
+    assert table.decode("address", table.column("address")) == ["0xa", "0xb", "0xc"]
+    with pytest.raises(ValueError):
+        ColumnTable.create(path, {"ts": "f8"})
+    with pytest.raises(KeyError):
+        table.append({"nope": [1]})
+
+
+def test_chain_store_replays_like_the_recording(tmp_path):
+    rec = tmp_path / "rec.bin.gz"
+    _record(rec, blocks=200)
+    store_dir = str(tmp_path / "store")
+    with ChainStore(store_dir) as store:
+        assert import_recording(str(rec), store) == len(list(read_events(str(rec))))
+    assert list(ChainStore(store_dir).events()) == list(read_events(str(rec)))
+    from_store = run_backtest(CONFIG, store_dir)["strategies"]
+    from_file = run_backtest(CONFIG, str(rec))["strategies"]
+    for name in from_file:
+        assert from_store[name]["pnl_usd"] == pytest.approx(from_file[name]["pnl_usd"])
+        assert from_store[name]["decisions"] == from_file[name]["decisions"]
+
+
+def test_read_only_open_never_creates_anything(tmp_path):
+    missing = str(tmp_path / "missing")
+    with pytest.raises(FileNotFoundError):
+        ChainStore.open(missing)
+    assert not os.path.exists(missing)
+
+    store_dir = str(tmp_path / "store")
+    rec = tmp_path / "rec.bin.gz"
+    _record(rec, blocks=20)
+    with ChainStore(store_dir) as store:
+        import_recording(str(rec), store)
+    before = sorted(os.listdir(store_dir))
+    reader = ChainStore.open(store_dir)
+    assert list(reader.events()) == list(read_events(str(rec)))
+    with pytest.raises(PermissionError):
+        reader.block("mainnet", {"number": 1})
+    assert sorted(os.listdir(store_dir)) == before
+
+
+def test_scans_millions_of_rows_per_second(tmp_path):
+    n = 2_000_000
+    table = ColumnTable.create(str(tmp_path / "trades"), {"ts": "f8", "strategy": "symbol", "pnl_usd": "f8"})
+    ids = np.arange(n) % 8
+    table.append({"ts": np.arange(n, dtype=np.float64), "pnl_usd": np.sin(np.arange(n)),
+                  "strategy": [f"s{i}" for i in range(8)] * (n // 8)})
+    start = time.perf_counter()
+    sid, pnl = table.column("strategy"), table.column("pnl_usd")
+    totals = np.bincount(sid, weights=pnl)
+    elapsed = time.perf_counter() - start
+    assert totals == pytest.approx(np.bincount(ids, weights=np.sin(np.arange(n))))
+    assert n / elapsed > 1_000_000
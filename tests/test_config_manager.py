@@ -1,6 +1,6 @@
 import os
 import pytest
-from src.core.config_manager import load_app_config, AppConfig
+from src.core.config_manager import load_app_config, AppConfig, rpc_endpoints
 
 VALID_CONFIG = """
 network: sepolia
@@ -74,9 +74,22 @@ def test_forbid_extra_fields(tmp_path):
     with pytest.raises(RuntimeError):
         load_app_config(str(cfg_file))
 
+def test_unknown_budget_key_fails_the_load(tmp_path):
+    config_text = VALID_CONFIG + "\nalpha:\n  budgets:\n    cross_chain:\n      latency_msec: 500\n"
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(config_text)
+    with pytest.raises(RuntimeError, match="latency_msec"):
+        load_app_config(str(cfg_file))
+
 def test_missing_router_abi(tmp_path):
     config_text = VALID_CONFIG.replace('evm_dex_router_abi:', 'evm_dex_router_abi_missing:')
     cfg_file = tmp_path / "config.yaml"
     cfg_file.write_text(config_text)
     with pytest.raises(RuntimeError):
         load_app_config(str(cfg_file))
+
+
+def test_rpc_endpoints_from_plain_dict_config():
+    config = {"rpc_urls": {"mainnet": "http://single"}, "rpc": {"mainnet": {"fallback": "http://b", "primary": "http://a"}}}
+    assert rpc_endpoints(config, "mainnet") == ["http://a", "http://b", "http://single"]
+    assert rpc_endpoints({"rpc_urls": {"arbitrum": "http://l2"}, "rpc": None}, "arbitrum") == ["http://l2"]
@@ -1,14 +1,16 @@
+import asyncio
 import pytest
 from src.alpha.cross_chain_arb import CrossChainArb, SimulatedBridge
+from src.core.clock import SimClock
 
 def test_bridge_failure_handling(monkeypatch):
     bot = CrossChainArb("config.example.yaml")
     bot.get_price = lambda w, r, t, a: 3500 if w == bot.web3_mainnet else 3525
     # Simulate bridge always failing
-    bot.bridge = SimulatedBridge(fail_rate=1.0)
+    bot.bridge = SimulatedBridge(fail_rate=1.0, clock=SimClock())
     opp = bot.detect_opportunity()
     assert opp is not None
-    result = bot.execute_arb(opp)
+    result = asyncio.run(bot.execute_arb(opp))
     assert not result  # Should abort on bridge failure
 
 def test_gas_spike(monkeypatch):
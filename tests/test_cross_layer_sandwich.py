@@ -1,6 +1,13 @@
+from eth_abi import encode
+
 from src.alpha.cross_layer_sandwich import decode_bridge_call
+from src.services.calldata_decoder import selector_of
 
 def test_decode_bridge_call():
-    sig = "0x1234"
-    input_data = "0x1111234abc"
+    sig = "0x7ff36ab5"  # swapExactETHForTokens
+    swap = bytes.fromhex(sig[2:]) + encode(["uint256", "address[]", "address", "uint256"], [1, ["0x" + "11" * 20], "0x" + "22" * 20, 0])
+    retryable = selector_of("createRetryableTicket(address,uint256,uint256,address,address,uint256,uint256,bytes)")
+    args = ["0x" + "22" * 20, 0, 0, "0x" + "22" * 20, "0x" + "22" * 20, 100000, 1, swap]
+    input_data = "0x" + (retryable + encode(["address", "uint256", "uint256", "address", "address", "uint256", "uint256", "bytes"], args)).hex()
     assert decode_bridge_call(input_data, sig)
+    assert not decode_bridge_call("0x1111234abc", "0x1234")
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from src.dashboard import DashboardFeed, create_app
+from src.kill_switch import KillSwitch, KillSwitchMonitor
+from src.services.trade_aggregates import BucketedWindow, TradeAggregator
+from src.services.trade_journal import TradeJournal
+
+
+def _trade(strategy, ts, pnl, gas_used=100_000, gas_price=10.0):
+    return {"strategy_id": strategy, "timestamp_start": ts - 1, "timestamp_end": ts, "pnl_usd_leg1": pnl,
+            "gas_used_leg1": gas_used, "gas_price_leg1_gwei_effective": gas_price}
+
+
+def test_bucketed_window_expires_by_slot():
+    window = BucketedWindow(60.0, buckets=60)
+    window.add(0.0, (1, 1, 5.0, 0.0))
+    window.add(30.0, (1, 0, -2.0, 0.0))
+    assert window.snapshot()["pnl_usd"] == 3.0
+    window.advance(61.0)
+    snap = window.snapshot()
+    assert snap["trades"] == 1 and snap["pnl_usd"] == -2.0 and snap["win_rate"] == 0.0
+    window.advance(1000.0)
+    assert window.snapshot()["trades"] == 0
+
+
+def test_aggregator_bootstraps_and_tails_journal(tmp_path):
+    now = [10_000.0]
+    path = str(tmp_path / "journal.db")
+    journal = TradeJournal(path)
+    journal.record_many([_trade("old", now[0] - 90_000, 50.0), _trade("arb", now[0] - 30, 10.0),
+                         _trade("arb", now[0] - 7200, -4.0)])
+    journal.flush(5)
+
+    agg = TradeAggregator(path, clock=lambda: now[0])
+    agg.poll()
+    snap = agg.snapshot()
+    assert "old" not in snap  # outside every window, never loaded
+    assert snap["arb"]["1m"]["pnl_usd"] == 10.0
+    assert snap["arb"]["24h"]["trades"] == 2 and snap["arb"]["24h"]["win_rate"] == 0.5
+    assert abs(snap["arb"]["24h"]["gas_eth"] - 0.002) < 1e-12
+
+    journal.record(_trade("sandwich", now[0], -1.0))
+    journal.flush(5)
+    assert agg.poll() == 1
+    now[0] += 120
+    snap = agg.snapshot()
+    assert snap["arb"]["1m"]["trades"] == 0
+    assert snap["sandwich"]["1h"]["pnl_usd"] == -1.0
+    journal.close()
+    agg.close()
+
+
+def test_feed_pushes_only_on_change(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = TradeJournal(path)
+    ks = KillSwitch({"kill_switch_name": f"mev_test_ks_{tmp_path.name[-8:]}"})
+    feed = DashboardFeed(TradeAggregator(path), KillSwitchMonitor(ks._word.shm.name))
+    assert feed.refresh()
+    assert not feed.refresh()
+    assert feed.summary()["kill_switch"] == {"state": "running", "error_count": 0}
+    ks.record_risk_breach("test")
+    assert feed.refresh()
+    assert feed.summary()["kill_switch"]["state"] == "halt"
+
+    async def consume():
+        feed.interval = 0.01
+        updates = feed.updates()
+        first = json.loads(await updates.__anext__())
+        runner = asyncio.ensure_future(feed.run())
+        journal.record(_trade("arb", time.time(), 3.0))
+        journal.flush(5)
+        second = json.loads(await asyncio.wait_for(updates.__anext__(), 5))
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        return first, second
+
+    first, second = asyncio.run(consume())
+    assert first["strategies"] == {}
+    assert second["strategies"]["arb"]["1m"]["pnl_usd"] == 3.0
+
+    resp = TestClient(create_app(feed=feed)).get("/api/summary")
+    assert resp.json()["kill_switch"]["state"] == "halt"
+    feed.kill.close()
+    journal.close()
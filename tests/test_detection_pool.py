@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from src.core.detection_pool import DetectionPool, SharedPoolState
+from src.pricing.sizing import detect_pair_opportunity
+
+PARAMS = {"bridge_fee_bps": 8, "slippage_bps": 0, "min_profit_usd": 1.0, "grid_size": 512}
+
+
+def test_shared_state_is_visible_to_attached_readers():
+    state = SharedPoolState(4)
+    try:
+        state.write(2, (100.0, 300000.0, 0.003))
+        state.set_block(17, gas_usd=4.5)
+        reader = SharedPoolState.attach(state.name, 4)
+        assert reader.read(2) == (100.0, 300000.0, 0.003)
+        assert reader.block == 17 and reader.gas_usd == 4.5
+        reader.close()
+    finally:
+        state.close()
+        state.unlink()
+
+
+def test_sharded_detection_merges_into_one_queue():
+    state = SharedPoolState(6)
+    # Three cross-chain pairs; only (0, 1) and (4, 5) are mispriced enough to trade
+    prices = [3000, 3090, 3000, 3001, 3000, 3150]
+    for idx, price in enumerate(prices):
+        state.write(idx, (1000.0, 1000.0 * price, 0.003))
+    pool = DetectionPool(state, detect_pair_opportunity, pairs=[(0, 1), (2, 3), (4, 5)], workers=2, params=PARAMS)
+    pool.start()
+    try:
+        assert pool.run_round(100, gas_usd=5.0, timeout=60)
+        first, second = pool.next_opportunity(), pool.next_opportunity()
+        assert pool.next_opportunity() is None
+        assert first["pair"] == (4, 5) and second["pair"] == (0, 1)  # best first across workers
+        assert first["buy"] == 4 and first["block"] == 100
+        assert first["net_profit_usd"] > second["net_profit_usd"] > 1.0
+
+        # State changes are picked up from shared memory without re-sending anything
+        state.write(5, (1000.0, 3000000.0, 0.003))
+        assert pool.run_round(101, gas_usd=5.0, timeout=60)
+        assert pool.next_opportunity(min_block=101)["pair"] == (0, 1)
+    finally:
+        pool.stop()
+        state.close()
+        state.unlink()
+
+
+def test_mempool_transactions_are_sharded_by_hash():
+    from src.alpha.cross_layer_sandwich import detect_bridge_swap
+    from src.services.calldata_decoder import selector_of
+
+    swap = "0x" + selector_of("swapExactETHForTokens(uint256,address[],address,uint256)").hex() + "00" * 128
+    state = SharedPoolState(1)
+    pool = DetectionPool(state, detect_tx=detect_bridge_swap, workers=2, params={"dex_sig": swap[:10]})
+    pool.start()
+    try:
+        rounds = [pool.submit_tx({"hash": f"0x{i}", "input": swap if i % 2 else "0xdeadbeef"}) for i in range(6)]
+        assert all(pool.wait(r, timeout=60) for r in rounds)
+        hashes = sorted(pool.next_opportunity()["hash"] for _ in range(3))
+        assert hashes == ["0x1", "0x3", "0x5"] and pool.next_opportunity() is None
+    finally:
+        pool.stop()
+        state.close()
+        state.unlink()
+
+
+def test_pair_only_pool_does_not_start_idle_workers():
+    state = SharedPoolState(2)
+    try:
+        assert DetectionPool(state, detect_pair_opportunity, pairs=[(0, 1)], workers=4).workers == 1
+        assert DetectionPool(state, detect_tx=lambda tx, params: None, workers=4).workers == 4
+    finally:
+        state.close()
+        state.unlink()
+
+
+class _Bus:
+    def __init__(self):
+        self.handlers = {}
+        self.stop_hooks = []
+
+    def on_pending_tx(self, chain, handler, addresses=None, selectors=None, name=None):
+        self.handlers["pending"] = handler
+
+    def on_head(self, chain, handler, name=None):
+        self.handlers["head"] = handler
+
+    def on_log(self, chain, addresses, handler, event_abi=None, name=None):
+        self.handlers["log"] = handler
+
+    def on_stop(self, hook):
+        self.stop_hooks.append(hook)
+
+
+def _bridge_swap_tx(i, value_wei, sig):
+    from eth_abi import encode
+
+    from src.services.calldata_decoder import selector_of
+
+    swap = selector_of(sig) + encode(["uint256", "address[]", "address", "uint256"], [0, ["0x" + "11" * 20], "0x" + "22" * 20, 0])
+    retryable = selector_of("createRetryableTicket(address,uint256,uint256,address,address,uint256,uint256,bytes)")
+    args = ["0x" + "22" * 20, value_wei, 0, "0x" + "22" * 20, "0x" + "22" * 20, 100000, 1, swap]
+    data = retryable + encode(["address", "uint256", "uint256", "address", "address", "uint256", "uint256", "bytes"], args)
+    return {"hash": f"0x{i}", "input": "0x" + data.hex(), "from": "0x0"}
+
+
+def test_bus_results_arrive_without_a_new_head_and_stop_releases_the_pool():
+    from src.alpha.cross_layer_sandwich import register_cross_layer_sandwich
+
+    sig = "swapExactETHForTokens(uint256,address[],address,uint256)"
+    bus = _Bus()
+    config = {"contracts": {"arbitrum_bridge": "0x" + "11" * 20, "target_dex_sig": sig}, "detection_workers": 2}
+    detector = register_cross_layer_sandwich(bus, config)
+    name = detector.state.name
+
+    async def scenario():
+        rounds = [bus.handlers["pending"](_bridge_swap_tx(i, 10 ** 18, sig)) for i in range(4)]
+        assert all(detector.detection.wait(r, timeout=60) for r in rounds)
+        for _ in range(100):  # delivered via call_soon_threadsafe, no head needed
+            if len(detector.recent) == 4:
+                break
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(scenario())
+        assert sorted(o["hash"] for o in detector.recent) == ["0x0", "0x1", "0x2", "0x3"]
+        assert "head" in bus.handlers and "log" not in bus.handlers
+    finally:
+        for hook in bus.stop_hooks:
+            hook()
+    with pytest.raises(FileNotFoundError):
+        SharedPoolState.attach(name, 1)
+
+
+def test_workers_price_victims_against_shared_pool_reserves():
+    from eth_abi import encode
+
+    from src.alpha.cross_layer_sandwich import register_cross_layer_sandwich
+    from src.pricing.quote_engine import SYNC_TOPIC
+
+    sig = "swapExactETHForTokens(uint256,address[],address,uint256)"
+    weth, usdc, pool_addr = "0x" + "aa" * 20, "0x" + "bb" * 20, "0x" + "cc" * 20
+    bus = _Bus()
+    config = {"contracts": {"arbitrum_bridge": "0x" + "11" * 20, "target_dex_sig": sig, "target_l2_pool": pool_addr},
+              "detection_workers": 1, "weth_address": weth, "usdc_address": usdc, "max_trade_amount_eth": 5,
+              "min_profit_usd": 1.0}
+    detector = register_cross_layer_sandwich(bus, config)
+    try:
+        bus.handlers["log"]({"address": pool_addr, "topics": [SYNC_TOPIC],
+                             "data": encode(["uint112", "uint112"], [1000 * 10 ** 18, 3_000_000 * 10 ** 6])})
+        assert detector.state.read(0) == (1000.0, 3_000_000.0, 0.003)
+        small, large = _bridge_swap_tx(1, 10 ** 15, sig), _bridge_swap_tx(2, 50 * 10 ** 18, sig)
+        rounds = [bus.handlers["pending"](tx) for tx in (small, large)]
+        assert all(detector.detection.wait(r, timeout=60) for r in rounds)
+        (opp,) = detector.recent  # the tiny swap is not worth sandwiching
+        assert opp["hash"] == "0x2" and opp["frontrun_eth"] <= 5 and opp["net_profit_usd"] > 1.0
+    finally:
+        for hook in bus.stop_hooks:
+            hook()
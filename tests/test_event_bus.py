@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+from eth_abi import encode
+from web3 import Web3
+
+from src.services.blockchain_service import BlockchainService
+from src.services.chain_cache import BlockCache
+from src.services.event_bus import EventBus
+
+TOKEN = "0x" + "aa" * 20
+OTHER = "0x" + "bb" * 20
+ALICE = "0x" + "11" * 20
+BOB = "0x" + "22" * 20
+TRANSFER_ABI = {
+    "type": "event",
+    "name": "Transfer",
+    "inputs": [
+        {"name": "from", "type": "address", "indexed": True},
+        {"name": "to", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+
+def _topic(addr):
+    return "0x" + "00" * 12 + addr[2:]
+
+
+def _transfer_log(address=TOKEN, value=7):
+    return {"address": address, "topics": [TRANSFER_TOPIC, _topic(ALICE), _topic(BOB)],
+            "data": "0x" + encode(["uint256"], [value]).hex(), "transactionHash": "0x01"}
+
+
+class FakeService:
+    def __init__(self, events):
+        self.events = events
+        self.cache = BlockCache()
+        self.subscribed = []
+
+    async def stream_subscriptions(self, subs):
+        self.subscribed.append(subs)
+        for kind, payload in self.events:
+            if kind in subs:
+                yield kind, payload
+
+
+def test_one_feed_fans_out_heads_pending_and_decoded_logs():
+    events = [
+        ("heads", {"number": "0x10"}),
+        ("pending", {"hash": "0xa", "to": TOKEN, "input": "0xa9059cbb"}),
+        ("pending", {"hash": "0xb", "to": OTHER, "input": "0x"}),
+        ("pending", "0xhashonly"),
+        ("logs", _transfer_log()),
+        ("logs", _transfer_log(address=OTHER)),
+    ]
+    service = FakeService(events)
+    bus = EventBus(services={"mainnet": service})
+    got = {"heads_a": [], "heads_b": [], "pending": [], "logs": [], "raw": []}
+    bus.on_head("mainnet", lambda h: got["heads_a"].append(h["number"]))
+
+    async def async_head(head):
+        got["heads_b"].append(head["number"])
+
+    bus.on_head("mainnet", async_head)
+    bus.on_pending_tx("mainnet", lambda tx: got["pending"].append(tx["hash"]), addresses=[TOKEN])
+    bus.on_log("mainnet", [TOKEN], lambda log: got["logs"].append(log["args"]), event_abi=TRANSFER_ABI)
+    bus.on_log("mainnet", [OTHER], lambda log: got["raw"].append(log))
+
+    async def run():
+        feed = bus.chain("mainnet")
+        task = asyncio.ensure_future(feed.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert len(service.subscribed) == 1  # one upstream connection for every handler
+    subs = service.subscribed[0]
+    assert subs["pending"] == ["newPendingTransactions", True]
+    assert subs["logs"][1]["address"] == sorted([TOKEN, OTHER])
+    assert got["heads_a"] == got["heads_b"] == ["0x10"]
+    assert service.cache.block_number == 16
+    assert got["pending"] == ["0xa"]
+    assert got["logs"] == [{"from": ALICE, "to": BOB, "value": 7}]
+    assert len(got["raw"]) == 1 and "args" not in got["raw"][0]
+
+
+def test_stream_subscriptions_multiplexes_one_socket():
+    connections = []
+
+    async def node(ws):
+        connections.append(ws)
+        subs = {}
+        for _ in range(2):
+            req = json.loads(await ws.recv())
+            subs[req["params"][0]] = f"0xsub{req['id']}"
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": subs[req["params"][0]]}))
+        for method, result in (("newHeads", {"number": "0x1"}), ("logs", _transfer_log())):
+            note = {"jsonrpc": "2.0", "method": "eth_subscription",
+                    "params": {"subscription": subs[method], "result": result}}
+            await ws.send(json.dumps(note))
+        await ws.wait_closed()
+
+    async def run():
+        async with websockets.serve(node, "127.0.0.1", 0) as server:
+            service = BlockchainService.__new__(BlockchainService)
+            service.network = "mainnet"
+            service.wss_url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            received = []
+            async for item in service.stream_subscriptions({"heads": ["newHeads"], "logs": ["logs", {"address": [TOKEN]}]}):
+                received.append(item)
+                if len(received) == 2:
+                    break
+            return received
+
+    received = asyncio.run(run())
+    assert [kind for kind, _ in received] == ["heads", "logs"]
+    assert len(connections) == 1
+
+
+def test_rejected_subscription_is_dropped_and_the_rest_keep_streaming():
+    connections = []
+
+    async def node(ws):
+        connections.append(ws)
+        subs = {}
+        for _ in range(2):
+            req = json.loads(await ws.recv())
+            if req["params"][0] == "logs":
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32602, "message": "bad address"}}))
+                continue
+            subs[req["params"][0]] = f"0xsub{req['id']}"
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": subs[req["params"][0]]}))
+        for number in ("0x1", "0x2"):
+            note = {"jsonrpc": "2.0", "method": "eth_subscription",
+                    "params": {"subscription": subs["newHeads"], "result": {"number": number}}}
+            await ws.send(json.dumps(note))
+        await ws.wait_closed()
+
+    async def run():
+        async with websockets.serve(node, "127.0.0.1", 0) as server:
+            service = BlockchainService.__new__(BlockchainService)
+            service.network = "mainnet"
+            service.wss_url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            received = []
+            async for item in service.stream_subscriptions({"logs": ["logs", {"address": ["0xbad"]}], "heads": ["newHeads"]}):
+                received.append(item)
+                if len(received) == 2:
+                    break
+            return received
+
+    received = asyncio.run(run())
+    assert [payload["number"] for _, payload in received] == ["0x1", "0x2"]
+    assert len(connections) == 1
+
+
+def test_invalid_addresses_are_rejected_at_registration():
+    from src.alpha.bridge_games import register_bridge_games
+
+    bus = EventBus(services={"mainnet": FakeService([])})
+    with pytest.raises(ValueError):
+        bus.on_log("mainnet", ["0xCBridgeKnownAddressHere"], lambda log: None)
+    with pytest.raises(ValueError):
+        bus.on_pending_tx("mainnet", lambda tx: None, addresses=["0x1234"])
+    with pytest.raises(ValueError):
+        register_bridge_games(bus, {"network": "mainnet"})
+    assert bus.chain("mainnet").log_addresses == set()
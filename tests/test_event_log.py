@@ -0,0 +1,115 @@
+import json
+import os
+
+from src.core import event_log
+from src.core.event_log import EVENT_FIELDS, EventCursor, EventLog, tail_events, tail_lines
+
+
+def test_events_are_fixed_field_json_lines(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), clock=lambda: 100.0)
+    log.record("trade", "cross_chain", latency_ms=12.5, pnl_usd=3.0)
+    log.record("crash", "nftfi", detail="boom")
+    log.close()
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert [tuple(json.loads(line)) for line in lines] == [EVENT_FIELDS, EVENT_FIELDS]
+    assert json.loads(lines[1]) == {"ts": 100.0, "strategy": "nftfi", "event": "crash", "latency_ms": None,
+                                    "pnl_usd": None, "detail": "boom"}
+
+
+def test_tail_reads_across_block_boundaries(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_text("".join(f"line {i}\n" for i in range(5000)))
+    assert tail_lines(str(path), 3, block_size=7) == ["line 4997\n", "line 4998\n", "line 4999\n"]
+    assert tail_lines(str(path), 3000, block_size=1024) == [f"line {i}\n" for i in range(2000, 5000)]
+    assert len(tail_lines(str(path), 10_000)) == 5000
+    path.write_text("a\nb\nno newline")
+    assert tail_lines(str(path), 2, block_size=4) == ["b\n", "no newline"]
+
+
+def test_tail_events_skips_malformed_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"event": "a"}\nnot json\n{"event": "b"}\n')
+    assert [e["event"] for e in tail_events(str(path), 3)] == ["a", "b"]
+
+
+def test_cursor_reads_only_new_complete_lines(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    state = str(tmp_path / "cursor.json")
+    log = EventLog(path)
+    cursor = EventCursor(path, state_path=state)
+    assert cursor.read() == []
+    log.record("trade", "a", pnl_usd=1.0)
+    log.record("trade", "b", pnl_usd=2.0)
+    assert [e["strategy"] for e in cursor.read()] == ["a", "b"]
+    assert cursor.read() == []
+    # a half-written line waits for its newline
+    with open(path, "a") as f:
+        f.write('{"event": "partial"')
+    assert cursor.read() == []
+    with open(path, "a") as f:
+        f.write("}\n")
+    assert [e["event"] for e in cursor.read()] == ["partial"]
+    cursor.save()
+    log.record("trade", "c")
+    resumed = EventCursor(path, state_path=state)
+    assert [e["strategy"] for e in resumed.read()] == ["c"]
+    log.close()
+
+
+def test_cursor_restarts_after_rotation(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path)
+    log.record("trade", "old")
+    cursor = EventCursor(path)
+    assert len(cursor.read()) == 1
+    log.close()
+    os.rename(path, path + ".1")
+    log = EventLog(path)
+    log.record("trade", "new")
+    assert [e["strategy"] for e in cursor.read()] == ["new"]
+    log.close()
+
+
+def test_cursor_byte_limit_keeps_whole_lines(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path)
+    for i in range(10):
+        log.record("trade", f"s{i}")
+    log.close()
+    cursor = EventCursor(path)
+    seen = []
+    while True:
+        batch = cursor.read(max_bytes=50)
+        if not batch:
+            break
+        seen.extend(e["strategy"] for e in batch)
+    assert seen == [f"s{i}" for i in range(10)]
+
+
+def test_cursor_latest_reads_back_from_the_end(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path)
+    for i in range(5000):
+        log.record("trade", f"s{i}")
+    cursor = EventCursor(path)
+    assert [e["strategy"] for e in cursor.read_latest(3, block_size=64)] == ["s4997", "s4998", "s4999"]
+    assert cursor.offset == os.path.getsize(path)
+    assert cursor.read_latest(3) == []
+    log.record("trade", "new")
+    with open(path, "a") as f:
+        f.write('{"event": "partial"')
+    assert [e["strategy"] for e in cursor.read_latest(3, block_size=16)] == ["new"]
+    with open(path, "a") as f:
+        f.write("}\n")
+    assert [e["event"] for e in cursor.read_latest(3)] == ["partial"]
+    log.close()
+
+
+def test_record_event_is_noop_until_initialised(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_log, "EVENT_LOG", None)
+    event_log.record_event("trade", "a")
+    path = str(tmp_path / "events.jsonl")
+    log = event_log.init_event_log(path)
+    event_log.record_event("trade", "a", pnl_usd=1.0)
+    log.close()
+    assert tail_events(path, 5)[0]["pnl_usd"] == 1.0
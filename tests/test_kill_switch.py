@@ -1,5 +1,8 @@
 import pytest
-from src.kill_switch import KillSwitch
+from multiprocessing.shared_memory import SharedMemory
+
+from src import kill_switch
+from src.kill_switch import _OWNER, _SLOTS, KillSwitch, KillSwitchMonitor, init_global_kill_switch
 from src.risk_manager import RiskManager
 
 BASIC_CFG = {
@@ -47,3 +50,91 @@ def test_manual_override():
     assert ks.state == KillSwitch.LIQUIDATE
     ks.manual_override(KillSwitch.HALT, "bad", confirm=False)
     assert ks.state == KillSwitch.LIQUIDATE  # no change without confirm
+
+
+def test_concurrent_escalation_notifies_once():
+    import threading
+
+    messages = []
+    ks = KillSwitch(BASIC_CFG, notifier=messages.append)
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for _ in range(50):
+            ks.record_risk_breach("race")
+            ks.record_trade_error("fail")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert ks.state == KillSwitch.HALT
+    assert ks.error_count == 400
+    assert sum("HALT" in m for m in messages) == 1
+
+
+def _halt_from_child(ks):
+    ks.record_risk_breach("child breach")
+
+
+def test_state_shared_with_child_process():
+    import multiprocessing as mp
+
+    ks = KillSwitch(BASIC_CFG, notifier=dummy_notifier)
+    ks.record_trade_error("fail")
+    proc = mp.get_context("spawn").Process(target=_halt_from_child, args=(ks,))
+    proc.start()
+    proc.join(30)
+    assert proc.exitcode == 0
+    assert ks.state == KillSwitch.HALT
+    assert not ks.is_enabled()
+    assert ks.error_count == 1
+
+
+def test_named_switch_is_not_taken_over_while_owner_lives(tmp_path):
+    name = f"mev_test_own_{tmp_path.name[-8:]}"
+    ks = KillSwitch({**BASIC_CFG, "kill_switch_name": name})
+    with pytest.raises(FileExistsError):
+        KillSwitch({**BASIC_CFG, "kill_switch_name": name})
+    assert ks.is_enabled()
+    ks._word.close()
+
+
+def test_named_switch_is_shared_through_the_global(tmp_path, monkeypatch):
+    monkeypatch.setattr(kill_switch, "KILL_SWITCH", None)
+    cfg = {**BASIC_CFG, "kill_switch_name": f"mev_test_glob_{tmp_path.name[-8:]}"}
+    ks = init_global_kill_switch(cfg)
+    try:
+        assert init_global_kill_switch(cfg) is ks  # e.g. MEVBot and CrossChainArb in one process
+        with pytest.raises(FileExistsError, match="init_global_kill_switch"):
+            KillSwitch(cfg)
+    finally:
+        ks._word.close()
+
+
+def test_stale_segment_of_dead_owner_is_replaced(tmp_path):
+    name = f"mev_test_dead_{tmp_path.name[-8:]}"
+    stale = SharedMemory(name=name, create=True, size=8 * _SLOTS)
+    words = stale.buf.cast("q")
+    words[0], words[_OWNER] = KillSwitch.HALT, 2 ** 22 + 1  # above pid_max: never a live process
+    words.release()
+    stale.close()
+    ks = KillSwitch({**BASIC_CFG, "kill_switch_name": name})
+    assert ks.state == KillSwitch.RUNNING
+    ks._word.close()
+
+
+def test_monitor_reattaches_to_a_replaced_segment(tmp_path):
+    name = f"mev_test_mon_{tmp_path.name[-8:]}"
+    ks = KillSwitch({**BASIC_CFG, "kill_switch_name": name})
+    monitor = KillSwitchMonitor(name)
+    ks.record_risk_breach("test")
+    assert monitor.state == KillSwitch.HALT
+    ks._word.close()
+    assert monitor.state is None
+    restarted = KillSwitch({**BASIC_CFG, "kill_switch_name": name})
+    assert monitor.state == KillSwitch.RUNNING
+    monitor.close()
+    restarted._word.close()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from src.ai.ai_orchestrator import AIOrchestrator
+from src.ai.llm_gateway import BudgetExceeded, LLMGateway, StubBackend, TokenBudget, set_llm_gateway
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_identical_prompts_hit_the_cache_until_ttl():
+    clock = Clock()
+    backend = StubBackend(lambda messages: f"answer {len(backend.calls)}")
+    gateway = LLMGateway(backend, ttl=60, clock=clock)
+
+    async def scenario():
+        first = await gateway.complete("what now?", system="quant")
+        again = await gateway.complete("what now?", system="quant")
+        other = await gateway.complete("what now?", system="quant", temperature=0.9)
+        clock.now = 61
+        expired = await gateway.complete("what now?", system="quant")
+        return first, again, other, expired
+
+    assert asyncio.run(scenario()) == ("answer 1", "answer 1", "answer 2", "answer 3")
+    assert gateway.stats()["hits"] == 1 and gateway.stats()["misses"] == 3
+
+
+def test_in_flight_identical_prompts_share_one_call():
+    backend = StubBackend(delay=0.05)
+    gateway = LLMGateway(backend)
+
+    async def scenario():
+        return await asyncio.gather(*(gateway.complete("same") for _ in range(5)), gateway.complete("different"))
+
+    results = asyncio.run(scenario())
+    assert len(set(results[:5])) == 1
+    assert len(backend.calls) == 2
+    assert gateway.coalesced == 4
+
+
+def test_coalesced_callers_see_the_backend_error():
+    async def failing(model, messages, temperature, max_tokens):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("rate limited")
+
+    backend = StubBackend()
+    backend.complete = failing
+    gateway = LLMGateway(backend)
+
+    async def scenario():
+        return await asyncio.gather(gateway.complete("x"), gateway.complete("x"), return_exceptions=True)
+
+    assert [str(r) for r in asyncio.run(scenario())] == ["rate limited", "rate limited"]
+    assert gateway.stats()["cached"] == 0
+
+
+def test_token_budget_blocks_calls_and_resets_per_window():
+    clock = Clock()
+    backend = StubBackend(lambda messages: "ok")
+    gateway = LLMGateway(backend, budget=TokenBudget(limit=410, window_sec=3600, clock=clock), clock=clock)
+
+    # each call must fit its ~4 prompt tokens plus max_tokens=400 in what is left
+    async def ask(prompt):
+        return await gateway.complete(prompt, max_tokens=400)
+
+    asyncio.run(ask("a"))
+    assert 0 < gateway.budget.used < 100
+    asyncio.run(ask("b"))
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(ask("c"))
+    assert len(backend.calls) == 2
+    assert asyncio.run(ask("a")) == "ok"  # cached answers cost nothing
+    clock.now = 3600
+    asyncio.run(ask("c"))
+    assert len(backend.calls) == 3
+
+
+def test_concurrent_calls_reserve_their_estimate():
+    backend = StubBackend(lambda messages: "ok", delay=0.01)
+    gateway = LLMGateway(backend, budget=TokenBudget(limit=410))
+
+    async def scenario():
+        # both fit the empty budget alone, but only one fits once the other has reserved
+        return await asyncio.gather(gateway.complete("a", max_tokens=400), gateway.complete("b", max_tokens=400),
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert results[0] == "ok" and isinstance(results[1], BudgetExceeded)
+    assert len(backend.calls) == 1
+    assert gateway.budget.reserved == 0 and 0 < gateway.budget.used < 100
+
+
+def test_orchestrator_analysis_goes_through_the_gateway(monkeypatch):
+    monkeypatch.setattr("src.ai.ai_orchestrator.load_config", lambda path: {})
+    backend = StubBackend(lambda messages: "PROMOTE TO LIVE")
+    set_llm_gateway(LLMGateway(backend))
+    try:
+        orchestrator = AIOrchestrator()
+        assert orchestrator.openai_analyze_logs("logs") == "PROMOTE TO LIVE"
+        assert orchestrator.openai_analyze_logs("logs") == "PROMOTE TO LIVE"
+        assert len(backend.calls) == 1
+        set_llm_gateway(LLMGateway(backend, budget=TokenBudget(limit=1)))
+        assert orchestrator.openai_analyze_logs("more logs").startswith("[AIOrchestrator] OpenAI analysis failed")
+    finally:
+        set_llm_gateway(None)
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import websockets
+
+from src.services.blockchain_service import BlockchainService
+from src.services.mempool import DropOldestQueue, MempoolPipeline, PendingTxFilter
+
+BRIDGE = "0x" + "ab" * 20
+OTHER = "0x" + "cd" * 20
+SELECTOR = "0x679b6ded"
+
+
+def _tx(i, to=BRIDGE, selector=SELECTOR):
+    return {"hash": hex(i), "to": to, "input": selector + "00" * 32}
+
+
+async def _stream(items):
+    for item in items:
+        yield item
+
+
+def test_filter_rejects_before_decode():
+    flt = PendingTxFilter([BRIDGE.upper().replace("0X", "0x")], [SELECTOR])
+    assert flt(_tx(1))
+    assert not flt(_tx(2, to=OTHER))
+    assert not flt(_tx(3, selector="0xdeadbeef"))
+    assert not flt({"hash": "0x4", "to": None, "input": SELECTOR})
+
+
+def test_drop_oldest_queue_keeps_freshest():
+    async def fill():
+        q = DropOldestQueue(maxsize=3)
+        for i in range(5):
+            q.put_nowait(i)
+        return [await q.get() for _ in range(3)], q.dropped
+
+    items, dropped = asyncio.run(fill())
+    assert items == [2, 3, 4] and dropped == 2
+
+
+def test_pipeline_fans_out_to_all_consumers():
+    seen_a, seen_b = [], []
+
+    async def slow(tx):
+        await asyncio.sleep(0)
+        seen_b.append(tx["hash"])
+
+    def broken(tx):
+        raise ValueError("boom")
+
+    pipeline = MempoolPipeline(PendingTxFilter([BRIDGE], [SELECTOR]))
+    pipeline.add_consumer("a", lambda tx: seen_a.append(tx["hash"]))
+    pipeline.add_consumer("b", slow)
+    pipeline.add_consumer("c", broken)
+    txs = [_tx(1), _tx(2, to=OTHER), "0xhashonly", _tx(3)]
+    asyncio.run(pipeline.run(_stream(txs)))
+
+    assert seen_a == seen_b == ["0x1", "0x3"]
+    stats = pipeline.stats()
+    assert stats["seen"] == 4 and stats["matched"] == 2
+    assert stats["consumers"]["c"]["errors"] == 2
+
+
+def test_stream_pending_transactions_over_wss():
+    async def node(ws):
+        sub = json.loads(await ws.recv())
+        assert sub["params"] == ["newPendingTransactions", True]
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": sub["id"], "result": "0xsub"}))
+        for i in range(3):
+            note = {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": "0xsub", "result": _tx(i)}}
+            await ws.send(json.dumps(note))
+        await ws.wait_closed()
+
+    async def run():
+        async with websockets.serve(node, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            service = BlockchainService.__new__(BlockchainService)
+            service.network, service.wss_url = "mainnet", f"ws://127.0.0.1:{port}"
+            received = []
+            async for tx in service.stream_pending_transactions():
+                received.append(tx)
+                if len(received) == 3:
+                    break
+            return received
+
+    received = asyncio.run(run())
+    assert [tx["hash"] for tx in received] == ["0x0", "0x1", "0x2"]
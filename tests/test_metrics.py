@@ -0,0 +1,77 @@
+import asyncio
+import random
+import urllib.request
+
+from fastapi.testclient import TestClient
+
+from src.core.metrics import STAGE_LATENCY, LatencyHistogram, MetricsRegistry, start_metrics_server
+from src.dashboard import create_app
+
+
+def test_histogram_buckets_bound_every_value():
+    hist = LatencyHistogram(max_us=10_000_000)
+    for value in list(range(0, 5000)) + [random.randrange(10_000_000) for _ in range(5000)]:
+        index = hist._index(value)
+        assert hist._lowest(index) <= value <= hist._highest(index)
+        assert hist._highest(index) - hist._lowest(index) <= max(1, value // 64)
+
+
+def test_histogram_quantiles_within_precision():
+    rng = random.Random(1)
+    hist = LatencyHistogram()
+    values = sorted(int(rng.expovariate(1 / 5000)) for _ in range(50000))
+    for v in values:
+        hist.record(v)
+    q = hist.quantiles((0.5, 0.99))
+    for quantile, exact in ((0.5, values[24999]), (0.99, values[49499])):
+        assert abs(q[quantile] * 1e6 - exact) <= exact / 60 + 1
+    assert hist.total == 50000 and hist.max_seen_us == values[-1]
+
+
+def test_timed_sync_and_async():
+    registry = MetricsRegistry()
+
+    @registry.timed("stage_seconds", stage="sync")
+    def work():
+        return 1
+
+    @registry.timed("stage_seconds", stage="async")
+    async def async_work():
+        await asyncio.sleep(0.01)
+        return 2
+
+    assert work() == 1
+    assert asyncio.run(async_work()) == 2
+    assert registry.histogram("stage_seconds", stage="sync").total == 1
+    slow = registry.histogram("stage_seconds", stage="async")
+    assert slow.total == 1 and slow.quantile(0.5) >= 0.009
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("rpc_seconds", "RPC latency")
+    registry.observe("rpc_seconds", 0.25, method="eth_call")
+    registry.gauge("queue_depth", lambda: 3)
+    text = registry.render()
+    assert "# TYPE rpc_seconds summary" in text
+    assert 'rpc_seconds{method="eth_call",quantile="0.99"} 0.25' in text
+    assert 'rpc_seconds_count{method="eth_call"} 1' in text
+    assert "queue_depth 3" in text
+
+
+def test_bot_exporter_served_through_the_dashboard():
+    registry = MetricsRegistry()
+    registry.observe(STAGE_LATENCY, 0.002, stage="detect_opportunity")
+    server = start_metrics_server(0, host="127.0.0.1", registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as direct:
+            assert 'mev_stage_latency_seconds_count{stage="detect_opportunity"} 1' in direct.read().decode()
+        resp = TestClient(create_app(metrics_url=url)).get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert 'mev_stage_latency_seconds_count{stage="detect_opportunity"} 1' in resp.text
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert TestClient(create_app(metrics_url=url)).get("/metrics").status_code == 503
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from src.ai.auto_scaler import AutoScaler, allocate_capital, auto_scale_modules, register_auto_scaler
+from src.core.strategy_runtime import StrategyRuntime
+from src.kill_switch import KillSwitch
+from src.ai.edge_pruner import prune_dead_edges
+from src.services.performance_store import PerformanceStore, StrategyPerf
+from src.services.trade_journal import TradeJournal
+
+
+def _trade(strategy, pnl, status="success", ts=1_000.0):
+    return {"strategy_id": strategy, "status": status, "timestamp_start": ts - 1, "timestamp_end": ts,
+            "pnl_usd_leg1": pnl}
+
+
+def test_streaming_stats_match_batch_definitions():
+    perf = StrategyPerf(halflife=1.0)
+    for pnl in (5.0, -2.0, 4.0, -6.0, 1.0):
+        perf.update(pnl)
+    perf.update(-1.0, success=False)
+    snap = perf.snapshot()
+    assert snap["trades"] == 6 and snap["fail_count"] == 1
+    assert snap["winrate"] == pytest.approx(3 / 6)
+    assert snap["avg_pnl"] == pytest.approx(1 / 6)
+    assert snap["loss"] == pytest.approx(9.0)
+    assert snap["drawdown"] == pytest.approx(6.0)  # equity peaks at 7, troughs at 1
+    # half-life of one trade: each new trade carries half the weight
+    expected = 5.0
+    for pnl in (-2.0, 4.0, -6.0, 1.0, -1.0):
+        expected = (expected + pnl) / 2
+    assert snap["ewma_pnl"] == pytest.approx(expected)
+
+
+def test_store_tails_the_journal(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = TradeJournal(path)
+    journal.record_many([_trade("arb", 10.0), _trade("arb", -4.0), _trade("nft", -1.0, status="failed")])
+    journal.flush(5)
+
+    store = PerformanceStore(path, batch_size=2)
+    assert store.poll() == 3
+    version = store.version
+    assert store.poll() == 0 and store.version == version
+    assert store.snapshot("arb")["avg_pnl"] == pytest.approx(3.0)
+    assert store.snapshot("nft")["fail_count"] == 1
+
+    journal.record(_trade("arb", 1.0))
+    journal.flush(5)
+    assert store.poll() == 1 and store.version > version
+    assert store.snapshot("arb")["trades"] == 3
+    journal.close()
+    store.close()
+
+
+def test_missing_journal_is_not_an_error(tmp_path):
+    store = PerformanceStore(str(tmp_path / "missing.db"))
+    assert store.poll() == 0 and store.snapshots() == {}
+
+
+def test_scaler_and_pruner_read_the_store():
+    store = PerformanceStore()
+    for pnl in (0.5, 0.2, 0.3):
+        store.record("arb", pnl)
+    for _ in range(3):
+        store.record("dead", -1.0, success=False)
+    allocation = auto_scale_modules({"starting_capital": 1000}, store=store)
+    assert allocation["arb"] == pytest.approx(1000.0)
+    assert allocation["dead"] == pytest.approx(10.0)
+    assert prune_dead_edges(store=store) == ["dead"]
+
+
+def test_fading_edge_is_judged_on_recent_pnl():
+    store = PerformanceStore(halflife=2.0)
+    for _ in range(10):
+        store.record("fading", 0.5)
+    for _ in range(6):
+        store.record("fading", -0.1)
+    snap = store.snapshot("fading")
+    assert snap["avg_pnl"] > 0 > snap["ewma_pnl"]
+    assert prune_dead_edges(store=store) == ["fading"]
+    lifetime = {"fading": dict(snap, ewma_pnl=snap["avg_pnl"], ewma_winrate=snap["winrate"])}
+    config = {"starting_capital": 1000}
+    assert allocate_capital(config, {"fading": snap})["fading"] < allocate_capital(config, lifetime)["fading"]
+
+
+def test_runtime_wires_the_auto_scaler_to_its_bus():
+    class Bus:
+        def __len__(self):
+            return 1
+
+        def on_head(self, chain, handler, name=None):
+            self.handler = handler
+
+    bus = Bus()
+    runtime = StrategyRuntime({"network": "mainnet", "alpha": {"enabled": []}}, kill=KillSwitch({}), bus=bus)
+    scaler = runtime.add_service("auto_scaler", lambda b, config: register_auto_scaler(b, config, PerformanceStore()))
+    assert bus.handler == scaler.on_head
+    assert runtime.stats() == {"auto_scaler": {"state": "subscribed"}}
+
+
+def test_auto_scaler_rebalances_per_block_only_on_new_trades():
+    class Bus:
+        def on_head(self, chain, handler, name=None):
+            self.chain, self.handler = chain, handler
+
+    store = PerformanceStore()
+    bus = Bus()
+    scaler = register_auto_scaler(bus, {"network": "mainnet", "starting_capital": 100}, store)
+    assert isinstance(scaler, AutoScaler) and bus.chain == "mainnet"
+    store.record("arb", 0.5)
+    asyncio.run(bus.handler({"number": "0x1"}))
+    first = scaler.allocation
+    assert first == {"arb": pytest.approx(100.0)}
+    asyncio.run(bus.handler({"number": "0x2"}))
+    assert scaler.allocation is first  # nothing new: no recompute
+    store.record("arb", -2.0)
+    asyncio.run(bus.handler({"number": "0x3"}))
+    assert scaler.allocation["arb"] == pytest.approx(1.0)
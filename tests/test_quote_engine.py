@@ -0,0 +1,71 @@
+import math
+
+from src.pricing.quote_engine import (
+    Q96, SYNC_TOPIC, V3_MINT_TOPIC, V3_SWAP_TOPIC, QuoteEngine, V2Pool, V3Pool,
+)
+
+WETH = "0x" + "aa" * 20
+USDC = "0x" + "bb" * 20
+PAIR = "0x" + "01" * 20
+POOL = "0x" + "02" * 20
+
+
+def word(value):
+    return value.to_bytes(32, "big", signed=value < 0)
+
+
+def test_v2_quote_matches_router_formula():
+    pool = V2Pool(WETH, USDC, reserve0=1000 * 10 ** 18, reserve1=3_500_000 * 10 ** 6)
+    amount_in = 10 ** 18
+    expected = amount_in * 997 * pool.reserve1 // (pool.reserve0 * 1000 + amount_in * 997)
+    assert pool.get_amount_out(amount_in, True) == expected
+    needed = pool.get_amount_in(expected, True)
+    assert pool.get_amount_out(needed, True) >= expected
+
+
+def test_sync_log_updates_reserves():
+    engine = QuoteEngine()
+    engine.add_pool(PAIR, V2Pool(WETH, USDC, 1, 1))
+    log = {"address": PAIR, "topics": [SYNC_TOPIC], "data": word(500 * 10 ** 18) + word(2_000_000 * 10 ** 6), "blockNumber": 7}
+    assert engine.apply_logs([log]) == 1
+    pool = engine.get_pool(PAIR)
+    assert (pool.reserve0, pool.block_number) == (500 * 10 ** 18, 7)
+    assert engine.quote(PAIR, USDC, 4000 * 10 ** 6) > 0
+
+
+def test_v3_single_range_matches_constant_product():
+    liquidity = 10 ** 20
+    sqrt_price_x96 = int(math.sqrt(3500e-12) * Q96)
+    v3 = V3Pool(WETH, USDC, fee=0, tick_spacing=60, sqrt_price_x96=sqrt_price_x96, liquidity=liquidity, tick=0)
+    x0, y0, _ = v3.virtual_reserves()
+    amount_in = 10 ** 17
+    expected = amount_in * y0 / (x0 + amount_in)
+    assert abs(v3.get_amount_out(amount_in, True) - expected) / expected < 1e-7
+
+
+def test_v3_swap_crosses_out_of_liquidity():
+    sqrt_price_x96 = Q96  # price 1.0, tick 0
+    bounded = V3Pool(WETH, USDC, fee=3000, tick_spacing=60, sqrt_price_x96=sqrt_price_x96,
+                     liquidity=10 ** 18, tick=0, ticks={-600: 10 ** 18, 600: -10 ** 18})
+    unbounded = V3Pool(WETH, USDC, fee=3000, tick_spacing=60, sqrt_price_x96=sqrt_price_x96, liquidity=10 ** 18, tick=0)
+    small = 10 ** 15
+    assert bounded.get_amount_out(small, True) == unbounded.get_amount_out(small, True)
+    huge = 10 ** 19
+    capped = bounded.get_amount_out(huge, True)
+    assert capped < unbounded.get_amount_out(huge, True)
+    # Everything between tick -600 and 0 is drained and no more
+    assert abs(capped - 10 ** 18 * (1 - 1.0001 ** -300)) < 1e9
+
+
+def test_v3_swap_and_mint_logs():
+    engine = QuoteEngine()
+    engine.add_pool(POOL, V3Pool(WETH, USDC, fee=500, tick_spacing=10))
+    swap = {"address": POOL, "topics": [V3_SWAP_TOPIC, word(0), word(0)],
+            "data": word(1) + word(-1) + word(Q96) + word(10 ** 18) + word(-5)}
+    mint = {"address": POOL, "topics": [V3_MINT_TOPIC, word(0), word(-100), word(100)],
+            "data": word(0) + word(10 ** 17) + word(1) + word(1)}
+    assert engine.apply_logs([swap, mint]) == 2
+    pool = engine.get_pool(POOL)
+    assert pool.tick == -5
+    assert pool.liquidity == 10 ** 18 + 10 ** 17
+    assert pool.liquidity_net == {-100: 10 ** 17, 100: -10 ** 17}
@@ -0,0 +1,111 @@
+from eth_abi import encode
+
+from src.core.replay import (BLOCK, LOG, POOL, TX, CrossChainArbReplay, CrossLayerSandwichReplay, ReplayEngine,
+                             ReplayWriter, read_events, run_backtest)
+from src.pricing.quote_engine import SYNC_TOPIC, V2Pool
+from src.services.calldata_decoder import selector_of
+
+WETH = "0x" + "aa" * 20
+USDC = "0x" + "bb" * 20
+POOL_MAIN = "0x" + "01" * 20
+POOL_L2 = "0x" + "02" * 20
+BRIDGE = "0x" + "4d" * 20
+SWAP_SIG = "0x7ff36ab5"
+
+CONFIG = {
+    "eth_address": WETH,
+    "usdc_decimals": 6,
+    "max_trade_amount_eth": 50,
+    "min_profit_usd": 3,
+    "replay_gas_usd": 2.0,
+    "replay_sandwich_profit_usd": 1.5,
+    "contracts": {"arbitrum_bridge": BRIDGE, "target_dex_sig": SWAP_SIG},
+    "risk": {"max_loss_usd": 1000, "max_drawdown_pct": 5},
+}
+
+
+def _sync(pool, eth, usd, block):
+    data = encode(["uint112", "uint112"], [eth * 10 ** 18, usd * 10 ** 6])
+    return {"address": pool, "topics": [SYNC_TOPIC], "data": data, "blockNumber": block}
+
+
+def _bridge_tx(i):
+    swap = bytes.fromhex(SWAP_SIG[2:]) + encode(["uint256", "address[]", "address", "uint256"],
+                                                [1, ["0x" + "11" * 20], "0x" + "22" * 20, 0])
+    retryable = selector_of("createRetryableTicket(address,uint256,uint256,address,address,uint256,uint256,bytes)")
+    args = ["0x" + "22" * 20, 0, 0, "0x" + "22" * 20, "0x" + "22" * 20, 100000, 1, swap]
+    data = retryable + encode(["address", "uint256", "uint256", "address", "address", "uint256", "uint256", "bytes"], args)
+    return {"hash": "0x%064x" % i, "to": BRIDGE, "input": "0x" + data.hex(), "value": 0}
+
+
+def _record(path, blocks=600):
+    with ReplayWriter(str(path)) as w:
+        w.pool("mainnet", POOL_MAIN, V2Pool(WETH, USDC, 1000 * 10 ** 18, 3_500_000 * 10 ** 6), ts=1_000.0)
+        w.pool("arbitrum", POOL_L2, V2Pool(WETH, USDC, 1000 * 10 ** 18, 3_500_000 * 10 ** 6), ts=1_000.0)
+        for n in range(blocks):
+            ts = 1_000.0 + 12 * n
+            # Every tenth block the L2 price dislocates by 2%, then reverts
+            usd = 3_570_000 if n % 10 == 5 else 3_500_000
+            w.log("arbitrum", _sync(POOL_L2, 1000, usd, n), ts=ts)
+            if n % 50 == 0:
+                w.pending_tx("mainnet", _bridge_tx(n), ts=ts + 1)
+                w.pending_tx("mainnet", dict(_bridge_tx(n + 1), to="0x" + "99" * 20), ts=ts + 1)
+            w.block("mainnet", {"number": n, "timestamp": int(ts), "hash": "0x%064x" % n, "baseFeePerGas": 10 ** 9})
+        return w.records
+
+
+def test_recording_round_trips(tmp_path):
+    path = tmp_path / "rec.bin.gz"
+    records = _record(path, blocks=20)
+    events = list(read_events(str(path)))
+    assert len(events) == records - 2  # two chain declarations
+    kinds = [e.kind for e in events]
+    assert kinds[:2] == [POOL, POOL] and BLOCK in kinds and LOG in kinds and TX in kinds
+    block = next(e for e in events if e.kind == BLOCK)
+    assert block.chain == "mainnet" and block.payload["number"] == 0 and block.payload["baseFeePerGas"] == 10 ** 9
+    log = next(e for e in events if e.kind == LOG)
+    assert log.chain == "arbitrum" and log.payload["address"] == POOL_L2
+    assert bytes.fromhex(log.payload["topics"][0][2:]) == bytes(SYNC_TOPIC)
+    tx = next(e for e in events if e.kind == TX)
+    assert tx.payload["to"] == BRIDGE and tx.payload["input"].startswith("0x")
+
+
+def test_replay_is_deterministic_and_fast(tmp_path):
+    path = tmp_path / "rec.bin.gz"
+    _record(path)
+    reports = [run_backtest(CONFIG, str(path)) for _ in range(2)]
+    first, second = (r["strategies"] for r in reports)
+    for name in ("cross_chain", "cross_layer_sandwich"):
+        assert first[name]["decisions"] == second[name]["decisions"]
+        assert first[name]["pnl_usd"] == second[name]["pnl_usd"]
+    assert first["cross_chain"]["decisions"] == 60  # one per dislocated block
+    assert first["cross_chain"]["pnl_usd"] > 0
+    assert first["cross_layer_sandwich"]["decisions"] == 12
+    assert abs(first["cross_layer_sandwich"]["pnl_usd"] - 18.0) < 1e-9
+    assert first["cross_chain"]["decision_latency_us"]["p99"] > 0
+    assert reports[0]["simulated_seconds"] == 12 * 599 + 0.0
+    assert reports[0]["speedup"] > 100
+
+
+def test_persistent_spread_is_booked_once_until_the_pools_move(tmp_path):
+    path = tmp_path / "rec.bin.gz"
+    with ReplayWriter(str(path)) as w:
+        w.pool("mainnet", POOL_MAIN, V2Pool(WETH, USDC, 1000 * 10 ** 18, 3_500_000 * 10 ** 6), ts=1_000.0)
+        w.pool("arbitrum", POOL_L2, V2Pool(WETH, USDC, 1000 * 10 ** 18, 3_570_000 * 10 ** 6), ts=1_000.0)
+        for n in range(10):
+            if n == 6:
+                w.log("arbitrum", _sync(POOL_L2, 1000, 3_580_000, n), ts=1_000.0 + 12 * n)
+            w.block("mainnet", {"number": n, "hash": "0x%064x" % n}, ts=1_000.0 + 12 * n)
+    report = run_backtest(CONFIG, str(path), ["cross_chain"])["strategies"]["cross_chain"]
+    assert report["decisions"] == 2 and report["events"] == 11
+
+
+def test_kill_switch_halts_on_simulated_time(tmp_path):
+    path = tmp_path / "rec.bin.gz"
+    _record(path, blocks=100)
+    losing = dict(CONFIG, replay_sandwich_profit_usd=-4.0, risk={"max_loss_usd": 5, "max_drawdown_pct": 5})
+    engine = ReplayEngine([CrossLayerSandwichReplay(losing), CrossChainArbReplay(losing)], losing)
+    report = engine.run(read_events(str(path)))["strategies"]
+    assert report["cross_layer_sandwich"]["decisions"] == 2
+    assert report["cross_layer_sandwich"]["halted_at"] == 1_000.0 + 12 * 50 + 1
+    assert report["cross_chain"]["halted_at"] is None
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from src.kill_switch import KillSwitch
+from src.risk_manager import RiskManager
+from src.risk_window import Drawdown, RollingWindow, window_specs
+
+
+def test_rolling_window_matches_brute_force():
+    rng = random.Random(7)
+    window = RollingWindow(span=10.0, capacity=64)
+    events = []
+    now = 0.0
+    for _ in range(2000):
+        now += rng.random() * 0.5
+        value = rng.uniform(-50, 50)
+        window.add(now, value)
+        events.append((now, value))
+        live = [v for t, v in events if t > now - 10.0][-64:]
+        assert len(window) == len(live)
+        assert abs(window.sum - sum(live)) < 1e-6
+        assert window.min == min(live)
+        assert window.max == max(live)
+
+
+def test_rolling_window_expires_and_resets():
+    window = RollingWindow(span=60.0, capacity=8)
+    window.add(0.0, -5.0)
+    window.add(30.0, 3.0)
+    window.expire(61.0)
+    assert window.snapshot() == {"sum": 3.0, "count": 1, "min": 3.0, "max": 3.0}
+    window.expire(200.0)
+    assert len(window) == 0 and window.sum == 0.0 and window.min == 0.0
+
+
+def test_drawdown_is_peak_to_trough():
+    dd = Drawdown(1000.0)
+    dd.update(100.0)
+    dd.update(-50.0)
+    assert dd.drawdown_usd == 50.0
+    assert abs(dd.drawdown_pct - 50.0 / 11) < 1e-9
+    dd.update(80.0)
+    assert dd.drawdown_usd == 0.0
+    assert dd.max_drawdown_usd == 50.0
+
+
+def test_kill_switch_uses_time_windows():
+    now = [0.0]
+    ks = KillSwitch({"risk": {"max_loss_usd": 10}}, clock=lambda: now[0])
+    ks.update_pnl(-6)
+    now[0] = 86401.0  # first loss has left the 24h window
+    ks.update_pnl(-6)
+    assert ks.state == KillSwitch.RUNNING
+    assert ks.pnl_snapshot()["1m"]["sum"] == -6
+    ks.update_pnl(-6)
+    assert ks.state == KillSwitch.HALT
+
+
+def test_risk_manager_enforces_drawdown_pct():
+    ks = KillSwitch({})
+    rm = RiskManager({"starting_capital": 1000, "risk": {"max_drawdown_pct": 5, "max_loss_usd": 500}}, ks)
+    assert rm.update_drawdown(200)
+    assert rm.update_drawdown(-55)  # 4.6% below the 1200 peak
+    assert not rm.update_drawdown(-10)  # 5.4%
+    assert ks.state == KillSwitch.HALT
+
+
+def test_risk_manager_profit_is_not_a_breach():
+    ks = KillSwitch({})
+    rm = RiskManager({"risk": {"max_loss_usd": 10}}, ks)
+    assert rm.update_drawdown(50)
+    assert rm.update_drawdown(-9)
+    assert ks.state == KillSwitch.RUNNING
+
+
+def test_large_win_is_not_a_loss():
+    ks = KillSwitch({"risk": {"max_loss_usd": 10}})
+    ks.update_pnl(50)
+    assert ks.state == KillSwitch.RUNNING
+    ks.update_pnl(-11)
+    assert ks.state == KillSwitch.HALT
+
+
+def test_shorter_windows_enforce_their_own_limits():
+    now = [0.0]
+    cfg = {"risk": {"max_loss_usd": 100, "window_loss_usd": {"1m": 10}}}
+    ks = KillSwitch(cfg, clock=lambda: now[0])
+    ks.update_pnl(-6)
+    now[0] = 61.0  # out of the 1m window, still inside 24h
+    ks.update_pnl(-6)
+    assert ks.state == KillSwitch.RUNNING
+    ks.update_pnl(-6)
+    assert ks.state == KillSwitch.HALT
+    with pytest.raises(ValueError):
+        KillSwitch({"risk": {"window_loss_usd": {"5m": 1}}})
+
+
+def test_window_rings_are_sized_from_the_trade_rate():
+    ks = KillSwitch({"risk": {"max_trades_per_min": 2}})
+    assert {name: w.capacity for name, w in ks.pnl_windows.windows.items()} == {"1m": 64, "1h": 120, "24h": 2880}
+    assert window_specs(10)["24h"] == (86400.0, 14400)
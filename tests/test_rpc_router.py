@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config_manager import rpc_endpoints
+from src.services.async_blockchain_service import RPCError
+from src.services.rpc_router import RpcRouter
+
+
+class FakeTransport:
+    def __init__(self, delay=0.0, fail=False, rpc_error=False):
+        self.delay = delay
+        self.fail = fail
+        self.rpc_error = rpc_error
+        self.calls = 0
+
+    async def request(self, method, params=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("down")
+        if self.rpc_error:
+            raise RPCError(method, {"code": 3, "message": "execution reverted"})
+        return f"{method}:{self.delay}"
+
+    async def close(self):
+        pass
+
+
+def make_router(*transports, **kwargs):
+    router = RpcRouter([f"http://node{i}" for i in range(len(transports))], **kwargs)
+    for ep, transport in zip(router.endpoints, transports):
+        ep.transport = transport
+    return router
+
+
+def test_routes_to_fastest_endpoint():
+    slow, fast = FakeTransport(delay=0.02), FakeTransport(delay=0.0)
+    router = make_router(slow, fast)
+    router.endpoints[0].stats.record(0.02, True)
+    router.endpoints[1].stats.record(0.001, True)
+    assert asyncio.run(router.request("eth_blockNumber")) == "eth_blockNumber:0.0"
+    assert slow.calls == 0
+
+
+def test_failover_and_benching():
+    down, up = FakeTransport(fail=True), FakeTransport()
+    router = make_router(down, up, max_consecutive_failures=1)
+    assert asyncio.run(router.request("eth_gasPrice")) == "eth_gasPrice:0.0"
+    stats = router.stats()
+    assert stats["http://node0"]["healthy"] is False
+    assert stats["http://node0"]["error_rate"] == 1.0
+    assert router.ranked()[0].url == "http://node1"
+
+
+def test_benched_endpoint_recovers_after_cooldown():
+    flaky, up = FakeTransport(fail=True), FakeTransport(delay=0.01)
+    router = make_router(flaky, up, max_consecutive_failures=1, cooldown=0.05)
+    router.endpoints[0].stats.record(0.001, True)
+    router.endpoints[1].stats.record(0.01, True)
+    assert asyncio.run(router.request("eth_gasPrice")) == "eth_gasPrice:0.01"
+    assert router.ranked()[0].url == "http://node1"
+    flaky.fail = False
+    asyncio.run(asyncio.sleep(0.06))
+    assert router.ranked()[0].url == "http://node0"
+    assert router.stats()["http://node0"] == pytest.approx(
+        {"p50_ms": 1.0, "p99_ms": 1.0, "error_rate": 0.0, "requests": 2, "healthy": True})
+    assert asyncio.run(router.request("eth_gasPrice")) == "eth_gasPrice:0.0"
+
+
+def test_hedged_call_takes_first_answer():
+    stalled, quick = FakeTransport(delay=0.5), FakeTransport(delay=0.0)
+    router = make_router(stalled, quick, hedge_after=0.01)
+    result = asyncio.run(router.request("eth_call", [{}, "latest"]))
+    assert result == "eth_call:0.0"
+    assert router.hedges_sent == 1 and router.hedges_won == 1
+
+
+def test_node_errors_do_not_fail_over():
+    reverting, other = FakeTransport(rpc_error=True), FakeTransport()
+    router = make_router(reverting, other)
+    with pytest.raises(RPCError):
+        asyncio.run(router.request("eth_blockNumber"))
+    assert other.calls == 0
+    assert router.stats()["http://node0"]["error_rate"] == 0.0
+
+
+def test_rpc_endpoints_orders_primary_first():
+    config = SimpleNamespace(
+        rpc=SimpleNamespace(root={"mainnet": {"fallback": "http://b", "primary": "http://a"}}),
+        rpc_urls=SimpleNamespace(root={"mainnet": "http://a"}),
+    )
+    assert rpc_endpoints(config, "mainnet") == ["http://a", "http://b"]
+
+
+def test_error_rate_needs_a_full_sample_before_benching():
+    flaky, up = FakeTransport(fail=True), FakeTransport()
+    router = make_router(flaky, up, max_consecutive_failures=10, min_error_samples=20, hedge_after=None)
+    router.endpoints[0].stats.record(0.001, True)
+    router.endpoints[1].stats.record(0.01, True)
+    asyncio.run(router.request("eth_gasPrice"))
+    assert router.stats()["http://node0"]["error_rate"] == 0.5
+    assert router.ranked()[0].url == "http://node0"  # one failure in two requests is not a verdict
+
+    for _ in range(18):
+        router.endpoints[0].stats.record(0.001, True)
+    flaky.calls = 0
+    asyncio.run(router.request("eth_gasPrice"))
+    assert flaky.calls == 1 and router.ranked()[0].url == "http://node0"  # 2/21 failed, under 25%
+
+
+def test_percentiles_are_resorted_in_batches():
+    router = make_router(FakeTransport())
+    stats = router.endpoints[0].stats
+    stats.resort_every, stats.resort_interval = 4, 60.0
+    stats.record(0.010, True)
+    assert stats.p50 == 0.010
+    for _ in range(3):
+        stats.record(0.001, True)
+    assert stats.p50 == 0.010  # snapshot kept until resort_every new samples arrive
+    stats.record(0.001, True)
+    assert stats.p50 == 0.001
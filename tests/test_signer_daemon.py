@@ -0,0 +1,116 @@
+import os
+import socket
+import time
+
+import pytest
+from eth_account import Account
+from web3 import Web3
+
+from src.signer_daemon import RemoteSigner, SignerDaemon, connect_signer, socket_path_from_config
+from src.signer_service import SignerService
+
+TO = Web3.to_checksum_address("0x" + "22" * 20)
+
+
+def _local_signer(monkeypatch):
+    acct = Account.create()
+    monkeypatch.setenv("ENCRYPTION_PASSWORD", "pass")
+    monkeypatch.setenv("PRIVATE_KEY_ENC", SignerService.encrypt_private_key(acct.key.hex(), "pass"))
+    return SignerService()
+
+
+def test_remote_signatures_match_local(monkeypatch, tmp_path):
+    local = _local_signer(monkeypatch)
+    path = str(tmp_path / "signer.sock")
+    daemon = SignerDaemon(path, local)
+    daemon.serve_in_thread()
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        remote = RemoteSigner(path)
+        tx = {"to": TO, "value": 1, "gas": 21000, "gasPrice": 10 ** 9, "nonce": 0, "chainId": 1, "data": b"\x01\x02"}
+        assert remote.get_eth_address() == local.get_eth_address()
+        assert remote.sign_eth_tx(tx) == local.sign_eth_tx(tx)
+        assert remote.presign_gas_ladder(tx).select(10 ** 9) == local.sign_eth_tx(tx)
+        remote.close()
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+    assert not os.path.exists(path)
+
+
+def test_connect_signer_falls_back_without_daemon(tmp_path):
+    config = {"signer": {"type": "daemon", "endpoint": f"unix://{tmp_path}/missing.sock"}}
+    assert socket_path_from_config(config) == f"{tmp_path}/missing.sock"
+    assert socket_path_from_config({"signer": {"type": "local"}}) is None
+    assert connect_signer(config, fallback=lambda: "local") == "local"
+
+
+def test_daemon_refuses_to_steal_a_live_socket(monkeypatch, tmp_path):
+    local = _local_signer(monkeypatch)
+    path = str(tmp_path / "signer.sock")
+    daemon = SignerDaemon(path, local)
+    daemon.serve_in_thread()
+    try:
+        with pytest.raises(FileExistsError):
+            SignerDaemon(path, local)
+        assert RemoteSigner(path).get_eth_address() == local.get_eth_address()
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+
+
+def test_stale_socket_is_replaced(monkeypatch, tmp_path):
+    local = _local_signer(monkeypatch)
+    path = str(tmp_path / "signer.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # file left behind with nobody listening
+    daemon = SignerDaemon(path, local)
+    daemon.server_close()
+
+
+def test_remote_signer_reconnects_after_daemon_restart(monkeypatch, tmp_path):
+    local = _local_signer(monkeypatch)
+    path = str(tmp_path / "signer.sock")
+    daemon = SignerDaemon(path, local)
+    daemon.serve_in_thread()
+    remote = RemoteSigner(path)
+    daemon.shutdown()
+    daemon.server_close()
+    remote._sock.shutdown(socket.SHUT_RDWR)  # the old connection is gone with the daemon
+    daemon = SignerDaemon(path, local)
+    daemon.serve_in_thread()
+    try:
+        tx = {"to": TO, "value": 1, "gas": 21000, "gasPrice": 10 ** 9, "nonce": 0, "chainId": 1}
+        assert remote.sign_eth_tx(tx) == local.sign_eth_tx(tx)
+        remote.close()
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+
+
+def test_timed_out_stream_is_never_reused(monkeypatch, tmp_path):
+    local = _local_signer(monkeypatch)
+    path = str(tmp_path / "signer.sock")
+    daemon = SignerDaemon(path, local)
+    daemon.serve_in_thread()
+    try:
+        remote = RemoteSigner(path, timeout=0.2)
+        slow_sign = local.sign_eth_tx
+        delays = [0.5]
+
+        def sign_after_delay(tx):
+            time.sleep(delays.pop() if delays else 0)
+            return slow_sign(tx)
+
+        monkeypatch.setattr(local, "sign_eth_tx", sign_after_delay)
+        first = {"to": TO, "value": 1, "gas": 21000, "gasPrice": 10 ** 9, "nonce": 0, "chainId": 1}
+        second = dict(first, nonce=1)
+        with pytest.raises(OSError):
+            remote.sign_eth_tx(first)
+        time.sleep(0.4)  # the late response to ``first`` arrives on the dropped connection
+        assert remote.sign_eth_tx(second) == slow_sign(second)
+        remote.close()
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.pricing.quote_engine import V2Pool
+from src.pricing.sizing import optimal_trade_size, pool_reserves, profit_curve
+
+WETH = "0x" + "aa" * 20
+USDC = "0x" + "bb" * 20
+
+
+def test_pool_reserves_orientation():
+    pool = V2Pool(USDC, WETH, reserve0=3_500_000 * 10 ** 6, reserve1=1000 * 10 ** 18)
+    eth, usd, fee = pool_reserves(pool, WETH)
+    assert (eth, usd, fee) == (1000.0, 3_500_000.0, 0.003)
+
+
+def test_no_trade_when_prices_match():
+    venue = (1000.0, 3_500_000.0, 0.003)
+    best = optimal_trade_size(venue, venue, gas_usd=5)
+    assert best["net_profit_usd"] < 0
+
+
+def test_interior_optimum_and_direction():
+    cheap = (1000.0, 3_400_000.0, 0.003)
+    rich = (1000.0, 3_600_000.0, 0.003)
+    best = optimal_trade_size(rich, cheap, bridge_fee_bps=8, gas_usd=10)
+    assert best["buy"] == "b"
+    assert best["net_profit_usd"] > 0
+    profits = best["profits"]
+    assert profits.shape == best["sizes"].shape
+    # the optimum is interior: both smaller and larger trades earn less
+    i = int(np.argmax(profits))
+    assert 0 < i < len(profits) - 1
+    # agrees with a direct evaluation at the chosen size
+    direct = profit_curve(cheap, rich, np.array([best["size_eth"]]), 8, 10)[0]
+    assert abs(direct - best["net_profit_usd"]) < 1e-6
+
+
+def test_sizes_beyond_reserves_are_rejected():
+    curve = profit_curve((10.0, 35_000.0, 0.003), (10.0, 36_000.0, 0.003), np.array([5.0, 10.0, 20.0]))
+    assert np.isneginf(curve[1:]).all()
+
+
+@pytest.mark.benchmark
+def test_grid_search_is_fast():
+    cheap = (1000.0, 3_400_000.0, 0.003)
+    rich = (1000.0, 3_600_000.0, 0.003)
+    optimal_trade_size(rich, cheap)
+    start = time.perf_counter()
+    for _ in range(100):
+        optimal_trade_size(rich, cheap, n=4096)
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+def test_trade_size_cap_defaults_to_trade_amount_and_capital():
+    from src.alpha.cross_chain_arb import max_trade_size_eth
+
+    assert max_trade_size_eth({}, 3000.0) == 0.1
+    assert max_trade_size_eth({"trade_amount_eth": 0.5}, 3000.0) == 0.5
+    assert max_trade_size_eth({"trade_amount_eth": 0.5, "max_trade_amount_eth": 2}, 3000.0) == 2
+    assert max_trade_size_eth({"max_trade_amount_eth": 2, "starting_capital": 3000}, 3000.0) == 1.0
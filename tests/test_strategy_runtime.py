@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+from src.core.strategy_runtime import StrategyBudget, StrategyRunner, StrategyRuntime
+from src.kill_switch import KillSwitch
+
+
+def _runtime(strategies, **budgets):
+    kill = KillSwitch({})
+    config = {"alpha": {"budgets": budgets}}
+    return StrategyRuntime(config, strategies, kill=kill, sample_interval=0.01), kill
+
+
+def test_strategies_run_concurrently_and_stop_on_halt():
+    release = threading.Event()
+    calls = {"fast": 0}
+
+    def blocking(config):
+        release.wait(5)
+
+    def fast(config):
+        calls["fast"] += 1
+
+    async def halt_later(kill):
+        await asyncio.sleep(0.1)
+        kill.state = kill.HALT
+        release.set()
+
+    runtime, kill = _runtime({"blocking": blocking, "fast": fast}, fast={"interval_sec": 0.0})
+
+    async def main():
+        await asyncio.gather(runtime.run(), halt_later(kill))
+
+    asyncio.run(main())
+    stats = runtime.stats()
+    assert calls["fast"] > 5  # kept running while "blocking" never returned
+    assert stats["fast"]["state"] == "stopped"
+
+
+def test_crashing_strategy_is_restarted_in_isolation():
+    attempts = []
+
+    def flaky(config):
+        attempts.append(1)
+        raise RuntimeError("boom")
+
+    runtime, kill = _runtime({"flaky": flaky, "ok": lambda config: None},
+                             flaky={"interval_sec": 0.0, "max_restarts": 2}, ok={"interval_sec": 0.0})
+    for runner in runtime.runners.values():
+        runner.budget.backoff_sec = 0.001
+
+    async def main():
+        task = asyncio.ensure_future(runtime.run())
+        while runtime.runners["flaky"].state != "failed":
+            await asyncio.sleep(0.005)
+        assert runtime.runners["ok"].state != "failed"
+        kill.state = kill.HALT
+        await task
+
+    asyncio.run(main())
+    assert len(attempts) == 3
+    assert runtime.stats()["flaky"]["last_error"] == "boom"
+    assert runtime.runners["ok"].runs > 0
+
+
+def test_budget_violations_throttle_next_run():
+    runner = StrategyRunner("busy", lambda config: None, {}, KillSwitch({}), StrategyBudget(cpu_pct=25, latency_ms=10))
+    delay = runner._account(wall=0.05, cpu=0.05)
+    assert runner.latency_violations == 1 and runner.cpu_violations == 1
+    assert abs(delay - 0.15) < 1e-9  # 0.05s CPU over 0.2s total == 25%
+
+
+def test_unknown_strategy_is_reported_not_fatal():
+    runtime, _ = _runtime(["does_not_exist"])
+    assert runtime.runners == {}
+    assert runtime.stats()["does_not_exist"]["state"] == "failed"
+
+
+def test_invalid_budget_falls_back_to_the_default():
+    config = {"alpha": {"budgets": {"bad": {"latency_msec": 5}, "good": {"latency_ms": 5}}}}
+    runtime = StrategyRuntime(config, {"bad": lambda config: None, "good": lambda config: None}, kill=KillSwitch({}))
+    assert runtime.runners["bad"].budget.latency_ms == StrategyBudget().latency_ms
+    assert runtime.runners["good"].budget.latency_ms == 5
+
+
+def test_paused_kill_switch_holds_new_runs():
+    calls = []
+    runtime, kill = _runtime({"s": lambda config: calls.append(1)}, s={"interval_sec": 0.01})
+    kill.state = kill.PAUSE
+
+    async def main():
+        task = asyncio.ensure_future(runtime.run())
+        await asyncio.sleep(0.05)
+        assert runtime.runners["s"].state == "paused"
+        kill.state = kill.HALT
+        await task
+
+    asyncio.run(main())
+    assert calls == []
+
+
+def test_runtime_returns_on_halt_with_a_strategy_that_never_returns():
+    forever = threading.Event()
+
+    def never_returns(config):
+        forever.wait()
+
+    async def never_returns_async(config):
+        await asyncio.Event().wait()
+
+    kill = KillSwitch({})
+    runtime = StrategyRuntime({}, {"stuck": never_returns, "stuck_async": never_returns_async}, kill=kill,
+                              sample_interval=5.0)
+
+    async def main():
+        task = asyncio.ensure_future(runtime.run())
+        await asyncio.sleep(0.1)
+        kill.state = kill.HALT
+        halted_at = asyncio.get_running_loop().time()
+        await asyncio.wait_for(task, 2)
+        return asyncio.get_running_loop().time() - halted_at
+
+    assert asyncio.run(main()) < 0.5
+    assert {s["state"] for s in runtime.stats().values()} == {"stopped"}
+    forever.set()
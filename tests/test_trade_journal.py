@@ -0,0 +1,95 @@
+import sqlite3
+import time
+
+from src.monitoring import Monitoring, record_trade
+from src.services import trade_journal
+from src.services.trade_journal import TradeJournal
+
+
+def _trade(i, strategy="cross_chain"):
+    return {"strategy_id": strategy, "status": "success", "timestamp_start": 1000.0 + i,
+            "tx_hash_leg1": f"0x{i:064x}", "pnl_usd_leg1": 1.5, "gas_used_leg1": 21000}
+
+
+def test_journal_is_wal_and_indexed(tmp_path):
+    path = str(tmp_path / "trades.db")
+    journal = TradeJournal(path)
+    journal.close()
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"idx_trades_strategy_id", "idx_trades_timestamp_start", "idx_trades_tx_hash_leg1"} <= indexes
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM trades WHERE tx_hash_leg1 = ?", ("0x1",)).fetchall()
+    assert "idx_trades_tx_hash_leg1" in str(plan)
+
+
+def test_batched_writes_keep_up_with_backtests(tmp_path):
+    path = str(tmp_path / "trades.db")
+    journal = TradeJournal(path)
+    start = time.perf_counter()
+    for i in range(20000):
+        journal.record(_trade(i, "a" if i % 2 else "b"))
+    enqueue = time.perf_counter() - start
+    assert journal.flush(timeout=30)
+    elapsed = time.perf_counter() - start
+    journal.close()
+
+    assert enqueue < 0.5  # record() only enqueues
+    assert 20000 / elapsed > 5000
+    assert journal.rows_written == 20000 and journal.batches_written < 100
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM trades WHERE strategy_id = 'a'").fetchone()[0] == 10000
+
+
+def test_close_persists_queued_trades(tmp_path):
+    path = str(tmp_path / "trades.db")
+    journal = TradeJournal(path)
+    journal.record_many(_trade(i) for i in range(10))
+    journal.close()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 10
+
+
+def test_monitoring_record_trade_persists(tmp_path):
+    path = str(tmp_path / "trades.db")
+    journal = TradeJournal(path)
+    monitor = Monitoring(sqlite3.connect(path), journal)
+    monitor.record_trade("0xabc", 12.5, 0.2, strategy_id="l2_sandwich", opportunity_id="opp-1")
+    journal.flush(timeout=5)
+    row = sqlite3.connect(path).execute(
+        "SELECT strategy_id, status, tx_hash_leg1, pnl_usd_leg1, opportunity_id, timestamp_end - timestamp_start FROM trades"
+    ).fetchone()
+    assert row[:5] == ("l2_sandwich", "success", "0xabc", 12.5, "opp-1")
+    assert abs(row[5] - 0.2) < 1e-6
+
+
+def test_record_trade_goes_to_the_process_journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_journal, "JOURNAL", None)
+    path = str(tmp_path / "data" / "trades.db")
+    journal = trade_journal.init_trade_journal(path)
+    assert trade_journal.init_trade_journal("elsewhere.db") is journal
+    record_trade("cross_chain", 4.0, 0.5, status="simulated", token_in_amount_wei=str(10**18))
+    record_trade("cross_chain", 0.0, 0.1, status="failed", error_message_leg1="bridge down")
+    journal.close()
+    rows = sqlite3.connect(path).execute(
+        "SELECT strategy_id, status, pnl_usd_leg1, token_in_amount_wei, error_message_leg1 FROM trades ORDER BY rowid"
+    ).fetchall()
+    assert rows == [("cross_chain", "simulated", 4.0, str(10**18), None),
+                    ("cross_chain", "failed", 0.0, None, "bridge down")]
+
+
+def test_tx_hash_bytes_and_receipt_gas_are_stored_as_columns(tmp_path):
+    from hexbytes import HexBytes
+    from web3.datastructures import AttributeDict
+
+    from src.alpha.cross_chain_arb import TransactionManager
+
+    path = str(tmp_path / "trades.db")
+    journal = TradeJournal(path)
+    receipt = AttributeDict({"status": 1, "gasUsed": 120000, "effectiveGasPrice": 25 * 10 ** 9})
+    fields = TransactionManager.gas_fields({"gasPrice": 30 * 10 ** 9}, receipt)
+    record_trade("cross_chain", 3.0, 0.4, HexBytes("0x" + "ab" * 32), journal=journal, **fields)
+    journal.close()
+    row = sqlite3.connect(path).execute(
+        "SELECT typeof(tx_hash_leg1), gas_used_leg1, gas_price_leg1_gwei_effective FROM trades WHERE tx_hash_leg1 = ?",
+        ("0x" + "ab" * 32,)).fetchone()
+    assert row == ("text", 120000, 25.0)
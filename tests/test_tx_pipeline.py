@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.services.tx_pipeline import NonceManager, ReceiptPoller, is_nonce_error
+
+WALLET = "0xabc"
+
+
+def test_nonces_are_reserved_locally():
+    fetches = []
+    nm = NonceManager(lambda w: fetches.append(w) or 7)
+    assert [nm.reserve(WALLET) for _ in range(3)] == [7, 8, 9]
+    assert fetches == [WALLET]
+    assert nm.in_flight(WALLET) == 3
+    nm.confirm(WALLET, 7)
+    assert nm.in_flight(WALLET) == 2
+
+
+def test_release_newest_reuses_nonce_and_gap_resyncs():
+    chain_nonce = {"n": 3}
+    nm = NonceManager(lambda w: chain_nonce["n"])
+    a, b = nm.reserve(WALLET), nm.reserve(WALLET)
+    nm.release(WALLET, b)
+    assert nm.reserve(WALLET) == b
+    nm.release(WALLET, a)  # leaves a gap below b
+    chain_nonce["n"] = 3
+    assert nm.reserve(WALLET) == 3
+
+
+def test_nonce_error_detection():
+    assert is_nonce_error(ValueError({"message": "nonce too low"}))
+    assert not is_nonce_error(ValueError("insufficient funds"))
+
+
+def test_receipts_resolve_per_block_in_one_pass():
+    mined = {}
+    calls = []
+    late = []
+
+    async def fetch(tx_hash):
+        calls.append(tx_hash)
+        return mined.get(tx_hash)
+
+    async def main():
+        poller = ReceiptPoller(fetch, timeout=0.05, on_late_receipt=lambda h, r: late.append((h, r)))
+        await poller.on_block(100)
+        futs = {h: poller.track(h) for h in ("a", "b", "c")}
+        mined.update(a={"status": 1}, b={"status": 0})
+        await poller.on_block(101)
+        assert futs["a"].result() == {"status": 1} and futs["b"].result() == {"status": 0}
+        assert not futs["c"].done() and poller.pending == 1
+        await asyncio.sleep(0.06)
+        await poller.on_block(102)
+        with pytest.raises(TimeoutError):
+            futs["c"].result()
+        assert poller.pending == poller.overdue == 1  # timed out, but may still be mined
+        mined["c"] = {"status": 1}
+        await poller.on_block(103)
+        return poller
+
+    poller = asyncio.run(main())
+    assert poller.pending == 0 and late == [("c", {"status": 1})]
+    assert calls == ["a", "b", "c", "c", "c"]
+
+
+def test_timed_out_send_keeps_its_nonce_until_mined():
+    from types import SimpleNamespace
+
+    from src.alpha.cross_chain_arb import TransactionManager
+
+    mined = {}
+    nonces = NonceManager(lambda w: 5)
+    txm = TransactionManager(None, WALLET, None, nonces=nonces, receipt_timeout=0.0)
+    txm.submit = lambda tx, ladder=None: b"\x01" * 32
+
+    async def fetch(tx_hash):
+        return mined.get(tx_hash)
+
+    txm._fetch_receipt = fetch
+    txm.receipts.fetch_receipt = fetch
+
+    async def main():
+        tx = {"nonce": nonces.reserve(WALLET), "gasPrice": 10 ** 9}
+        send = asyncio.ensure_future(txm.send_pipelined(tx))
+        for block in range(1, 100):
+            if send.done():
+                break
+            await asyncio.sleep(0.01)
+            await txm.receipts.on_block(block)
+        return await send
+
+    ok, tx_hash, receipt = asyncio.run(main())
+    assert ok is None and receipt is None
+    assert nonces.in_flight(WALLET) == 1 and nonces.reserve(WALLET) == 6  # no resync under the pending tx
+    mined[tx_hash] = SimpleNamespace(status=1, blockNumber=2)
+    asyncio.run(txm.receipts.on_block(2))
+    assert nonces.in_flight(WALLET) == 1  # nonce 5 confirmed, 6 still reserved
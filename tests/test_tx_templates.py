@@ -0,0 +1,58 @@
+from eth_account import Account
+from web3 import Web3
+
+from src.services.tx_templates import (
+    CallTemplate, TemplateCache, gas_ladder, presign_ladder, swap_exact_eth_for_tokens,
+)
+from src.signer_service import SignerService
+
+ROUTER_ABI = [{
+    "name": "swapExactETHForTokens", "type": "function", "stateMutability": "payable",
+    "inputs": [{"name": "amountOutMin", "type": "uint256"}, {"name": "path", "type": "address[]"},
+               {"name": "to", "type": "address"}, {"name": "deadline", "type": "uint256"}],
+    "outputs": [{"name": "amounts", "type": "uint256[]"}],
+}]
+WETH = "0x" + "aa" * 20
+USDC = "0x" + "bb" * 20
+ME = "0x" + "cc" * 20
+
+
+def test_template_matches_full_abi_encoding():
+    router = Web3().eth.contract(address=Web3.to_checksum_address("0x" + "01" * 20), abi=ROUTER_ABI)
+    template = swap_exact_eth_for_tokens([WETH, USDC], ME)
+    for amount_out_min, deadline in ((1, 2), (3_500 * 10 ** 6, 1_900_000_000)):
+        expected = router.encode_abi(
+            fn_name="swapExactETHForTokens",
+            args=[amount_out_min, [Web3.to_checksum_address(WETH), Web3.to_checksum_address(USDC)],
+                  Web3.to_checksum_address(ME), deadline])
+        assert Web3.to_hex(template.encode(amount_out_min, deadline)) == expected
+
+
+def test_template_cache_reuses_templates():
+    cache = TemplateCache()
+    first = cache.get(("router", WETH, USDC), lambda: swap_exact_eth_for_tokens([WETH, USDC], ME))
+    assert cache.get(("router", WETH, USDC), lambda: None) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_only_uint_slots_are_patchable():
+    try:
+        CallTemplate("transfer", ["address", "uint256"], [None, 1])
+    except ValueError:
+        return
+    raise AssertionError("address slot should be rejected")
+
+
+def test_presigned_ladder_selects_cheapest_sufficient_price(monkeypatch):
+    acct = Account.create()
+    enc = SignerService.encrypt_private_key(acct.key.hex(), "pass")
+    monkeypatch.setenv("ENCRYPTION_PASSWORD", "pass")
+    monkeypatch.setenv("PRIVATE_KEY_ENC", enc)
+    signer = SignerService()
+    tx = {"to": Web3.to_checksum_address(ME), "value": 1, "gas": 21000, "gasPrice": 10 ** 9, "nonce": 4, "chainId": 1}
+    ladder = signer.presign_gas_ladder(tx)
+    assert ladder.gas_prices == gas_ladder(10 ** 9)
+    raw = ladder.select(int(1.1 * 10 ** 9))
+    assert raw == signer.sign_eth_tx(dict(tx, gasPrice=int(1.125 * 10 ** 9)))
+    assert ladder.select(10 ** 10) is None
+    assert presign_ladder(signer.sign_eth_tx, tx, [5]).nonce == 4